@@ -41,6 +41,7 @@ setup(
     extras_require = {
         'geoip': ['GeoIP'],
         'setproctitle': ['setproctitle'],
+        'numpy': ['numpy'],
     },
     tests_require = [
         'asynctest>=0.11',
@@ -34,4 +34,5 @@ from .aiotransmission.rpc import TransmissionRPC
 from .aiotransmission.api_status import StatusAPI
 from .aiotransmission.api_settings import SettingsAPI
 from .aiotransmission.api_torrent import TorrentAPI
+from .aiotransmission.metacache import MetadataCache
 from .api import API
@@ -17,9 +17,13 @@ from collections import abc
 import os
 import base64
 import unicodedata
+import time
 
 from ..utils import (Response, URL)
-from .torrent import (TorrentFields, Torrent)
+from .torrent import (TorrentFields, Torrent, DEPENDENCIES, SLOW_DEPENDENCIES,
+                      STATIC_FIELDS, slow_fields_for)
+from .colstore import ColumnStore
+from . import colfilter
 from .. import ClientError
 from ..filters.tfilter import TorrentFilter
 from ..filters.ffilter import TorrentFileFilter
@@ -27,42 +31,239 @@ from .. import convert
 from .. import constants as const
 
 
+# Transmission considers torrents "recently active" for 60 seconds.  If we
+# haven't requested a field for all torrents in a while, we may have missed
+# changes and can't rely on requesting only recently active torrents.
+_DELTA_MAX_AGE = 50
+
+# Fields in torrent.SLOW_DEPENDENCIES are requested for all torrents at most
+# this often
+_SLOW_FIELDS_MAX_AGE = 60
+
+# Filtered torrents are requested with all wanted keys in a single request if
+# at least this fraction of torrents is expected to match or if no more than
+# this many non-matching torrents are expected
+_SINGLE_REQUEST_MIN_RATIO = 0.5
+_SINGLE_REQUEST_MAX_WASTE = 100
+
+# Maximum number of filters to remember match counts for
+_MAX_FILTER_STATS = 100
+
+
+# Secondary indexes of _TorrentCache: Map index names to the Torrent key they
+# are based on and a callable that returns the indexed values of that key
+_INDEXES = {
+    'hash'    : ('hash', lambda hash: (hash,)),
+    'path'    : ('path', lambda path: (path,)),
+    'tracker' : ('trackers', lambda trackers: frozenset(tracker['domain'] for tracker in trackers)),
+    'status'  : ('status', frozenset),
+}
+
+# Map index names to the RPC fields that may change the indexed values
+_INDEX_FIELDS = {name:DEPENDENCIES[key] + SLOW_DEPENDENCIES.get(key, ())
+                 for name,(key,_) in _INDEXES.items()}
+
+
 class _TorrentCache():
-    def __init__(self, raw_torrents=()):
-        self._tdict = {}  # Map torrent IDs to Torrent objects
+    """Torrent objects by ID
+
+    Numeric RPC fields of cached torrents are also stored in a ColumnStore for
+    `filter`.
+    """
+    def __init__(self, raw_torrents=(), use_numpy=True):
+        self._tdict = {}   # Map torrent IDs to Torrent objects
+        self._slots = {}   # Map torrent IDs to ColumnStore slots
+        self._store = ColumnStore(use_numpy=use_numpy)
+        self._synced = {}  # Map RPC fields to when they were requested for all torrents
+        # Secondary indexes are built on first use by `find` and maintained
+        # from then on
+        # Map index names to dicts that map indexed values to sets of torrent IDs
+        self._index = {}
+        # Map index names to dicts that map torrent IDs to their indexed values
+        self._indexed = {}
 
     def update(self, raw_torrents):
         # import time ; start = time.time()
-        tdict = self._tdict
+        tdict, slots, store = self._tdict, self._slots, self._store
         for rt in raw_torrents:
             tid = rt['id']
             if tid in tdict:
                 # Update existing torrent
                 # log.debug('Updating torrent #%d, %d keys: %s', tid, len(rt), tuple(rt))
-                tdict[tid].update(rt)
+                t = tdict[tid]
+                t.update(rt)
+                store.update(slots[tid], rt)
             else:
                 # Add new torrent
                 # log.debug('Adding torrent #%d, %d keys: %s', tid, len(rt), tuple(rt))
-                tdict[tid] = Torrent(rt)
+                t = tdict[tid] = Torrent(rt)
+                slot = slots[tid] = store.allocate(tid)
+                store.update(slot, rt)
+            if self._index:
+                self._reindex(t, rt)
         # log.debug('Updated %d cached with %d new torrents in %.3fms',
         #           len(tdict), len(raw_torrents), (time.time()-start)*1000)
 
+    def _build_index(self, name):
+        """Create secondary index `name` from all cached torrents"""
+        log.debug('Building %r index of %d torrents', name, len(self._tdict))
+        key, get_values = _INDEXES[name]
+        index = self._index[name] = {}
+        indexed = self._indexed[name] = {}
+        for tid,t in self._tdict.items():
+            if key in t:
+                values = get_values(t[key])
+                if values:
+                    indexed[tid] = values
+                    for value in values:
+                        index.setdefault(value, set()).add(tid)
+
+    def _reindex(self, t, fields):
+        """Update existing secondary indexes of Torrent `t` if they depend on any RPC `fields`"""
+        tid = t['id']
+        for name in self._index:
+            if not any(field in fields for field in _INDEX_FIELDS[name]):
+                continue
+            key, get_values = _INDEXES[name]
+            indexed = self._indexed[name]
+            old_values = indexed.get(tid, ())
+            new_values = get_values(t[key]) if key in t else ()
+            if new_values == old_values:
+                continue
+            index = self._index[name]
+            for value in old_values:
+                tids = index[value]
+                tids.discard(tid)
+                if not tids:
+                    del index[value]
+            for value in new_values:
+                index.setdefault(value, set()).add(tid)
+            if new_values:
+                indexed[tid] = new_values
+            else:
+                indexed.pop(tid, None)
+
+    def _unindex(self, tid):
+        """Remove torrent ID `tid` from all secondary indexes"""
+        for name,indexed in self._indexed.items():
+            index = self._index[name]
+            for value in indexed.pop(tid, ()):
+                tids = index[value]
+                tids.discard(tid)
+                if not tids:
+                    del index[value]
+
     def purge(self, existing_tids):
         """Remove torrents with IDs that are not in `existing_ids`"""
         tdict = self._tdict
-        known_tids = set(tdict)
-        removed_tids = known_tids.difference(existing_tids)
+        removed_tids = set(tdict).difference(existing_tids)
         if removed_tids:
             log.debug('Clearing cached torrents: %r', removed_tids)
         for tid in removed_tids:
-            del tdict[tid]
+            self._remove(tid)
+
+    def remove(self, tids):
+        """Remove torrents with IDs in `tids`"""
+        tdict = self._tdict
+        for tid in tids:
+            if tid in tdict:
+                log.debug('Removing cached torrent: #%d', tid)
+                self._remove(tid)
+
+    def _remove(self, tid):
+        del self._tdict[tid]
+        self._unindex(tid)
+        self._store.release(self._slots.pop(tid))
+
+    @property
+    def store(self):
+        """ColumnStore with numeric RPC fields of all cached torrents"""
+        return self._store
+
+    def set_synced(self, fields, timestamp):
+        """Remember that `fields` of all torrents were requested at `timestamp`"""
+        for field in fields:
+            self._synced[field] = timestamp
+
+    def is_synced(self, fields, max_age=_DELTA_MAX_AGE):
+        """Whether `fields` of all torrents were requested in the last `max_age` seconds
+
+        If this returns True, updating the cache with recently active torrents
+        is enough to keep `fields` of all torrents up to date.
+        """
+        synced = self._synced
+        oldest = time.monotonic() - max_age
+        return all(synced.get(field, 0) > oldest for field in fields)
+
+    def reset_synced(self):
+        """Forget when any fields were requested"""
+        self._synced.clear()
+
+    def lacking_static_fields(self, tids, fields):
+        """Return IDs of torrents that need static `fields` requested"""
+        tdict = self._tdict
+        return tuple(tid for tid in tids
+                     if tid not in tdict or not tdict[tid].has_static_fields(fields))
+
+    def lacking_fields(self, tids, fields):
+        """Return IDs of torrents that don't have `fields` cached"""
+        tdict = self._tdict
+        return tuple(tid for tid in tids
+                     if tid not in tdict or not tdict[tid].has_fields(fields))
+
+    def forget_fields(self, tids, fields):
+        """Make sure `fields` of torrents with IDs in `tids` are requested again"""
+        tdict = self._tdict
+        for tid in tids:
+            if tid in tdict:
+                t = tdict[tid]
+                t.forget(fields)
+                self._store.forget(self._slots[tid], fields)
+                if self._index:
+                    self._reindex(t, fields)
 
     def get(self, *ids):
-        """Return tuple of Torrent objects"""
+        """Return tuple of Torrent objects
+
+        If `ids` are given, return only torrents with these IDs in the same
+        order.  IDs of unknown torrents are ignored.
+        """
+        tdict = self._tdict
         if ids:
-            return tuple(t for tid,t in self._tdict.items() if tid in ids)
+            return tuple(tdict[tid] for tid in dict.fromkeys(ids) if tid in tdict)
         else:
-            return tuple(self._tdict.values())
+            return tuple(tdict.values())
+
+    def filter(self, tfilter, torrents):
+        """Return tuple of `torrents` that match TorrentFilter `tfilter`
+
+        Numeric filters are evaluated on the ColumnStore of cached torrents
+        (see colfilter.apply).
+        """
+        torrents = tuple(torrents)
+        tdict, slots = self._tdict, self._slots
+        slots = tuple(slots[tid] if tdict.get(tid) is t else None
+                      for tid,t in ((t['id'], t) for t in torrents))
+        return colfilter.apply(tfilter, torrents, self._store, slots)
+
+    def find(self, index, value):
+        """Return tuple of Torrent objects that have `value` in secondary `index`
+
+        index: 'hash', 'path', 'tracker' (tracker domain) or 'status' (status
+               flag)
+
+        Only torrents that have the key of `index` cached are found.  The
+        index is built when it is used for the first time.
+        """
+        if index not in self._index:
+            if index not in _INDEXES:
+                raise ValueError('Unknown index: %r' % (index,))
+            self._build_index(index)
+        tdict = self._tdict
+        return tuple(tdict[tid] for tid in self._index[index].get(value, ()))
+
+    def __contains__(self, tid):
+        return tid in self._tdict
 
     def __len__(self):
         return len(self._tdict)
@@ -76,13 +277,22 @@ class _TorrentCache():
 class TorrentAPI():
     """High-level abstraction of the Transmission RPC protocol"""
 
-    def __init__(self, rpc):
+    def __init__(self, rpc, metacache=None):
         self.rpc = rpc
+        self.metacache = metacache
         self._tcache = _TorrentCache()
+        self._filter_stats = {}  # Map filter strings to (matches, total) tuples
+        # We may be talking to a different daemon now
+        rpc.on('connected', self._handle_connected)
+
+    def _handle_connected(self, rpc):
+        self._tcache.reset_synced()
+        self._filter_stats.clear()
 
     def clearcache(self):
         """Remove all torrents from cache"""
         self._tcache.purge(existing_tids=())
+        self._tcache.reset_synced()
 
     @staticmethod
     async def _request(method, *args, **kwargs):
@@ -221,56 +431,159 @@ class TorrentAPI():
         return Response(success=success, torrent=torrent, msgs=msgs)
 
 
-    async def _request_torrents(self, fields, ids=None):
-        """Unmodified 'torrent-get' request"""
+    async def _request_torrents(self, fields, ids=None, delta=False, slow_fields=()):
+        """Unmodified 'torrent-get' request
+
+        If `delta` is True and `ids` is None, request only recently active
+        torrents and removed torrent IDs.  This is only done if all `fields` of
+        all torrents were requested recently (see `_TorrentCache.is_synced`);
+        otherwise all torrents are requested.
+
+        Static fields (see `torrent.STATIC_FIELDS`) are only requested for
+        torrents that don't have them cached yet.
+
+        `slow_fields` (see `torrent.SLOW_DEPENDENCIES`) are requested in a
+        separate request every `_SLOW_FIELDS_MAX_AGE` seconds and for torrents
+        that don't have them cached yet.
+        """
         if 'id' not in fields:
             fields = ('id',) + tuple(fields)
+        delta = delta and ids is None and self._tcache.is_synced(fields)
+
+        static_fields = STATIC_FIELDS.intersection(fields)
+        if static_fields:
+            # We need to know if metadata is complete to know if static fields
+            # are final
+            static_fields = ('id', 'metadataPercentComplete') + tuple(static_fields)
+            dynamic_fields = tuple(set(fields).difference(static_fields)) + static_fields[:2]
+            if self.metacache is not None and 'hashString' not in static_fields:
+                # Metadata is stored by hash
+                static_fields += ('hashString',)
+        else:
+            dynamic_fields = fields
+
+        requested = time.monotonic()
         try:
-            if ids is None:
+            if delta:
+                # Request torrents that changed recently
+                response = await self.rpc.torrent_get(fields=dynamic_fields, ids='recently-active')
+                raw_tlist = response['torrents']
+                removed_tids = response['removed']
+            elif ids is None:
                 # Request all IDs
-                raw_tlist = await self.rpc.torrent_get(fields=fields)
+                raw_tlist = await self.rpc.torrent_get(fields=dynamic_fields)
             else:
                 if len(ids) > 0:
                     # Request given IDs
-                    raw_tlist = await self.rpc.torrent_get(fields=fields, ids=ids)
+                    raw_tlist = await self.rpc.torrent_get(fields=dynamic_fields, ids=ids)
                 else:
                     # No IDs (i.e. empty torrent list) requested
                     raw_tlist = []
+            self._tcache.update(raw_tlist)
+
+            if static_fields:
+                # Request static fields only for torrents that need them
+                lacking_tids = self._tcache.lacking_static_fields(
+                    (t['id'] for t in raw_tlist), static_fields)
+                if lacking_tids and self.metacache is not None:
+                    lacking_tids = await self._load_metadata(lacking_tids, static_fields)
+                if lacking_tids:
+                    log.debug('Requesting static fields for %d torrents: %s',
+                              len(lacking_tids), static_fields)
+                    raw_static = await self.rpc.torrent_get(fields=static_fields, ids=lacking_tids)
+                    self._tcache.update(raw_static)
+                    if self.metacache is not None:
+                        await self.metacache.update_async(self.rpc.url, raw_static)
+
+            slow_fields = tuple(set(slow_fields).difference(fields))
+            if slow_fields:
+                await self._request_slow_fields(slow_fields, ids, raw_tlist)
         except ClientError as e:
             return Response(success=False, raw_torrents=[], msgs=[e])
         else:
-            self._tcache.update(raw_tlist)
+
+            if delta:
+                self._tcache.remove(removed_tids)
+                self._tcache.set_synced(fields, requested)
 
             # If we just got a list of all torrents, we can check for torrents
             # that we still have cached but don't exist anymore and purge them.
-            if ids is None:
+            elif ids is None:
                 tids = tuple(t['id'] for t in raw_tlist)
                 self._tcache.purge(existing_tids=tids)
+                self._tcache.set_synced(fields, requested)
 
             return Response(success=True, raw_torrents=raw_tlist)
 
-    async def _get_torrents_by_ids(self, keys, ids=None):
+    async def _load_metadata(self, tids, static_fields):
+        """Get static fields from `metacache`
+
+        The hashes of torrents with IDs in `tids` are requested (if they aren't
+        cached yet) to make sure metadata from a previous session belongs to
+        the same torrent.
+
+        Return IDs of torrents that still lack any `static_fields`.
+        """
+        tcache = self._tcache
+        unknown_tids = tcache.lacking_fields(tids, ('hashString',))
+        if unknown_tids:
+            tcache.update(await self.rpc.torrent_get(fields=('id', 'hashString'),
+                                                     ids=unknown_tids))
+        hash2id = {t['hash']:t['id'] for t in tcache.get(*tids) if 'hash' in t}
+        metadata = await self.metacache.get_async(self.rpc.url, hash2id)
+        tcache.update(dict(fields, id=hash2id[hash]) for hash,fields in metadata.items())
+        return tcache.lacking_static_fields(tids, static_fields)
+
+    async def _request_slow_fields(self, slow_fields, ids, raw_tlist):
+        """Request `slow_fields` if they are outdated or missing
+
+        If `ids` is None, request `slow_fields` of all torrents if they weren't
+        requested in the last `_SLOW_FIELDS_MAX_AGE` seconds.  Otherwise,
+        request them only for torrents in `raw_tlist` that lack them.
+
+        Raise ClientError if the request fails.
+        """
+        slow_fields = ('id',) + slow_fields
+        tcache = self._tcache
+        if ids is None and not tcache.is_synced(slow_fields, max_age=_SLOW_FIELDS_MAX_AGE):
+            log.debug('Requesting slow fields for all torrents: %s', slow_fields)
+            requested = time.monotonic()
+            raw_slow = await self.rpc.torrent_get(fields=slow_fields)
+            tcache.update(raw_slow)
+            tcache.set_synced(slow_fields, requested)
+        else:
+            lacking_tids = tcache.lacking_fields((t['id'] for t in raw_tlist), slow_fields)
+            if lacking_tids:
+                log.debug('Requesting slow fields for %d torrents: %s',
+                          len(lacking_tids), slow_fields)
+                raw_slow = await self.rpc.torrent_get(fields=slow_fields, ids=lacking_tids)
+                tcache.update(raw_slow)
+
+    async def _get_torrents_by_ids(self, keys, ids=None, delta=False):
         """Return a Response object with 'torrents' set to a tuple of Torrents
 
         keys: 'ALL' for all supported Torrent keys or a sequence of key
               strings (see client.ttypes.TYPES for available keys)
         ids: None for all torrents or a sequence of wanted IDs
+        delta: See `torrents` method
         """
         if keys == 'ALL':
             fields = TorrentFields(keys)
+            slow_fields = slow_fields_for(keys)
         else:
             fields = TorrentFields(*keys)
+            slow_fields = slow_fields_for(*keys)
 
         tlist = ()
         msgs = []
         success = False
 
-        response = await self._request_torrents(fields, ids)
+        response = await self._request_torrents(fields, ids, delta=delta,
+                                                slow_fields=slow_fields)
         if not response.success:
             return Response(success=False, torrents=(), msgs=response.msgs)
         else:
-            from time import time
-            start = time()
+            start = time.monotonic()
 
             # Get torrents from cache
             if ids is None:
@@ -281,27 +594,65 @@ class TorrentAPI():
                 tlist = self._tcache.get(*ids)
 
                 # Provide error for requested IDs that don't exist
-                existing_ids = tuple(t['id'] for t in tlist)
                 for tid in ids:
-                    # Torrent objects are equal to an integer of the torrent's ID
-                    if tid not in existing_ids:
+                    if tid not in self._tcache:
                         msgs.append(ClientError('No torrent with ID: {}'.format(tid)))
 
             success = len(tlist) > 0 or not ids
 
-            log.debug('Found %d torrents in %.3fms', len(tlist), (time()-start)*1e3)
+            log.debug('Found %d torrents in %.3fms', len(tlist), (time.monotonic()-start)*1e3)
         return Response(success=success, torrents=tlist, msgs=msgs)
 
-    async def _get_torrents_by_filter(self, keys, tfilter=None):
+    def _is_single_request_cheaper(self, keys, tfilter):
+        """Whether to request all torrents with `keys` and `tfilter`'s keys at once
+
+        The alternative is to request all torrents with `tfilter`'s keys and
+        then the matching torrents with `keys`, which is cheaper if only a few
+        torrents match.  The number of matches is estimated from previous
+        requests with the same filter or by applying the filter to cached
+        torrents.
+        """
+        wanted_fields = TorrentFields(keys) if keys == 'ALL' else TorrentFields(*keys)
+        filter_fields = TorrentFields(*tfilter.needed_keys)
+        if set(wanted_fields).issubset(filter_fields):
+            log.debug('Filter needs all wanted fields - requesting at once')
+            return True
+
+        stats = self._filter_stats.get(str(tfilter))
+        if stats is None:
+            # Estimate from cache if all cached torrents have the filter keys
+            cached = self._tcache.get()
+            needed_keys = tfilter.needed_keys
+            if cached and all(key in t for t in cached for key in needed_keys):
+                stats = (len(self._tcache.filter(tfilter, cached)), len(cached))
+            else:
+                log.debug('No estimate for %s - requesting in two steps', tfilter)
+                return False
+
+        matches, total = stats
+        single = (total - matches <= _SINGLE_REQUEST_MAX_WASTE or
+                  matches >= total * _SINGLE_REQUEST_MIN_RATIO)
+        log.debug('Expecting %d of %d torrents to match %s - requesting %s',
+                  matches, total, tfilter, 'at once' if single else 'in two steps')
+        return single
+
+    def _remember_filter_stats(self, tfilter, matches, total):
+        filter_stats = self._filter_stats
+        if len(filter_stats) >= _MAX_FILTER_STATS:
+            filter_stats.clear()
+        filter_stats[str(tfilter)] = (matches, total)
+
+    async def _get_torrents_by_filter(self, keys, tfilter=None, delta=False):
         """Return a Response object with 'torrents' set to a tuple of Torrents
 
         keys: See _get_torrents_by_ids
         tfilter: A TorrentFilter instance or None
+        delta: See `torrents` method
         """
         if tfilter == None:
             log.debug('Looking for all torrents with keys: %s', keys)
             # No filter specified - just return all torrents with the specified keys
-            return await self._get_torrents_by_ids(keys=keys)
+            return await self._get_torrents_by_ids(keys=keys, delta=delta)
         else:
             log.debug('Looking for %s torrents with keys: %s', tfilter, keys)
             tlist = ()
@@ -310,22 +661,53 @@ class TorrentAPI():
             if isinstance(tfilter, str):
                 tfilter = TorrentFilter(tfilter)
 
-            # Request all torrents with the keys needed to filter them
-            log.debug('Requesting full list with filter keys: %s', tfilter.needed_keys)
-            response = await self._get_torrents_by_ids(keys=tfilter.needed_keys)
-            if response.success:
-                # Find IDs of torrents that match tfilter
-                wanted_ids = tuple(t['id'] for t in tfilter.apply(response.torrents))
-                log.debug('Wanted IDs: %s', wanted_ids)
-                if len(wanted_ids) > 0:
-                    # Get only wanted torrents with all wanted keys
-                    response = await self._get_torrents_by_ids(keys, wanted_ids)
-                    if not response.success:
-                        msgs.extend(response.msgs)
-                    else:
-                        tlist = tuple(response.torrents)
+            if delta or self._is_single_request_cheaper(keys, tfilter):
+                # Request wanted keys and filter keys together so all cached
+                # torrents have all keys, then filter the complete list
+                if keys != 'ALL':
+                    keys = tuple(keys) + tuple(tfilter.needed_keys)
+                log.debug('Requesting %s torrents with keys: %s',
+                          'recently active' if delta else 'all', keys)
+                response = await self._get_torrents_by_ids(keys=keys, delta=delta)
+                if response.success:
+                    tlist = self._tcache.filter(tfilter, response.torrents)
+                    self._remember_filter_stats(tfilter, len(tlist), len(response.torrents))
+                else:
+                    msgs.extend(response.msgs)
             else:
-                msgs.extend(response.msgs)
+                # Request all torrents with the keys needed to filter them.  If
+                # some filters are expensive, request only the keys needed to
+                # find candidates and get the other filter keys for
+                # candidates only.
+                prefetch_keys = tfilter.prefetch_keys
+                prefilter = set(prefetch_keys) != set(tfilter.needed_keys)
+                log.debug('Requesting full list with filter keys: %s', prefetch_keys)
+                response = await self._get_torrents_by_ids(keys=prefetch_keys)
+                if response.success:
+                    total = len(response.torrents)
+                    if prefilter:
+                        # Find IDs of torrents that may match tfilter
+                        wanted_ids = tuple(t['id'] for t in tfilter.prefilter(response.torrents))
+                        log.debug('Candidate IDs: %s', wanted_ids)
+                    else:
+                        # Find IDs of torrents that match tfilter
+                        wanted_ids = tuple(t['id'] for t in self._tcache.filter(tfilter, response.torrents))
+                        self._remember_filter_stats(tfilter, len(wanted_ids), total)
+                        log.debug('Wanted IDs: %s', wanted_ids)
+                    if len(wanted_ids) > 0:
+                        # Get only wanted torrents with all wanted keys
+                        if prefilter and keys != 'ALL':
+                            keys = tuple(keys) + tuple(tfilter.needed_keys)
+                        response = await self._get_torrents_by_ids(keys, wanted_ids)
+                        if not response.success:
+                            msgs.extend(response.msgs)
+                        elif prefilter:
+                            tlist = self._tcache.filter(tfilter, response.torrents)
+                            self._remember_filter_stats(tfilter, len(tlist), total)
+                        else:
+                            tlist = tuple(response.torrents)
+                else:
+                    msgs.extend(response.msgs)
 
             success = len(tlist) > 0
             if not success:
@@ -336,12 +718,16 @@ class TorrentAPI():
 
             return Response(success=success, torrents=tlist, msgs=msgs)
 
-    async def torrents(self, torrents=None, keys='ALL'):
+    async def torrents(self, torrents=None, keys='ALL', delta=False):
         """Fetch and return torrents
 
         torrents: Iterator of torrent IDs, TorrentFilter object (or its string
                   representation) or None for all torrents
         keys: tuple of Torrent keys to fetch or 'ALL' for all torrents
+        delta: Whether to request only torrents that changed recently and get
+               all other torrents from cache; this is ignored if `torrents` is
+               a sequence of IDs and all torrents are requested if the cache
+               may be outdated
 
         Return Response with the following properties:
             torrents: tuple of Torrent objects with requested torrents
@@ -349,9 +735,9 @@ class TorrentAPI():
             msgs: list of strings/`ClientError`s caused by the request
         """
         if torrents is None:
-            return await self._get_torrents_by_ids(keys)
+            return await self._get_torrents_by_ids(keys, delta=delta)
         elif isinstance(torrents, (str, TorrentFilter)):
-            return await self._get_torrents_by_filter(keys, tfilter=torrents)
+            return await self._get_torrents_by_filter(keys, tfilter=torrents, delta=delta)
         elif isinstance(torrents, abc.Sequence) and \
              all(isinstance(id, int) for id in torrents):
             return await self._get_torrents_by_ids(keys, ids=torrents)
@@ -576,9 +962,14 @@ class TorrentAPI():
             else:
                 return (False, 'Already in %s: %s' % (destination, t['name']))
 
-        return await self._torrent_action(self.rpc.torrent_set_location, torrents,
-                                          check=create_info_msg, keys_check=('path',),
-                                          method_args={'move': True, 'location': destination})
+        response = await self._torrent_action(self.rpc.torrent_set_location, torrents,
+                                              check=create_info_msg, keys_check=('path',),
+                                              method_args={'move': True, 'location': destination})
+        # 'path' is not refreshed on every poll (see torrent.REFRESH_INTERVALS)
+        if response.success:
+            self._tcache.update({'id': t['id'], 'downloadDir': destination}
+                                for t in response.torrents)
+        return response
 
 
     async def file_priority(self, torrents, files, priority):
@@ -935,7 +1326,6 @@ class TorrentAPI():
                                                       method_args={'trackerRemove': trkids})
                 if not response.success:
                     return Response(success=False, torrents=(), msgs=response.msgs)
-
         # Get new torrent list with newly added trackers
         response = await self.torrents(tuple(remove_ids), keys=('id', 'name', 'trackers'))
         if not response.success:
@@ -953,7 +1343,6 @@ class TorrentAPI():
             success: True if any torrents were found, False otherwise
             msgs: list of strings/`ClientError`s caused by the request
         """
-        import time
         def check(t):
             if len(t['trackers']) < 1:
                 return (False, 'Torrent has no trackers: %s' % t['name'])
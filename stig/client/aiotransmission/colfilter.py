@@ -0,0 +1,171 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Apply TorrentFilters to the columns of a ColumnStore"""
+
+from ...logging import make_logger
+log = make_logger(__name__)
+
+import operator
+
+from ..ttypes import TYPES as VALUETYPES
+from .colstore import NUMPY_AVAILABLE
+
+if NUMPY_AVAILABLE:
+    import numpy
+
+
+_INFINITE = float('inf')
+
+# Map Torrent keys to the RPC field they are derived from and the factor the
+# field's value is multiplied with (in addition to any unit conversion done by
+# VALUETYPES)
+_NUMERIC_KEYS = {
+    'peers-connected' : ('peersConnected', 1),
+    '%downloaded'     : ('percentDone', 100),
+    'ratio'           : ('uploadRatio', 1),
+    'rate-down'       : ('rateDownload', 1),
+    'rate-up'         : ('rateUpload', 1),
+    'size-final'      : ('sizeWhenDone', 1),
+    'size-downloaded' : ('downloadedEver', 1),
+    'size-uploaded'   : ('uploadedEver', 1),
+}
+
+_OPERATORS = {
+    '=': operator.__eq__,
+    '>': operator.__gt__, '<': operator.__lt__,
+    '>=': operator.__ge__, '<=': operator.__le__,
+}
+
+# Boolean filters that can be expressed with comparisons of RPC fields (see
+# tfilter.SingleTorrentFilter.BOOLEAN_FILTERS and torrent._make_status).  Each
+# function gets a dictionary that maps RPC fields to single values or NumPy
+# arrays, so only operators that work for both are allowed.
+_BOOLEAN_FILTERS = {
+    'complete'    : (('percentDone',), lambda c: c['percentDone'] * 100 >= 100),
+    'incomplete'  : (('percentDone',), lambda c: c['percentDone'] * 100 < 100),
+    'leeching'    : (('percentDone', 'status'),
+                     lambda c: (c['percentDone'] * 100 < 100) & (c['status'] != 0)),
+    'seeding'     : (('percentDone', 'status'),
+                     lambda c: (c['percentDone'] * 100 >= 100) & (c['status'] != 0)),
+    'stopped'     : (('status',), lambda c: c['status'] == 0),
+    'verifying'   : (('status',), lambda c: (c['status'] == 1) | (c['status'] == 2)),
+    'active'      : (('peersConnected', 'status'),
+                     lambda c: (c['peersConnected'] > 0) | (c['status'] == 1) | (c['status'] == 2)),
+    'downloading' : (('rateDownload',), lambda c: c['rateDownload'] > 0),
+    'uploading'   : (('rateUpload',), lambda c: c['rateUpload'] > 0),
+}
+
+
+def _key_values(columns, key):
+    """Return values of Torrent `key` from RPC field values in `columns`"""
+    field, factor = _NUMERIC_KEYS[key]
+    values = columns[field]
+    if field == 'uploadRatio':
+        # See torrent._modify_ratio
+        if isinstance(values, float):
+            values = _INFINITE if values == -2 else values
+        else:
+            values = numpy.where(values == -2, _INFINITE, values)
+    # Convert to bits if the user wants bits
+    factor *= float(VALUETYPES[key](1))
+    return values if factor == 1 else values * factor
+
+
+def _compile(f):
+    """Return RPC fields and function that evaluates Filter `f` or None"""
+    name = f.name
+    if name in _BOOLEAN_FILTERS:
+        return _BOOLEAN_FILTERS[name]
+    elif name in f.COMPARATIVE_FILTERS and len(f.needed_keys) == 1:
+        key = f.needed_keys[0]
+        if key in _NUMERIC_KEYS:
+            if f.op is None and f.value is None:
+                # Comparative filter used as boolean filter
+                return ((_NUMERIC_KEYS[key][0],), lambda c: _key_values(c, key) != 0)
+            elif f.op in _OPERATORS:
+                op, value = _OPERATORS[f.op], float(f.value)
+                return ((_NUMERIC_KEYS[key][0],), lambda c: op(_key_values(c, key), value))
+    return None
+
+
+def apply(tfilter, torrents, store, slots):
+    """Return tuple of `torrents` that match `tfilter`
+
+    tfilter: TorrentFilter instance
+    torrents: Sequence of Torrent objects
+    store: ColumnStore with numeric RPC fields of `torrents`
+    slots: Sequence of `store` slots of `torrents` (None for torrents that are
+           not in `store`)
+
+    Filters that only compare numeric RPC fields are evaluated on `store`'s
+    columns; all other filters (e.g. 'name' or 'tracker') are evaluated for
+    each torrent that matches all numeric filters of the same AND-chain.
+    Torrents without a slot or with unknown values are matched by
+    `tfilter.match`.
+    """
+    torrents = tuple(torrents)
+    chains = tuple(tuple((f, _compile(f)) for f in chain)
+                   for chain in tfilter.plan(torrents))
+    fields = set(field
+                 for chain in chains
+                 for f,compiled in chain if compiled is not None
+                 for field in compiled[0])
+    if not fields or all(slot is None for slot in slots):
+        return tuple(tfilter.apply(torrents))
+    elif store.numpy:
+        return _apply_numpy(tfilter, chains, fields, torrents, store, slots)
+    else:
+        return _apply_rows(tfilter, chains, fields, torrents, store, slots)
+
+
+def _apply_numpy(tfilter, chains, fields, torrents, store, slots):
+    slots = numpy.fromiter((-1 if slot is None else slot for slot in slots),
+                           dtype='int64', count=len(torrents))
+    known = slots >= 0
+    slots[~known] = 0
+    columns = {}
+    for field in fields:
+        columns[field] = store.column(field)[slots]
+        known &= store.known(field)[slots]
+
+    matches = numpy.zeros(len(torrents), dtype=bool)
+    for chain in chains:
+        mask = known.copy()
+        for f,compiled in chain:
+            if compiled is not None:
+                mask &= compiled[1](columns) ^ f.invert
+        # Evaluate remaining filters only for torrents that are still candidates
+        for f,compiled in chain:
+            if compiled is None:
+                for i in numpy.flatnonzero(mask):
+                    if not f.match(torrents[i]):
+                        mask[i] = False
+        matches |= mask
+
+    for i in numpy.flatnonzero(~known):
+        matches[i] = tfilter.match(torrents[i])
+    return tuple(t for t,match in zip(torrents, matches.tolist()) if match)
+
+
+def _apply_rows(tfilter, chains, fields, torrents, store, slots):
+    cols = {field:store.column(field) for field in fields}
+    known = tuple(store.known(field) for field in fields)
+
+    def match(t, slot):
+        if slot is None or not all(k[slot] for k in known):
+            return tfilter.match(t)
+        values = {field:col[slot] for field,col in cols.items()}
+        return any(all(compiled[1](values) ^ f.invert if compiled is not None else f.match(t)
+                       for f,compiled in chain)
+                   for chain in chains)
+
+    return tuple(t for t,slot in zip(torrents, slots) if match(t, slot))
@@ -0,0 +1,210 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Columnar storage of numeric RPC fields of all torrents"""
+
+from ...logging import make_logger
+log = make_logger(__name__)
+
+import array
+
+try:
+    import numpy
+
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+else:
+    NUMPY_AVAILABLE = True
+
+
+# Map numeric RPC fields to array type codes ('q' for integers, 'd' for
+# floats)
+NUMERIC_FIELDS = {
+    'activityDate'       : 'q',
+    'addedDate'          : 'q',
+    'corruptEver'        : 'q',
+    'desiredAvailable'   : 'q',
+    'doneDate'           : 'q',
+    'downloadedEver'     : 'q',
+    'downloadLimit'      : 'q',
+    'eta'                : 'q',
+    'haveUnchecked'      : 'q',
+    'haveValid'          : 'q',
+    'leftUntilDone'      : 'q',
+    'metadataPercentComplete' : 'd',
+    'peersConnected'     : 'q',
+    'peersGettingFromUs' : 'q',
+    'peersSendingToUs'   : 'q',
+    'percentDone'        : 'd',
+    'rateDownload'       : 'q',
+    'rateUpload'         : 'q',
+    'recheckProgress'    : 'd',
+    'secondsDownloading' : 'q',
+    'secondsSeeding'     : 'q',
+    'sizeWhenDone'       : 'q',
+    'startDate'          : 'q',
+    'status'             : 'q',
+    'totalSize'          : 'q',
+    'uploadedEver'       : 'q',
+    'uploadLimit'        : 'q',
+    'uploadRatio'        : 'd',
+}
+
+# Values that mark unknown fields
+_MISSING_INT = -2**63
+_MISSING_FLOAT = float('nan')
+_MISSING = {'q': _MISSING_INT, 'd': _MISSING_FLOAT}
+
+_INITIAL_CAPACITY = 64
+
+
+def _storable(typecode, value):
+    """Return `value` converted for column with `typecode` or None"""
+    if typecode == 'q':
+        if type(value) is int and _MISSING_INT < value < 2**63:
+            return value
+    elif type(value) in (int, float):
+        value = float(value)
+        if value == value:  # Not NaN
+            return value
+    return None
+
+
+class ColumnStore():
+    """Store numeric RPC fields (see NUMERIC_FIELDS) of torrents in arrays
+
+    Each torrent is assigned a slot, which is the index of its values in all
+    columns.  Slots of removed torrents are reused.  Unknown values are NaN in
+    float columns and the smallest 64-bit integer in integer columns.
+
+    use_numpy: Whether to store columns in NumPy arrays instead of
+               `array.array`; ignored if NumPy is not installed
+    """
+    def __init__(self, use_numpy=True):
+        self._numpy = bool(use_numpy) and NUMPY_AVAILABLE
+        self._tids = []   # Map slots to torrent IDs (None for free slots)
+        self._free = []   # Free slots
+        if self._numpy:
+            self._capacity = _INITIAL_CAPACITY
+            self._columns = {field:numpy.full(self._capacity, _MISSING[tc],
+                                              dtype='int64' if tc == 'q' else 'float64')
+                             for field,tc in NUMERIC_FIELDS.items()}
+        else:
+            self._columns = {field:array.array(tc) for field,tc in NUMERIC_FIELDS.items()}
+
+    @property
+    def numpy(self):
+        """Whether columns are NumPy arrays"""
+        return self._numpy
+
+    def allocate(self, tid):
+        """Return free slot for torrent with ID `tid`"""
+        if self._free:
+            slot = self._free.pop()
+            self._tids[slot] = tid
+            return slot
+
+        slot = len(self._tids)
+        self._tids.append(tid)
+        if self._numpy:
+            if slot >= self._capacity:
+                old_capacity, self._capacity = self._capacity, self._capacity * 2
+                for field,tc in NUMERIC_FIELDS.items():
+                    col = numpy.full(self._capacity, _MISSING[tc], dtype=self._columns[field].dtype)
+                    col[:old_capacity] = self._columns[field]
+                    self._columns[field] = col
+        else:
+            for field,tc in NUMERIC_FIELDS.items():
+                self._columns[field].append(_MISSING[tc])
+        return slot
+
+    def release(self, slot):
+        """Mark `slot` as free and forget its values"""
+        for field,tc in NUMERIC_FIELDS.items():
+            self._columns[field][slot] = _MISSING[tc]
+        self._tids[slot] = None
+        self._free.append(slot)
+
+    def get(self, slot, field, default=None):
+        """Return value of `field` in `slot` or `default` if it is unknown"""
+        value = self._columns[field][slot]
+        if self._numpy:
+            value = value.item()
+        if value == _MISSING_INT or value != value:
+            return default
+        return value
+
+    def set(self, slot, field, value):
+        """Store `value` of `field` in `slot`
+
+        Return False if `value` can't be stored in `field`'s column, True
+        otherwise.
+        """
+        value = _storable(NUMERIC_FIELDS[field], value)
+        if value is None:
+            return False
+        self._columns[field][slot] = value
+        return True
+
+    def clear(self, slot, field):
+        """Mark `field` in `slot` as unknown"""
+        self._columns[field][slot] = _MISSING[NUMERIC_FIELDS[field]]
+
+    def update(self, slot, raw_torrent):
+        """Store numeric fields of `raw_torrent` in `slot`
+
+        Other fields are ignored.  Values that can't be stored are marked as
+        unknown.
+        """
+        for field,value in raw_torrent.items():
+            if field in NUMERIC_FIELDS:
+                if not self.set(slot, field, value):
+                    self.clear(slot, field)
+
+    def forget(self, slot, fields):
+        """Mark numeric `fields` in `slot` as unknown and ignore other fields"""
+        for field in fields:
+            if field in NUMERIC_FIELDS:
+                self.clear(slot, field)
+
+    def column(self, field):
+        """Return array of `field` values indexed by slot
+
+        Free slots and unknown values are marked as described in the class
+        docstring (see also `known`).
+        """
+        col = self._columns[field]
+        return col[:len(self._tids)] if self._numpy else col
+
+    def known(self, field):
+        """Return sequence of booleans that are True for slots with known `field` values"""
+        col = self.column(field)
+        if self._numpy:
+            if NUMERIC_FIELDS[field] == 'q':
+                return col != _MISSING_INT
+            else:
+                return ~numpy.isnan(col)
+        else:
+            return [v == v and v != _MISSING_INT for v in col]
+
+    @property
+    def tids(self):
+        """List that maps slots to torrent IDs (None for free slots)"""
+        return self._tids
+
+    def __len__(self):
+        return len(self._tids) - len(self._free)
+
+    def __repr__(self):
+        return '<%s %d torrents, %d slots, %s>' % (type(self).__name__, len(self),
+                                                   len(self._tids),
+                                                   'numpy' if self._numpy else 'array')
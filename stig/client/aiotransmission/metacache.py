@@ -0,0 +1,210 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Persistent storage of torrent metadata between sessions"""
+
+from ...logging import make_logger
+log = make_logger(__name__)
+
+import os
+import json
+import zlib
+import sqlite3
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+
+# RPC fields that depend only on the torrent's hash; anything that can be
+# changed (e.g. by renaming the torrent) would be stale in the next session
+PERSISTENT_FIELDS = frozenset(('hashString', 'pieceCount', 'pieceSize', 'totalSize',
+                               'dateCreated', 'creator', 'isPrivate'))
+
+# Maximum number of variables in an SQLite statement
+_MAX_VARIABLES = 999
+
+
+class MetadataCache():
+    """Store immutable RPC fields of torrents in an SQLite database
+
+    path: Path to database file; missing directories are created
+
+    Fields are stored per daemon URL and torrent hash.  If the database can't
+    be opened, read or written, the error is logged and the cache is disabled.
+
+    `get` and `update` block; use `get_async` and `update_async` in coroutines
+    to access the database in a separate thread.
+    """
+    def __init__(self, path):
+        self._path = path
+        self._db = None
+        self._failed = False
+        self._error = None
+        self._lock = threading.Lock()
+        self._executor = None
+        # Map (url, hash) to fields that were read or written in this session
+        # so updates don't have to read them again
+        self._known = {}
+
+    @property
+    def path(self):
+        """Path to database file"""
+        return self._path
+
+    def _connect(self):
+        if self._db is None and not self._failed:
+            try:
+                dirpath = os.path.dirname(self._path)
+                if dirpath:
+                    os.makedirs(dirpath, exist_ok=True)
+                # The database is accessed by the executor's thread
+                db = sqlite3.connect(self._path, check_same_thread=False)
+                db.execute('CREATE TABLE IF NOT EXISTS torrents '
+                           '(url TEXT, hash TEXT, fields BLOB, PRIMARY KEY (url, hash))')
+                db.commit()
+            except (OSError, sqlite3.Error) as e:
+                self._fail('Unable to open metadata cache %s: %s' % (self._path, e))
+            else:
+                log.debug('Opened metadata cache: %s', self._path)
+                self._db = db
+        return self._db
+
+    def _fail(self, msg):
+        # Errors are logged by the calling thread (see _log_error)
+        self._error = msg
+        self._failed = True
+        self._close_db()
+
+    def _log_error(self):
+        if self._error is not None:
+            log.error(self._error)
+            self._error = None
+
+    def _locked(self, func, *args):
+        with self._lock:
+            return func(*args)
+
+    @staticmethod
+    def _encode(fields):
+        return zlib.compress(json.dumps(fields, separators=(',', ':')).encode('utf-8'))
+
+    @staticmethod
+    def _decode(blob):
+        return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+    async def _run_in_executor(self, func, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_event_loop()
+        result = await loop.run_in_executor(self._executor, self._locked, func, *args)
+        self._log_error()
+        return result
+
+    async def get_async(self, url, hashes):
+        """Same as `get`, but run in a separate thread"""
+        return await self._run_in_executor(self._get, url, tuple(hashes))
+
+    async def update_async(self, url, raw_torrents):
+        """Same as `update`, but run in a separate thread"""
+        await self._run_in_executor(self._update, url, tuple(raw_torrents))
+
+    def get(self, url, hashes):
+        """Return dict that maps known hashes in `hashes` to dicts of RPC fields"""
+        result = self._locked(self._get, url, hashes)
+        self._log_error()
+        return result
+
+    def _get(self, url, hashes):
+        db = self._connect()
+        if db is None:
+            return {}
+        hashes = tuple(hashes)
+        result = {}
+        try:
+            for i in range(0, len(hashes), _MAX_VARIABLES-1):
+                chunk = hashes[i:i+_MAX_VARIABLES-1]
+                rows = db.execute('SELECT hash, fields FROM torrents '
+                                  'WHERE url = ? AND hash IN (%s)' % ','.join('?'*len(chunk)),
+                                  (url,) + chunk)
+                for hash, blob in rows:
+                    # Ignore fields that were stored by older versions
+                    fields = {field:value for field,value in self._decode(blob).items()
+                              if field in PERSISTENT_FIELDS}
+                    if fields:
+                        result[hash] = fields
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            self._fail('Unable to read metadata cache %s: %s' % (self._path, e))
+            return {}
+        log.debug('Found metadata of %d torrents in cache', len(result))
+        known = self._known
+        for hash,fields in result.items():
+            known[(url, hash)] = dict(fields)
+        return result
+
+    def update(self, url, raw_torrents):
+        """Store PERSISTENT_FIELDS of `raw_torrents`
+
+        Torrents without 'hashString' or with incomplete metadata are ignored.
+        Fields are added to the fields that are already stored.
+        """
+        self._locked(self._update, url, raw_torrents)
+        self._log_error()
+
+    def _update(self, url, raw_torrents):
+        new = {}
+        for rt in raw_torrents:
+            if 'hashString' in rt and rt.get('metadataPercentComplete', 0) >= 1:
+                fields = {field:value for field,value in rt.items()
+                          if field in PERSISTENT_FIELDS and field != 'hashString'}
+                if fields:
+                    new[rt['hashString']] = fields
+        if not new:
+            return
+
+        db = self._connect()
+        if db is None:
+            return
+
+        # Only read stored fields we haven't seen in this session
+        known = self._known
+        unknown = tuple(hash for hash in new if (url, hash) not in known)
+        if unknown:
+            self._get(url, unknown)
+            if self._db is None:
+                return
+        stored = {}
+        for hash,fields in new.items():
+            merged = known.setdefault((url, hash), {})
+            merged.update(fields)
+            stored[hash] = merged
+        try:
+            with db:
+                db.executemany('INSERT OR REPLACE INTO torrents (url, hash, fields) VALUES (?, ?, ?)',
+                               ((url, hash, self._encode(fields)) for hash,fields in stored.items()))
+        except sqlite3.Error as e:
+            self._fail('Unable to write metadata cache %s: %s' % (self._path, e))
+        else:
+            log.debug('Stored metadata of %d torrents in cache', len(new))
+
+    def close(self):
+        """Close database"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            self._close_db()
+
+    def _close_db(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        self._known.clear()
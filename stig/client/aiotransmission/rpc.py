@@ -15,18 +15,74 @@ from ...logging import make_logger
 log = make_logger(__name__)
 
 import asyncio
+import collections
 import json
 import textwrap
 from blinker import Signal
 import warnings
 
 from ..errors import (ConnectionError, RPCError, AuthError, ClientError)
+from ..utils import is_background_task
 
 
 AUTH_ERROR_CODE = 401
 CSRF_ERROR_CODE = 409
 CSRF_HEADER = 'X-Transmission-Session-Id'
 TIMEOUT = 10
+MAX_REQUESTS = 4
+
+
+class _RequestSlots():
+    """
+    Limit the number of concurrent requests
+
+    Free slots are handed out to interactive requests first.  Background
+    requests only get a slot if no interactive request is waiting for one.
+    """
+
+    def __init__(self, size, loop):
+        self.loop = loop
+        self._free = size
+        self._interactive = collections.deque()
+        self._background = collections.deque()
+
+    @property
+    def waiting(self):
+        """Number of requests waiting for a free slot"""
+        return len(self._interactive) + len(self._background)
+
+    async def acquire(self, background=False):
+        """Wait until a slot is available and occupy it"""
+        if self._free > 0 and self.waiting <= 0:
+            self._free -= 1
+            return
+
+        queue = self._background if background else self._interactive
+        fut = self.loop.create_future()
+        queue.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # We were given a slot, but we can't use it anymore
+                self.release()
+            else:
+                try:
+                    queue.remove(fut)
+                except ValueError:
+                    # release() already dropped our cancelled future
+                    pass
+            raise
+
+    def release(self):
+        """Give occupied slot to the next waiting request or free it"""
+        for queue in (self._interactive, self._background):
+            while queue:
+                fut = queue.popleft()
+                if not fut.done():
+                    fut.set_result(None)
+                    return
+        self._free += 1
 
 
 class TransmissionRPC():
@@ -40,7 +96,8 @@ class TransmissionRPC():
     """
 
     def __init__(self, host='localhost', port=9091, *, tls=False, user=None,
-                 password=None, path='/transmission/rpc', enabled=True, loop=None):
+                 password=None, path='/transmission/rpc', enabled=True,
+                 max_requests=MAX_REQUESTS, loop=None):
         self.loop = loop if loop is not None else asyncio.get_event_loop()
         self._host = host
         self._port = port
@@ -52,8 +109,9 @@ class TransmissionRPC():
         self._session = None
         self._enabled_event = asyncio.Event(loop=loop)
         self.enabled = enabled
-        self._request_lock = asyncio.Lock(loop=loop)
+        self.max_requests = max_requests
         self._connecting_lock = asyncio.Lock(loop=loop)
+        self._csrf_lock = asyncio.Lock(loop=loop)
         self._connection_tested = False
         self._connection_exception = None
         self._timeout = TIMEOUT
@@ -202,6 +260,27 @@ class TransmissionRPC():
     def timeout(self, timeout):
         self._timeout = float(timeout)
 
+    @property
+    def max_requests(self):
+        """
+        Maximum number of requests that are sent concurrently
+
+        Any further requests wait until one of the ongoing requests is finished.
+        Waiting requests made by the user are sent before waiting requests made
+        in the background (see `client.utils.create_background_task`).
+
+        Requests that are already waiting or being sent when this property is
+        set are not affected by the new value.
+        """
+        return self._max_requests
+    @max_requests.setter
+    def max_requests(self, max_requests):
+        max_requests = int(max_requests)
+        if max_requests < 1:
+            raise ValueError('max_requests must be at least 1: %r' % max_requests)
+        self._max_requests = max_requests
+        self._request_slots = _RequestSlots(max_requests, loop=self.loop)
+
     @property
     def enabled(self):
         """
@@ -321,6 +400,9 @@ class TransmissionRPC():
 
     async def _post(self, data):
         async def request():
+            # Remember which session ID we are sending so we can tell whether a
+            # concurrent request has already renegotiated it.
+            session_id = self._headers.get(CSRF_HEADER)
             try:
                 response = await self._session.post(self.url,
                                                     data=data,
@@ -330,10 +412,14 @@ class TransmissionRPC():
                 raise ConnectionError(self.url)
             else:
                 if response.status == CSRF_ERROR_CODE:
-                    # Send request again with CSRF header
-                    self._headers[CSRF_HEADER] = response.headers[CSRF_HEADER]
-                    log.debug('Setting CSRF header: %s = %s',
-                              CSRF_HEADER, response.headers[CSRF_HEADER])
+                    # Send request again with CSRF header.  Only the first of
+                    # any concurrently rejected requests sets the new ID; the
+                    # others simply retry with it.
+                    async with self._csrf_lock:
+                        if self._headers.get(CSRF_HEADER) == session_id:
+                            self._headers[CSRF_HEADER] = response.headers[CSRF_HEADER]
+                            log.debug('Setting CSRF header: %s = %s',
+                                      CSRF_HEADER, response.headers[CSRF_HEADER])
                     await response.release()
                     return await self._post(data)
 
@@ -361,7 +447,9 @@ class TransmissionRPC():
         post_data: Any valid RPC request as JSON string
 
         If applicable, returns response['arguments']['torrents'] or
-        response['arguments'], otherwise response.
+        response['arguments'], otherwise response.  Responses to 'torrent-get'
+        requests for 'recently-active' IDs also list removed torrents, so they
+        are returned as response['arguments'].
 
         Raises ClientError.
         """
@@ -378,7 +466,8 @@ class TransmissionRPC():
                 raise RPCError(answer['result'].capitalize())
             else:
                 if 'arguments' in answer:
-                    if 'torrents' in answer['arguments']:
+                    if 'torrents' in answer['arguments'] and \
+                       'removed' not in answer['arguments']:
                         return answer['arguments']['torrents']
                     else:
                         return answer['arguments']
@@ -395,15 +484,24 @@ class TransmissionRPC():
         >>> stats = await client.session_stats()
         >>> torrents = await client.torrent_get(ids=(1,2,3), fields=('status','name'))
 
+        Up to `max_requests` requests are sent concurrently.  If all slots are
+        taken, requests from background tasks wait until no other requests are
+        waiting.
+
         Raises RPCError, ConnectionError, AuthError
         """
         async def request(arguments={}, **kwargs):
-            async with self._request_lock:
+            # Keep a reference in case max_requests is changed while we're busy
+            slots = self._request_slots
+            await slots.acquire(background=is_background_task(self.loop))
+            try:
                 if not self.connected:
                     log.debug('Autoconnecting for %r', method)
                     await self.connect()
 
-                arguments.update(**kwargs)
+                # Don't modify `arguments` in place; concurrent requests may
+                # share the default dictionary.
+                arguments = dict(arguments, **kwargs)
                 rpc_request = json.dumps({'method'    : method.replace('_', '-'),
                                           'arguments' : arguments})
 
@@ -419,6 +517,8 @@ class TransmissionRPC():
 
                     self._on_error.send(self, error=e)
                     raise
+            finally:
+                slots.release()
 
         request.__name__ = method
         request.__qualname__ = method
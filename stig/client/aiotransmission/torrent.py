@@ -18,6 +18,8 @@ from .. import ttypes
 from .. import utils
 from .. import base
 
+import itertools
+
 
 # Some values need to be modified to comply with our internal standards
 
@@ -69,7 +71,7 @@ def _modify_timestamp_completed(t):
 
 
 def _count_seeds(t):
-    trackerStats = t['trackerStats']
+    trackerStats = t.get('trackerStats')
     if trackerStats:
         return max(t['seederCount'] for t in trackerStats)
     else:
@@ -99,6 +101,11 @@ def _is_isolated(t):
     if not t['isPrivate']:
         return False  # DHT is used
 
+    # trackerStats are requested less often (see SLOW_DEPENDENCIES); if we
+    # don't have them yet, assume non-isolation
+    if 'trackerStats' not in t:
+        return False
+
     # Torrent has trackers?
     trackerStats = t['trackerStats']
     if trackerStats:
@@ -125,7 +132,7 @@ def _find_error(t):
     # The fields 'error' and 'errorString' are not necessarily set when
     # _is_isolated returns True. (Not sure why that happens. Reproduce by
     # setting a tracker domain to 127.0.0.1 in /etc/hosts to provoke an error.)
-    trackerStats = t['trackerStats']
+    trackerStats = t.get('trackerStats', ())
     for tracker in trackerStats:
         msg = tracker['lastAnnounceResult']
         if msg != 'Success':
@@ -362,7 +369,7 @@ DEPENDENCIES = {
     'name'                         : ('name',),
     'ratio'                        : ('uploadRatio',),
     'status'                       : ('status', 'percentDone', 'metadataPercentComplete', 'rateDownload',
-                                      'rateUpload', 'peersConnected', 'trackerStats', 'isPrivate'),
+                                      'rateUpload', 'peersConnected', 'isPrivate'),
     'path'                         : ('downloadDir',),
     'private'                      : ('isPrivate',),
     'comment'                      : ('comment',),
@@ -411,6 +418,51 @@ DEPENDENCIES = {
     'files'                        : ('files', 'fileStats',),
 }
 
+# Map our keys to the number of seconds that may pass between refreshing them
+# while polling (see TorrentRequestPool); keys that are not listed are
+# refreshed on every poll
+REFRESH_INTERVALS = {
+    'path'                         : 60,
+    'peers-seeding'                : 60,
+    'trackers'                     : 60,
+}
+
+# Map our keys to tuples of RPC field names that are expensive to request and
+# change rarely, so it's fine to request them less often than DEPENDENCIES.
+# Keys must work without them.  Keys that are not needed on every poll should
+# be listed in REFRESH_INTERVALS instead so they are refreshed together with
+# their fields.
+SLOW_DEPENDENCIES = {
+    'status'                       : ('trackerStats',),
+}
+
+# Map our keys to all RPC fields that may change their values
+_ALL_DEPENDENCIES = {key:fields + SLOW_DEPENDENCIES.get(key, ())
+                     for key,fields in DEPENDENCIES.items()}
+
+# Map RPC fields to tuples of our keys that depend on them
+_DEPENDENT_KEYS = {}
+for _key,_fields in _ALL_DEPENDENCIES.items():
+    for _field in _fields:
+        _DEPENDENT_KEYS[_field] = _DEPENDENT_KEYS.get(_field, ()) + (_key,)
+del _key, _fields, _field
+
+def slow_fields_for(*keys):
+    """Return set of RPC fields from SLOW_DEPENDENCIES that `keys` need"""
+    if any(key.lower() == 'all' for key in keys):
+        keys = SLOW_DEPENDENCIES
+    return set(field
+               for key in keys
+               for field in SLOW_DEPENDENCIES.get(key, ()))
+
+# RPC fields that don't change once a torrent's metadata is complete; they are
+# only requested once per torrent.  ('name', 'files', 'trackers' and
+# 'magnetLink' are not included because torrents can be renamed and trackers
+# can be changed by other clients.)
+STATIC_FIELDS = frozenset(('hashString', 'comment', 'creator', 'dateCreated',
+                           'isPrivate', 'pieceCount', 'pieceSize', 'totalSize',
+                           'addedDate'))
+
 # Map our keys to callables that adjust the raw RPC values or create new
 # values from existing RPC values.
 _MODIFY = {
@@ -446,6 +498,22 @@ _MODIFY = {
     'files'                        : _create_TorrentFileTree,
 }
 
+# Serial numbers that identify changes of RPC fields (see Torrent.revision)
+_REVISIONS = itertools.count(1)
+
+# Map tuples of keys to the RPC fields that may change their values
+_FIELDS_FOR_KEYS = {}
+
+def _fields_for_keys(keys):
+    try:
+        return _FIELDS_FOR_KEYS[keys]
+    except KeyError:
+        fields = _FIELDS_FOR_KEYS[keys] = frozenset(field
+                                                    for key in keys
+                                                    for field in _ALL_DEPENDENCIES[key])
+        return fields
+
+
 class Torrent(base.TorrentBase):
     """Information about a torrent as a mapping
 
@@ -455,33 +523,82 @@ class Torrent(base.TorrentBase):
     def __init__(self, raw_torrent):
         self._raw = raw_torrent
         self._cache = {}
+        # Revision of all fields that haven't changed since instantiation
+        self._created = next(_REVISIONS)
+        # Map changed RPC fields to the revision of their last change
+        self._revisions = {}
 
     def update(self, raw_torrent):
+        """Update RPC fields from `raw_torrent` and return set of changed fields"""
         cache = self._cache
         raw_old = self._raw
 
-        # Remove cached values if their original/raw value(s) differ
-        for k,v in tuple(cache.items()):
-            # Each key depends on one or more RPC field
-            fields = DEPENDENCIES[k]
-            for field in fields:
-                new_value = raw_torrent.get(field)
-                old_value = raw_old.get(field)
-                if new_value is not None and new_value != old_value:
-                    # log.debug('Invalidating cached %s: %r -> %r', k, old_value, new_value)
-                    # New and previous value differ - if we are dealing with
-                    # more complex data structures (e.g. a file tree), use the
-                    # update() method to update the object in cache instead of
-                    # removing it from the cache.
-                    value = cache[k]
-                    if hasattr(value, 'update'):
-                        value.update(raw_torrent)
-                    else:
-                        del cache[k]
-                    break
+        changed_fields = set(field for field,value in raw_torrent.items()
+                             if field not in raw_old or raw_old[field] != value)
+        if changed_fields:
+            revision = next(_REVISIONS)
+            revisions = self._revisions
+            for field in changed_fields:
+                revisions[field] = revision
+
+            # Remove cached values that depend on changed fields
+            if cache:
+                updated_keys = set()
+                for field in changed_fields:
+                    for k in _DEPENDENT_KEYS.get(field, ()):
+                        if k in cache:
+                            # log.debug('Invalidating cached %s: %s changed', k, field)
+                            # If we are dealing with more complex data
+                            # structures (e.g. a file tree), use the update()
+                            # method to update the object in cache instead of
+                            # removing it from the cache.
+                            value = cache[k]
+                            if hasattr(value, 'update'):
+                                if k not in updated_keys:
+                                    value.update(raw_torrent)
+                                    updated_keys.add(k)
+                            else:
+                                del cache[k]
 
         # Now we can forget the old values
         raw_old.update(raw_torrent)
+        return changed_fields
+
+    def revision(self, keys):
+        """Return number that is increased when any value of `keys` may have changed
+
+        keys: tuple of keys
+        """
+        revisions = self._revisions
+        created = self._created
+        if not revisions:
+            return created
+        return max((revisions.get(field, created) for field in _fields_for_keys(keys)),
+                   default=created)
+
+    def has_fields(self, fields):
+        """Whether all RPC `fields` are known"""
+        raw = self._raw
+        return all(field in raw for field in fields)
+
+    def has_static_fields(self, fields):
+        """Whether all RPC `fields` are known and can't change anymore"""
+        if self._raw.get('metadataPercentComplete', 0) < 1:
+            return False
+        return self.has_fields(fields)
+
+    def forget(self, fields):
+        """Remove RPC `fields` and all cached values that depend on them"""
+        raw = self._raw
+        revision = next(_REVISIONS)
+        for field in fields:
+            if field != 'id':
+                raw.pop(field, None)
+                self._revisions[field] = revision
+        cache = self._cache
+        for field in fields:
+            for k in _DEPENDENT_KEYS.get(field, ()):
+                cache.pop(k, None)
 
     def __getitem__(self, key):
         cache = self._cache
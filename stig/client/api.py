@@ -45,12 +45,15 @@ class API(convert.bandwidth_mixin, convert.size_mixin):
     AuthError       = AuthError
 
     def __init__(self, host='localhost', port=9091, *, tls=False, user=None,
-                 password=None, path='/transmission/rpc', loop=None, interval=1):
+                 password=None, path='/transmission/rpc', max_requests=4,
+                 loop=None, interval=1):
         self.loop = loop if loop is not None else asyncio.get_event_loop()
         self._rpc = TransmissionRPC(host=host, port=port, tls=tls, user=user,
-                                    password=password, loop=self.loop, path=path)
+                                    password=password, loop=self.loop, path=path,
+                                    max_requests=max_requests)
         self._interval = interval
         self._pollers = []
+        self._treqpools = {}
         self._manage_pollers_interval = SleepUneasy(loop=self.loop)
 
     @property
@@ -98,6 +101,23 @@ class API(convert.bandwidth_mixin, convert.size_mixin):
         log.debug('Creating TorrentRequestPool singleton')
         return TorrentRequestPool(self, interval=self._interval)
 
+    def get_treqpool(self, name):
+        """
+        Return TorrentRequestPool instance for `name`
+
+        Subscribers that request the same kind of expensive keys (e.g. 'peers'
+        or 'files') should share a pool so their requests are combined.  The
+        pool is created on first use and started if it isn't running.
+        """
+        try:
+            pool = self._treqpools[name]
+        except KeyError:
+            log.debug('Creating TorrentRequestPool for %r', name)
+            pool = self._treqpools[name] = TorrentRequestPool(self, interval=self._interval)
+        if not pool.running:
+            self.manage_pollers_now()
+        return pool
+
 
     def create_poller(self, *args, interval=None, loop=None, **kwargs):
         """
@@ -171,6 +191,7 @@ class API(convert.bandwidth_mixin, convert.size_mixin):
         for pname in self._STD_POLLERS:
             if self.created(pname):
                 yield getattr(self, pname)
+        yield from self._treqpools.values()
         yield from self._pollers
 
     @property
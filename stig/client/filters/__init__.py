@@ -21,22 +21,34 @@ from itertools import zip_longest
 
 
 class BoolFilterSpec():
-    """Boolean filter specification"""
+    """Boolean filter specification
 
-    def __init__(self, func, needed_keys=(), aliases=(), description='No description'):
+    cost: Estimated relative cost of evaluating `func` once or None to guess
+          (see Filter.cost)
+    """
+
+    def __init__(self, func, needed_keys=(), aliases=(), description='No description',
+                 cost=None):
         self.filter_function = func
         self.needed_keys = needed_keys
         self.aliases = aliases
         self.description = description
+        self.cost = cost
 
 
 class CmpFilterSpec(BoolFilterSpec):
-    """Comparative filter specification"""
+    """Comparative filter specification
+
+    If `key` is given, `func` must compare the value of `key` with the user's
+    value and nothing else.  This allows FilterChain to compile the comparison
+    without calling `func`.
+    """
 
-    def __init__(self, *args, value_type, value_convert=None, **kwargs):
+    def __init__(self, *args, value_type, value_convert=None, key=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.value_type = value_type
         self.value_convert = value_convert or value_type
+        self.key = key
 
     def make_filter_func(self, operator, value):
         def func(obj):
@@ -48,6 +60,7 @@ def make_cmp_filter(types, key, description, aliases=()):
         return op(obj[key], val)
 
     kwargs = {'description' : description,
+              'key'         : key,
               'needed_keys' : (key,),
               'aliases'     : aliases,
               'value_type'  : types[key]}
@@ -206,6 +219,7 @@ class Filter():
         else:
             raise ValueError('Invalid filter name: {!r}'.format(name))
 
+        self._spec = f
         self._name, self._invert, self._op, self._value = name, invert, op, value
         self._hash = hash((name, invert, op, value))
 
@@ -221,6 +235,56 @@ class Filter():
         """Return True if `obj` matches, False otherwise"""
         return self._filter_func(obj) ^ self._invert
 
+    @property
+    def cost(self):
+        """Estimated relative cost of evaluating this filter once
+
+        Comparisons of a single key cost 1, calling a filter function costs 2
+        unless the filter's specification says otherwise.
+        """
+        spec = self._spec
+        if spec.cost is not None:
+            return spec.cost
+        elif self._name in self.BOOLEAN_FILTERS:
+            return 2
+        elif self._op is None or spec.key is not None:
+            return 1
+        else:
+            return 2
+
+    # Python code of operators in _OPERATORS; {a} and {b} are the operands
+    _OPERATOR_CODE = {
+        '=': '{a} == {b}', '~': '{b} in {a}',
+        '>': '{a} > {b}', '<': '{a} < {b}',
+        '>=': '{a} >= {b}', '<=': '{a} <= {b}',
+    }
+
+    def compile(self, namespace, obj='obj'):
+        """Return Python expression that is truthy if `obj` matches
+
+        namespace: Dictionary that is updated with any objects the expression
+                   refers to
+        obj: Name of the variable that holds the object to match
+        """
+        def add(value):
+            name = '_%d' % len(namespace)
+            namespace[name] = value
+            return name
+
+        spec = self._spec
+        if self._name in self.BOOLEAN_FILTERS:
+            expr = '%s(%s)' % (add(spec.filter_function), obj)
+        elif self._op is None:
+            # Comparative filter used as boolean filter
+            expr = ' and '.join('%s[%r]' % (obj, key) for key in spec.needed_keys) or 'True'
+        elif spec.key is not None:
+            expr = self._OPERATOR_CODE[self._op].format(a='%s[%r]' % (obj, spec.key),
+                                                       b=add(self._value))
+        else:
+            expr = '%s(%s, %s, %s)' % (add(spec.filter_function), obj,
+                                       add(self._OPERATORS[self._op]), add(self._value))
+        return '(not (%s))' % expr if self._invert else '(%s)' % expr
+
     def __str__(self):
         if self._name is None:
             return 'all'
@@ -232,6 +296,26 @@ class Filter():
             val = str(self._value)
             return name + op + val
 
+    @property
+    def name(self):
+        """Name of the filter"""
+        return self._name
+
+    @property
+    def invert(self):
+        """Whether matches are inverted"""
+        return self._invert
+
+    @property
+    def op(self):
+        """Comparison operator as string (see _OPERATORS) or None"""
+        return self._op
+
+    @property
+    def value(self):
+        """Value converted to the filter's value type or None"""
+        return self._value
+
     @property
     def needed_keys(self):
         return self._needed_keys
@@ -259,11 +343,25 @@ class FilterChain():
     filterclass = None
     _op_regex = re.compile(r'([&|])')
 
+    # Compiled predicates of all planned filter chains (see _compile)
+    _predicates = {}
+    _MAX_PREDICATES = 256
+
+    # Number of objects used to estimate the selectivity of filters and how
+    # much each sample changes the estimate (see plan)
+    _SAMPLE_SIZE = 20
+    _SAMPLE_WEIGHT = 0.2
+
     def __init__(self, filters=''):
         if not isinstance(self.filterclass, type) or not issubclass(self.filterclass, Filter):
             raise RuntimeError('Attribute "filterclass" must be set to a Filter class, not {!r}'
                                .format(self.filterclass))
 
+        # Map filters to the estimated fraction of objects that match
+        self._selectivity = {}
+        # Tuple of (plan, compiled predicate or None)
+        self._planned = None
+
         if isinstance(filters, str):  # Because str is also instance of abc.Sequence
             pass
         elif isinstance(filters, abc.Sequence) and all(isinstance(f, str) for f in filters):
@@ -319,22 +417,153 @@ class FilterChain():
             else:
                 self._filterchains = ()
 
+    def _sample(self, objects):
+        """Update selectivity of filters in AND-chains from a sample of `objects`
+
+        Return whether any estimate has changed.
+        """
+        objects = objects[::max(1, len(objects) // self._SAMPLE_SIZE)][:self._SAMPLE_SIZE]
+        selectivity = self._selectivity
+        updated = False
+        for AND_chain in self._filterchains:
+            if len(AND_chain) < 2:
+                continue
+            for f in AND_chain:
+                try:
+                    observed = sum(1 for obj in objects if f.match(obj)) / len(objects)
+                except KeyError:
+                    # Object doesn't have all needed keys
+                    continue
+                previous = selectivity.get(f)
+                if previous is not None:
+                    observed = previous + (observed - previous) * self._SAMPLE_WEIGHT
+                if observed != previous:
+                    selectivity[f] = observed
+                    updated = True
+        return updated
+
+    def _rank(self, f):
+        # Filters that are cheap and reject many objects should be evaluated
+        # first.  Unknown selectivity is assumed to be 50 %.
+        rejected = 1 - self._selectivity.get(f, 0.5)
+        return f.cost / max(rejected, 0.01)
+
+    def plan(self, objects=None):
+        """Return AND-chains with filters in the order they are evaluated
+
+        Filters in each AND-chain are sorted by their cost and the fraction of
+        objects they are expected to reject.  If `objects` is given, a sample
+        of it is used to update the expected fractions first.  The plan is
+        only replaced if this changes the order of any filters.
+        """
+        updated = bool(objects) and \
+                  any(len(AND_chain) > 1 for AND_chain in self._filterchains) and \
+                  self._sample(objects)
+        planned = self._planned
+        if planned is not None and not updated:
+            return planned[0]
+
+        # Sort by string as well so equal filter chains get the same plan
+        plan = tuple(tuple(sorted(AND_chain, key=lambda f: (self._rank(f), str(f))))
+                     if len(AND_chain) > 1 else AND_chain
+                     for AND_chain in self._filterchains)
+        if planned is not None and plan == planned[0]:
+            # Keep compiled predicate
+            return planned[0]
+        self._planned = (plan, None)
+        return plan
+
+    @classmethod
+    def _compile_chains(cls, chains):
+        """Return function that returns a truthy value for objects matching `chains`
+
+        All filters are combined in a single expression.  Equal chains share
+        the same function.
+        """
+        predicates = cls._predicates
+        key = (cls, chains)
+        try:
+            return predicates[key]
+        except KeyError:
+            pass
+
+        # All filters in an AND_chain must match for the AND_chain to
+        # match.  At least one AND_chain must match.
+        namespace = {}
+        expr = ' or '.join('(%s)' % ' and '.join(f.compile(namespace) for f in AND_chain)
+                           for AND_chain in chains) or 'True'
+        code = 'def predicate(obj):\n    return %s\n' % expr
+        log.debug('Compiled %s', expr)
+        exec(code, namespace)
+
+        if len(predicates) >= cls._MAX_PREDICATES:
+            predicates.clear()
+        predicate = predicates[key] = namespace['predicate']
+        return predicate
+
+    def _compile(self, objects=None):
+        """Return compiled predicate of the current plan (see `plan`)"""
+        plan = self.plan(objects)
+        predicate = self._planned[1]
+        if predicate is None:
+            predicate = self._compile_chains(plan)
+            self._planned = (plan, predicate)
+        return predicate
+
+    # Filters with higher cost are not used to find candidates (see prefetch_keys)
+    _MAX_PREFETCH_COST = 2
+
+    def _prefetch_chains(self):
+        # Leading cheap filters of each planned AND-chain (at least one)
+        chains = []
+        for AND_chain in self.plan():
+            prefix = [AND_chain[0]]
+            for f in AND_chain[1:]:
+                if f.cost > self._MAX_PREFETCH_COST:
+                    break
+                prefix.append(f)
+            chains.append(tuple(prefix))
+        return tuple(chains)
+
+    @property
+    def prefetch_keys(self):
+        """The object keys needed to find candidates (see `prefilter`)
+
+        If these are less than `needed_keys`, the remaining keys are only
+        needed for the objects `prefilter` yields.
+        """
+        keys = set()
+        for chain in self._prefetch_chains():
+            for filter in chain:
+                keys.update(filter.needed_keys)
+        return tuple(keys)
+
+    def prefilter(self, objects):
+        """Yield objects from iterable `objects` that may match
+
+        Only filters that need `prefetch_keys` are used.
+        """
+        if self._filterchains:
+            yield from filter(self._compile_chains(self._prefetch_chains()), objects)
+        else:
+            yield from objects
+
     def apply(self, objects):
         """Yield matching objects from iterable `objects`"""
         if self._filterchains:
-            yield from filter(self.match, objects)
+            objects = tuple(objects)
+            yield from filter(self._compile(objects), objects)
         else:
             yield from objects
 
     def match(self, obj):
         """Whether `obj` matches this filter chain"""
-        # All filters in an AND_chain must match for the AND_chain to
-        # match.  At least one AND_chain must match.
-        if len(self._filterchains) < 1:
-            return True
-        else:
-            return any(all(f.match(obj) for f in AND_chain)
-                       for AND_chain in self._filterchains)
+        return bool(self._compile()(obj))
+
+    @property
+    def chains(self):
+        """Tuple of AND-combined tuples of filters that are combined with OR"""
+        return self._filterchains
 
     @property
     def needed_keys(self):
@@ -356,6 +585,9 @@ class FilterChain():
             other_fc_sets = set(frozenset(x) for x in other._filterchains)
             return self_fc_sets == other_fc_sets
 
+    def __hash__(self):
+        return hash(frozenset(frozenset(x) for x in self._filterchains))
+
     def __str__(self):
         if len(self._filterchains) < 1:
             return 'all'
@@ -41,18 +41,22 @@ class SingleTorrentPeerFilter(Filter):
     COMPARATIVE_FILTERS = {
         'client': CmpFilterSpec(
             lambda p, op, v: op(p['client'], v),
+            key='client',
             description='Match VALUE against peer client',
             value_type=TorrentPeer.TYPES['client']),
         'country': CmpFilterSpec(
             lambda p, op, v: op(p['country'], v),
+            key='country',
             description='Match VALUE against peer country',
             value_type=TorrentPeer.TYPES['country']),
         'ip': CmpFilterSpec(
             lambda p, op, v: op(p['ip'], v),
+            key='ip',
             description='Match VALUE against peer IP address',
             value_type=TorrentPeer.TYPES['ip']),
         'port': CmpFilterSpec(
             lambda p, op, v: op(p['port'], v),
+            key='port',
             description='Match VALUE against peer port',
             value_type=TorrentPeer.TYPES['port']),
         'downloaded': CmpFilterSpec(
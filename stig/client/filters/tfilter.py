@@ -144,6 +144,7 @@ class SingleTorrentFilter(Filter):
             description=_desc('... domain of the announce URL of trackers'),
             needed_keys=('trackers',),
             value_type=str,
+            cost=10,
         ),
 
         'eta': CmpFilterSpec(
@@ -17,7 +17,7 @@ import functools
 import blinker
 
 from . import errors
-from .utils import SleepUneasy
+from .utils import (SleepUneasy, create_background_task)
 
 
 def _func_call_str(func, *posargs, **kwargs):
@@ -59,6 +59,7 @@ class RequestPoller():
         self._poll_loop_task = None
         self._sleep = SleepUneasy(loop=loop)
         self._skip_ongoing_request = False
+        self._poll_again = False
         self._debug_info = {'request': 'No request specified yet',
                             'update_cbs': [], 'error_cbs': []}
         self.set_request(request, *args, **kwargs)
@@ -82,7 +83,9 @@ class RequestPoller():
     async def _poll_loop(self):
         self._prev_error = None
         while True:
-            self._poll_task = self.loop.create_task(self._do_poll())
+            self._poll_again = False
+            # Polling requests must not hold up requests made by the user
+            self._poll_task = create_background_task(self._do_poll(), loop=self.loop)
             try:
                 await self._poll_task
             except asyncio.CancelledError:
@@ -97,6 +100,9 @@ class RequestPoller():
                 self._poll_task = None
                 self._skip_ongoing_request = False
 
+            if self._poll_again:
+                log.debug('Polling again: %s', self._debug_info['request'])
+                continue
             await self._sleep.sleep(self._interval)
 
     async def _do_poll(self):
@@ -171,10 +177,17 @@ class RequestPoller():
         This also resets the interval - the next request is made `interval`
         seconds after this method is called.
 
+        If a request is currently ongoing, it is allowed to finish and a new
+        request is made immediately after it.  (Cancelling it could mean that
+        slow requests never finish if this method is called often.)
+
         Do nothing if this poller is not started.
         """
         if self.running:
-            self._sleep.interrupt()
+            if self._poll_task is not None and not self._poll_task.done():
+                self._poll_again = True
+            else:
+                self._sleep.interrupt()
 
     @property
     def running(self):
@@ -12,7 +12,48 @@
 from ...logging import make_logger
 log = make_logger(__name__)
 
-from functools import partial
+import time
+import heapq
+
+
+class _Reversed():
+    """Wrapper that inverts the order of sort keys"""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __repr__(self):
+        return '<%s %r>' % (type(self).__name__, self.value)
+
+
+def _make_keyfunc(levels):
+    """Return function that returns a single sort key and whether to reverse
+
+    levels: Sequence of (keyfunc, reverse) tuples with the most significant
+            one first
+    """
+    keyfuncs = tuple(keyfunc for keyfunc,_ in levels)
+    reverses = set(reverse for _,reverse in levels)
+    if len(reverses) == 1:
+        # All levels are sorted in the same direction
+        reverse = reverses.pop()
+        if len(keyfuncs) == 1:
+            return keyfuncs[0], reverse
+        else:
+            return (lambda item: tuple(keyfunc(item) for keyfunc in keyfuncs)), reverse
+    else:
+        def keyfunc(item):
+            return tuple(_Reversed(keyfunc(item)) if reverse else keyfunc(item)
+                         for keyfunc,reverse in levels)
+        return keyfunc, False
 
 
 class SortSpecBase():
@@ -21,19 +62,27 @@ class SortSpecBase():
         self.description = description
         self.aliases = aliases
 
+    @property
+    def levels(self):
+        """Key functions with the most significant one first
+
+        Items are sorted by the last keyfunc, items with equal keys by the
+        second-to-last keyfunc and so on.
+        """
+        return tuple(reversed(self._keyfuncs))
+
     def __call__(self, items, reverse=False, inplace=False, item_getter=lambda item: item):
         if not items:
             return items
 
-        for keyfunc in self._keyfuncs:
-            def key_getter(item):
-                return keyfunc(item_getter(item))
-
-            if inplace:
-                items[:] = sorted(items, key=key_getter, reverse=reverse)
-            else:
-                items = sorted(items, key=key_getter, reverse=reverse)
+        keyfunc, reverse = _make_keyfunc(tuple((keyfunc, reverse) for keyfunc in self.levels))
+        def key_getter(item):
+            return keyfunc(item_getter(item))
 
+        if inplace:
+            items[:] = sorted(items, key=key_getter, reverse=reverse)
+        else:
+            items = sorted(items, key=key_getter, reverse=reverse)
         return items
 
 
@@ -52,7 +101,7 @@ class SorterBase():
 
     def __init__(self, sortstrings=()):
         sortspecs = []
-        sortfuncs = []
+        reverses = []
         strings = []   # String representations of sortspecs
 
         # Go through items in reverse because to want to deduplicate sort orders
@@ -72,9 +121,8 @@ class SorterBase():
             else:
                 sortspec = self.SORTSPECS[sortspecname]
                 if sortspec not in sortspecs:
-                    sortfunc = partial(sortspec, reverse=reverse)
                     sortspecs.insert(0, sortspec)
-                    sortfuncs.insert(0, sortfunc)
+                    reverses.insert(0, reverse)
                     strings.insert(0, ('!' if reverse else '') + sortspecname)
         self._strings = tuple(strings)
 
@@ -82,13 +130,78 @@ class SorterBase():
         if self.DEFAULT_SORT is not None:
             default_sortspec = self.SORTSPECS[self.DEFAULT_SORT]
             if default_sortspec not in sortspecs:
-                sortfuncs.insert(0, default_sortspec)
                 sortspecs.insert(0, default_sortspec)
+                reverses.insert(0, False)
 
         self._sortspecs = sortspecs
-        self._sortfuncs = sortfuncs
+        self._reverses = reverses
+
+        # The last sort order is the most significant one.  Instead of sorting
+        # once for each sort order, sort once by a key that combines them.
+        levels = tuple((keyfunc, reverse)
+                       for sortspec,reverse in reversed(tuple(zip(sortspecs, reverses)))
+                       for keyfunc in sortspec.levels)
+        self._keyfunc, self._reverse = _make_keyfunc(levels)
+
+        # Map item IDs to (revision, sort key) tuples (see _cache_id)
+        self._keycache = {}
+
+    def _cache_id(self, obj):
+        """Return (ID, revision) tuple of `obj` or None
 
-    def apply(self, items, inplace=False, item_getter=lambda item: item):
+        If this returns a tuple, the sort key of `obj` is only computed again
+        if its revision has changed since the last call to `apply`.
+        """
+        return None
+
+    def _sortkey(self, item_getter):
+        keyfunc = self._keyfunc
+        cache_id = self._cache_id
+        keycache = self._keycache
+
+        def sortkey(item):
+            obj = item_getter(item)
+            cid = cache_id(obj)
+            if cid is None:
+                return keyfunc(obj)
+            id, revision = cid
+            cached = keycache.get(id)
+            if cached is not None and cached[0] == revision:
+                return cached[1]
+            key = keyfunc(obj)
+            keycache[id] = (revision, key)
+            return key
+
+        return sortkey
+
+    def sortkey(self, item_getter=lambda item: item):
+        """Return function that returns the sort key of an item
+
+        item_getter: See `apply`
+
+        Items in ascending order of their sort keys are sorted like `apply`
+        sorts them, so the keys can be used to keep a list sorted (e.g. with
+        the bisect module).
+        """
+        sortkey = self._sortkey(item_getter)
+        if self._reverse:
+            return lambda item: _Reversed(sortkey(item))
+        else:
+            return sortkey
+
+    def prune(self, ids):
+        """Forget cached sort keys of items with IDs that are not in `ids`
+
+        Sort keys computed by `apply` and `sortkey` are cached until this is
+        called with the IDs of all existing items (which may be more than the
+        items that were sorted, e.g. if a list is filtered).
+        """
+        keycache = self._keycache
+        if len(keycache) > len(ids):
+            for id in tuple(id for id in keycache if id not in ids):
+                del keycache[id]
+
+    def apply(self, items, inplace=False, item_getter=lambda item: item, limit=None):
         """Sort sequence `items`
 
         item_getter: Callable that gets an item of `items` and returns an
@@ -97,12 +210,23 @@ class SorterBase():
                      sorting of widgets as long as they can provide a sortable
                      object.)
         inplace: Modify `items` if True, otherwise return a new list
+        limit: Maximum number of items to keep or None to keep all items; only
+               the first `limit` items are sorted (this is much faster than
+               sorting all items if `limit` is small)
         """
-        import time
         start_time = time.monotonic()
+        sortkey = self._sortkey(item_getter)
+        if limit is None or limit >= len(items):
+            sorted_items = sorted(items, key=sortkey, reverse=self._reverse)
+        elif self._reverse:
+            sorted_items = heapq.nlargest(limit, items, key=sortkey)
+        else:
+            sorted_items = heapq.nsmallest(limit, items, key=sortkey)
 
-        for sorter in self._sortfuncs:
-            items = sorter(items, inplace=inplace, item_getter=item_getter)
+        if inplace:
+            items[:] = sorted_items
+        else:
+            items = sorted_items
 
         log.debug('-> Sorted %d items by %s in %.3fms',
                   len(items), self, (time.monotonic()-start_time)*1e3)
@@ -126,6 +126,12 @@ class TorrentSorter(SorterBase):
               for sortspec in self._sortspecs)
         ))
 
+    def _cache_id(self, torrent):
+        # Sort keys of torrents only change if the RPC fields of the needed
+        # keys change
+        if hasattr(torrent, 'revision'):
+            return (torrent['id'], torrent.revision(self._needed_keys))
+
     @property
     def needed_keys(self):
         return self._needed_keys
@@ -13,43 +13,95 @@ from ..logging import make_logger
 log = make_logger(__name__)
 
 import blinker
+import asyncio
 import operator
 from functools import reduce
 from collections import abc
 
 from .poll import RequestPoller
+from .utils import create_task
 from .filters.tfilter import TorrentFilter
+from .aiotransmission.torrent import REFRESH_INTERVALS
+
+
+# Keys with refresh intervals are requested by torrent ID only for up to this
+# many torrents; if more torrents need them, they are requested for all
+# torrents to keep the request small
+_MAX_TIER_IDS = 100
+
+
+def _as_tfilter(tfilter):
+    if isinstance(tfilter, TorrentFilter):
+        return tfilter
+    # Combining IDs with filters is rare, so a filter that matches the IDs is
+    # good enough
+    return TorrentFilter('|'.join('id=%d' % tid for tid in sorted(tfilter)))
 
 
 class TorrentRequestPool(RequestPoller):
     """Combine multiple `TorrentAPI.torrents` requests into one
 
     The wanted Torrent keys from all subscribers are combined and added to the
-    needed keys for TorrentFilter from all subscribers.
+    needed keys for TorrentFilter from all subscribers.  If all subscribers
+    want specific torrent IDs, the torrents are requested by their combined
+    IDs.
 
     After the combined torrents have arrived, split it back up by using each
-    subscriber's filter and provide it to its callbacks as tuples.
+    subscriber's filter and provide it to its callbacks as tuples.  Each
+    subscriber's filter is only applied to torrents if the values of any keys
+    it needs have changed since it was last applied to them (see
+    `Torrent.revision`).
+
+    If `resync` is greater than 1, all torrents are only requested every
+    `resync` polls.  In between, only recently active torrents are requested
+    and the rest is provided from cache.
+
+    Keys that don't change often (see `REFRESH_INTERVALS`) are grouped by
+    their refresh interval and requested separately when their interval has
+    passed or when any torrent doesn't have them yet.
     """
-    def __init__(self, srvapi, interval=1):
+    def __init__(self, srvapi, interval=1, resync=0):
         self._api = srvapi.torrent
         self._tfilters = {}
         self._keys = {}
+        self._intervals = {}
+        self._matches = {}
+        self._refreshed = {}
+        self._resync = resync
+        self._polls = 0
         super().__init__(request=None, interval=interval, loop=srvapi.loop)
         self.on_response(self._handle_tlist)
 
-    def register(self, sid, callback, keys=(), tfilter=None):
+    @property
+    def resync(self):
+        """Number of polls between requests for all torrents (0 to always request all)"""
+        return self._resync
+
+    @resync.setter
+    def resync(self, resync):
+        self._resync = int(resync)
+
+    def register(self, sid, callback, keys=(), tfilter=None, intervals={}):
         """Add new request to request pool
 
         sid: Subscriber ID (any hashable)
         callback: Callable that receives a tuple of Torrents on updates
         keys: Wanted Torrent keys
-        tfilter: None for all torrents or TorrentFilter instance
+        tfilter: None for all torrents, TorrentFilter instance or sequence of
+                 torrent IDs
+        intervals: Mapping of keys to the number of seconds that may pass
+                   between refreshing them; keys that are not specified
+                   default to `REFRESH_INTERVALS` or 0 (refresh on every poll)
         """
         log.debug('Registering subscriber: %s', sid)
         event = blinker.signal(sid)
         event.connect(callback)
         self._keys[event] = tuple(keys)
+        if tfilter is not None and not isinstance(tfilter, TorrentFilter):
+            tfilter = frozenset(tfilter)
         self._tfilters[event] = tfilter
+        self._intervals[event] = dict(intervals)
+        self._matches[event] = {}
 
         # It's possible that a currently ongoing request doesn't collect the
         # keys this new callback needs.  In that case, the request is finished
@@ -75,19 +127,78 @@ class TorrentRequestPool(RequestPoller):
             if not all_filters or None in all_filters:
                 # No subscribers or at least one subscriber wants all torrents
                 kwargs['torrents'] = None
+            elif not any(isinstance(f, TorrentFilter) for f in all_filters):
+                # All subscribers want specific torrent IDs
+                kwargs['torrents'] = tuple(sorted(reduce(operator.__or__, all_filters)))
             else:
-                kwargs['torrents'] = reduce(operator.__add__, all_filters)
+                kwargs['torrents'] = reduce(operator.__add__, (_as_tfilter(f) for f in all_filters))
 
-            kwargs['keys'] = reduce(operator.__add__, self._keys.values())
-            # Filters also need certain keys
+            # Map each key to the shortest refresh interval any subscriber wants
+            intervals = {}
+            for event,keys in self._keys.items():
+                sub_intervals = self._intervals[event]
+                for key in keys:
+                    interval = sub_intervals.get(key, REFRESH_INTERVALS.get(key, 0))
+                    intervals[key] = min(interval, intervals.get(key, interval))
+
+            # Filters need their keys on every poll
             for f in all_filters:
-                if f is not None:
-                    kwargs['keys'] += f.needed_keys
+                if isinstance(f, TorrentFilter):
+                    for key in f.needed_keys:
+                        intervals[key] = 0
 
-            kwargs['keys'] = tuple(set(kwargs['keys']))
+            tiers = {}
+            for key,interval in intervals.items():
+                tiers.setdefault(interval, []).append(key)
+            kwargs['keys'] = tuple(tiers.pop(0, ()))
+            kwargs['tiers'] = {interval:tuple(keys) for interval,keys in tiers.items()}
             log.debug('Combined filters: %s', kwargs['torrents'])
             log.debug('Combined keys: %s', kwargs['keys'])
-            self.set_request(self._api.torrents, **kwargs)
+            log.debug('Combined keys with refresh intervals: %s', kwargs['tiers'])
+            self.set_request(self._request_torrents, **kwargs)
+
+    async def _request_torrents(self, torrents, keys, tiers={}):
+        # Every `resync` polls, request all torrents to make sure we didn't
+        # miss anything
+        self._polls += 1
+        delta = self._resync > 1 and self._polls % self._resync != 0
+        response = await self._api.torrents(torrents, keys=keys, delta=delta)
+        if not tiers or not response.success:
+            return response
+
+        # Request keys with longer refresh intervals for the same torrents if
+        # their interval has passed or if any torrents are lacking them
+        tlist = response.torrents
+        now = self.loop.time()
+        requests = []
+        refreshed = []
+        for interval,tier_keys in tiers.items():
+            last_refresh = self._refreshed.get(interval)
+            if last_refresh is None or now - last_refresh >= interval:
+                tids = tuple(t['id'] for t in tlist)
+                refreshed.append(interval)
+                if torrents is None:
+                    # We got all torrents, so we don't have to list them
+                    tids = None
+            else:
+                tids = tuple(t['id'] for t in tlist
+                             if not all(key in t for key in tier_keys))
+            if tids is not None and len(tids) > _MAX_TIER_IDS:
+                tids = None
+            if tids is None or tids:
+                log.debug('Refreshing %s of %s torrents', tier_keys,
+                          'all' if tids is None else len(tids))
+                # Tier requests have the same priority as the request above
+                requests.append(create_task(self._api.torrents(tids, keys=tier_keys),
+                                            loop=self.loop))
+
+        if requests:
+            for tier_response in await asyncio.gather(*requests, loop=self.loop):
+                if not tier_response.success:
+                    return tier_response
+        for interval in refreshed:
+            self._refreshed[interval] = now
+        return response
 
     def _handle_tlist(self, response):
         # If the request failed, response is None and tlist is empty.
@@ -119,21 +230,52 @@ class TorrentRequestPool(RequestPoller):
                     if filter is None:
                         # Subscriber wants all torrents
                         this_tlist = tlist
+                    elif not isinstance(filter, TorrentFilter):
+                        # Subscriber wants specific torrent IDs
+                        this_tlist = tuple(t for t in tlist if t['id'] in filter)
                     else:
                         # Subscriber wants filtered torrents
-                        this_tlist = filter.apply(tlist)
+                        this_tlist = self._apply_filter(event, filter, tlist)
                     event.send(this_tlist)
 
         # Remove dead subscribers
         for eventname in dead_subscribers:
             self.remove(eventname)
 
+    def _apply_filter(self, event, tfilter, tlist):
+        """Return tuple of torrents in `tlist` that match `tfilter`
+
+        Matches are remembered for `event` together with the revision of the
+        keys `tfilter` needs, and a torrent is only matched again if that
+        revision has changed.
+        """
+        keys = tuple(tfilter.needed_keys)
+        match = tfilter.match
+        prev_matches = self._matches[event]
+        matches = {}
+        this_tlist = []
+        for t in tlist:
+            tid = t['id']
+            revision = t.revision(keys)
+            prev = prev_matches.get(tid)
+            if prev is not None and prev[0] == revision:
+                matches[tid] = prev
+            else:
+                matches[tid] = prev = (revision, match(t))
+            if prev[1]:
+                this_tlist.append(t)
+        # Torrents that are gone are forgotten
+        self._matches[event] = matches
+        return tuple(this_tlist)
+
     def remove(self, sid):
         """Unsubscribe previously registered subscriber"""
         log.debug('Removing subscriber: %s', sid)
         event = blinker.signal(sid)
         del self._keys[event]
         del self._tfilters[event]
+        del self._intervals[event]
+        del self._matches[event]
         self._combine_requests()
 
     @property
@@ -9,6 +9,9 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
+import asyncio
+import weakref
+
 
 class PerfectInterval():
     """Remove processing time from intervals"""
@@ -30,7 +33,6 @@ class PerfectInterval():
             return interval
 
 
-import asyncio
 class SleepUneasy():
     """Asynchronous sleep() that can be aborted"""
 
@@ -56,6 +58,40 @@ class SleepUneasy():
         self._interrupt.set()
 
 
+_BACKGROUND_TASKS = weakref.WeakSet()
+
+try:
+    _current_task = asyncio.current_task
+except AttributeError:
+    _current_task = asyncio.Task.current_task  # Python < 3.7
+
+def create_background_task(coro, loop):
+    """Wrap `coro` in a task and flag it as not initiated by the user
+
+    RPC requests made in a background task (e.g. by a poller) have lower
+    priority than requests made in any other task (e.g. by a command).
+    """
+    task = loop.create_task(coro)
+    _BACKGROUND_TASKS.add(task)
+    return task
+
+def is_background_task(loop):
+    """Whether the current task was created with `create_background_task`"""
+    return _current_task(loop=loop) in _BACKGROUND_TASKS
+
+def create_task(coro, loop):
+    """Wrap `coro` in a task that has the same priority as the current task
+
+    Use this instead of `loop.create_task`, `asyncio.ensure_future` or passing
+    coroutines to `asyncio.gather` when requests are made concurrently, so
+    requests of a background task stay in the background.
+    """
+    if is_background_task(loop):
+        return create_background_task(coro, loop=loop)
+    else:
+        return loop.create_task(coro)
+
+
 from types import SimpleNamespace
 class Response(SimpleNamespace):
     """Response to an API call
@@ -33,7 +33,8 @@ class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
                 'ls !active',
                 'ls seeds<10',
                 'ls active&tracker~example.org',
-                'ls active|idle&tracker~example')
+                'ls active|idle&tracker~example',
+                'ls --sort !rate-up --limit 20')
     argspecs = (
         make_X_FILTER_spec('TORRENT', or_focused=False, nargs='*'),
 
@@ -46,6 +47,10 @@ class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
           'default_description': "current value of 'columns.torrents' setting",
           'description': ('Comma-separated list of column names '
                           "(see COLUMNS section)") },
+
+        { 'names': ('--limit', '-l'), 'type': int,
+          'description': ('List only the first LIMIT torrents of the sort order '
+                          '(e.g. the 10 fastest uploads with --sort !rate-up)') },
     )
 
     from ...views.trackerlist import COLUMNS
@@ -58,9 +63,12 @@ class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
 
     cfg = ExpectedResource
 
-    async def run(self, TORRENT_FILTER, sort, columns):
+    async def run(self, TORRENT_FILTER, sort, columns, limit):
         sort = self.cfg['sort.torrents'].value if sort is None else sort
         columns = self.cfg['columns.torrents'].value if columns is None else columns
+        if limit is not None and limit < 1:
+            log.error('Invalid limit: %s', limit)
+            return False
         try:
             columns = self.get_torrent_columns(columns)
             tfilter = self.select_torrents(TORRENT_FILTER,
@@ -73,9 +81,9 @@ class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
         else:
             log.debug('Listing %s torrents sorted by %s', tfilter, sort)
             if asyncio.iscoroutinefunction(self.make_tlist):
-                return await self.make_tlist(tfilter, sort, columns)
+                return await self.make_tlist(tfilter, sort, columns, limit)
             else:
-                return self.make_tlist(tfilter, sort, columns)
+                return self.make_tlist(tfilter, sort, columns, limit)
 
 
 class TorrentSummaryCmdbase(mixin.get_torrent, metaclass=InitCommand):
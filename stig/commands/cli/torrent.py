@@ -25,7 +25,7 @@ class ListTorrentsCmd(base.ListTorrentsCmdbase,
     provides = {'cli'}
     srvapi = ExpectedResource  # TUI version of 'list' doesn't need srvapi
 
-    async def make_tlist(self, tfilter, sort, columns):
+    async def make_tlist(self, tfilter, sort, columns, limit=None):
         from ...views.torrentlist import COLUMNS as TORRENT_COLUMNS
 
         # Remove columns that aren't supported by CLI interface (e.g. 'marked')
@@ -36,12 +36,28 @@ class ListTorrentsCmd(base.ListTorrentsCmdbase,
             keys = set(sort.needed_keys)
         else:
             keys = set(sort.needed_keys + tfilter.needed_keys)
+        column_keys = set()
         for colname in columns:
-            keys.update(TORRENT_COLUMNS[colname].needed_keys)
-        response = await self.make_request(
-            self.srvapi.torrent.torrents(tfilter, keys=keys),
-            quiet=True)
-        torrents = sort.apply(response.torrents)
+            column_keys.update(TORRENT_COLUMNS[colname].needed_keys)
+
+        if limit is None:
+            response = await self.make_request(
+                self.srvapi.torrent.torrents(tfilter, keys=keys | column_keys),
+                quiet=True)
+            torrents = sort.apply(response.torrents)
+        else:
+            # Find the first `limit` torrents before requesting column keys
+            # for them only
+            response = await self.make_request(
+                self.srvapi.torrent.torrents(tfilter, keys=keys),
+                quiet=True)
+            torrents = sort.apply(response.torrents, limit=limit)
+            if torrents and not column_keys.issubset(keys):
+                response = await self.make_request(
+                    self.srvapi.torrent.torrents(tuple(t['id'] for t in torrents),
+                                                 keys=keys | column_keys),
+                    quiet=True)
+                torrents = sort.apply(response.torrents)
 
         if torrents:
             print_table(torrents, columns, TORRENT_COLUMNS)
@@ -131,11 +131,11 @@ class select_torrents():
         """
         Return IDs of marked items in the current or previous tab
 
-        This relies on the widget having a `marked` attribute.
+        This relies on the widget having a `marked_ids` attribute.
         """
         widget = self._get_current_or_previous_tab()
-        if hasattr(widget, 'marked'):
-            tids = tuple(twidget.id for twidget in widget.marked)
+        if hasattr(widget, 'marked_ids'):
+            tids = tuple(widget.marked_ids)
             if tids:
                 return tids
 
@@ -22,11 +22,11 @@ class ListTorrentsCmd(base.ListTorrentsCmdbase,
                       mixin.create_list_widget):
     provides = {'tui'}
 
-    def make_tlist(self, tfilter, sort, columns):
+    def make_tlist(self, tfilter, sort, columns, limit=None):
         from ...tui.views.torrentlist import TorrentListWidget
         self.create_list_widget(TorrentListWidget, theme_name='torrentlist',
                                 tfilter=tfilter, sort=sort, columns=columns,
-                                markable_items=True)
+                                limit=limit, markable_items=True)
         return True
 
 
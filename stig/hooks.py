@@ -15,6 +15,9 @@ from .logging import make_logger
 log = make_logger(__name__)
 
 from .main import (cfg, srvapi)
+from .client import MetadataCache
+from .settings.defaults import DEFAULT_METADATA_FILE
+from .views import ColumnBase
 from .views.torrentlist import COLUMNS as TORRENT_COLUMNS
 from .views.filelist import COLUMNS as FILE_COLUMNS
 from .views.peerlist import COLUMNS as PEER_COLUMNS
@@ -32,6 +35,19 @@ cfg['connect.user'].on_change(_make_connection_callback('user'), autoremove=Fals
 cfg['connect.password'].on_change(_make_connection_callback('password'), autoremove=False)
 cfg['connect.tls'].on_change(_make_connection_callback('tls'), autoremove=False)
 cfg['connect.timeout'].on_change(_make_connection_callback('timeout'), autoremove=False)
+cfg['connect.max-requests'].on_change(_make_connection_callback('max_requests'), autoremove=False)
+
+def _set_metadata_cache(setting):
+    if setting.value:
+        srvapi.torrent.metacache = MetadataCache(DEFAULT_METADATA_FILE)
+    elif srvapi.torrent.metacache is not None:
+        srvapi.torrent.metacache.close()
+        srvapi.torrent.metacache = None
+cfg['connect.metadata-cache'].on_change(_set_metadata_cache, autoremove=False)
+
+def _set_column_cache_size(setting):
+    ColumnBase.set_cache_size(setting.value)
+cfg['columns.cache-size'].on_change(_set_column_cache_size, autoremove=False)
 
 
 def _set_bandwidth_unit(unit):
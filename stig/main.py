@@ -60,6 +60,7 @@ srvapi = API(host=cfg['connect.host'].value,
              user=cfg['connect.user'].value,
              password=cfg['connect.password'].value,
              tls=cfg['connect.tls'].value,
+             max_requests=cfg['connect.max-requests'].value,
              interval=cfg['tui.poll'].value,
              loop=aioloop)
 srvapi.rpc.enabled = False
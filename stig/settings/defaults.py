@@ -24,6 +24,7 @@ from ..client.sorters.trksorter import TorrentTrackerSorter
 
 DEFAULT_RCFILE        = os.path.join(XDG_CONFIG_HOME, __appname__, 'rc')
 DEFAULT_HISTORY_FILE  = os.path.join(XDG_CACHE_HOME, __appname__, 'history')
+DEFAULT_METADATA_FILE = os.path.join(XDG_CACHE_HOME, __appname__, 'metadata')
 DEFAULT_THEME_FILE    = os.path.join(os.path.dirname(__file__), 'default.theme')
 
 DEFAULT_TORRENT_SORT = ('name',)
@@ -74,6 +75,11 @@ def init_defaults(cfg):
                     description='Number of seconds before connecting to Transmission RPC interface fails'),
         BooleanValue('connect.tls', default=False,
                     description='Whether to connect via HTTPS to the Transmission RPC interface'),
+        IntegerValue('connect.max-requests', default=4, min=1,
+                     description='Maximum number of concurrent requests to Transmission RPC interface'),
+        BooleanValue('connect.metadata-cache', default=False,
+                     description=('Whether to store torrent metadata (e.g. sizes and creators) '
+                                  'between sessions in $XDG_CACHE_HOME/stig/metadata')),
 
         SetValue('columns.torrents', default=DEFAULT_TORRENT_COLUMNS,
                  options=torrentlist.COLUMNS,
@@ -91,6 +97,9 @@ def init_defaults(cfg):
                  options=trackerlist.COLUMNS,
                  aliases=trackerlist.ALIASES,
                  description='List of columns in new tracker lists'),
+        IntegerValue('columns.cache-size', default=10000, min=0,
+                     description=('Maximum number of formatted column values that are '
+                                  'kept for reuse (0 to disable caching)')),
 
         SortOrderValue(TorrentSorter, 'sort.torrents', default=DEFAULT_TORRENT_SORT,
                        description='List of torrent list sort orders'),
@@ -112,6 +121,13 @@ def init_defaults(cfg):
                   description='Maximum number of lines in history file'),
         NumberValue('tui.poll', default=5, min=0.1,
                     description='Interval in seconds between TUI updates'),
+        IntegerValue('tui.poll.resync', default=30, min=0,
+                     description=('Request all torrents every this many TUI updates and '
+                                  'only recently active torrents in between '
+                                  '(0 to always request all torrents)')),
+        IntegerValue('tui.max-fps', default=10, min=1,
+                     description=('Maximum number of screen updates per second '
+                                  '(user input is always displayed immediately)')),
 
         OptionValue('unit.bandwidth', default='byte', options=('bit', 'byte'),
                     description="Unit for bandwidth rates ('bit' or 'byte')"),
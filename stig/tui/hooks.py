@@ -64,6 +64,17 @@ def _set_poll_interval(seconds):
 cfg['tui.poll'].on_change(_set_poll_interval)
 
 
+def _set_poll_resync(polls):
+    tui.srvapi.treqpool.resync = polls.value
+cfg['tui.poll.resync'].on_change(_set_poll_resync)
+_set_poll_resync(cfg['tui.poll.resync'])
+
+
+def _set_max_fps(fps):
+    tui.urwidloop.max_fps = fps.value
+cfg['tui.max-fps'].on_change(_set_max_fps)
+
+
 def _set_cli_history_file(histfile):
     tui.cli.original_widget.history_file = histfile.value
 cfg['tui.cli.history-file'].on_change(_set_cli_history_file)
@@ -0,0 +1,208 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+import urwid
+import bisect
+
+
+class VirtualListWalker(urwid.ListWalker):
+    """List walker that only creates widgets for displayed items
+
+    Instead of widgets, the list is a sequence of item IDs (see `set_ids`).
+    Widgets are created when urwid asks for them, e.g. while rendering.  Call
+    `reset_usage` before and `trim` after rendering to recycle the widgets that
+    are too far away from the displayed items.  Recycled widgets are passed to
+    `update_widget` when they are used to display another item.
+
+    make_widget: Callable that gets an item ID and returns a new widget
+    update_widget: Callable that gets a widget and an item ID and makes the
+                   widget display the item with that ID
+    margin: Number of widgets above and below the displayed widgets that are
+            not recycled by `trim`
+    """
+    def __init__(self, make_widget, update_widget, margin=10):
+        self._make_widget = make_widget
+        self._update_widget = update_widget
+        self._margin = margin
+        self._ids = []
+        self._index = None   # Map IDs to positions; created on demand
+        self._widgets = {}   # Map IDs to widgets
+        self._spare = []     # Widgets that can be used for any ID
+        self._focus = 0
+        self._used = set()   # Accessed positions
+
+    @property
+    def ids(self):
+        """List of item IDs (must not be modified)"""
+        return self._ids
+
+    def set_ids(self, ids):
+        """Replace listed items with `ids`
+
+        The focus stays on the same item if it still exists.  Widgets of items
+        that still exist are passed to `update_widget`.
+        """
+        old_ids = self._ids
+        focused_id = old_ids[self._focus] if old_ids else None
+        self._ids = ids = list(ids)
+        self._index = None
+
+        widgets = self._widgets
+        if widgets:
+            index = self._get_index()
+            update_widget = self._update_widget
+            for id,w in tuple(widgets.items()):
+                if id in index:
+                    update_widget(w, id)
+                else:
+                    self._spare.append(widgets.pop(id))
+
+        if not ids:
+            self._focus = 0
+        elif self._focus < len(ids) and ids[self._focus] == focused_id:
+            pass
+        elif focused_id in self._get_index():
+            self._focus = self._index[focused_id]
+        else:
+            self._focus = min(self._focus, len(ids)-1)
+        self._modified()
+
+    def clear(self):
+        """Remove all items and forget all widgets"""
+        self._ids = []
+        self._index = None
+        self._widgets.clear()
+        self._spare.clear()
+        self._focus = 0
+        self._used.clear()
+        self._modified()
+
+    def _get_index(self):
+        if self._index is None:
+            self._index = {id:pos for pos,id in enumerate(self._ids)}
+        return self._index
+
+    def position(self, id):
+        """Return position of item with `id` or raise KeyError"""
+        return self._get_index()[id]
+
+    def get_widget(self, id, keep=True):
+        """Return widget for item with `id` or raise KeyError
+
+        If `keep` is False and the item doesn't have a widget, return a new
+        widget without keeping it (e.g. for items that aren't displayed).
+        """
+        try:
+            return self._widgets[id]
+        except KeyError:
+            self._get_index()[id]  # Raise KeyError for unknown IDs
+            if not keep:
+                return self._make_widget(id)
+            elif self._spare:
+                w = self._spare.pop()
+                self._update_widget(w, id)
+            else:
+                w = self._make_widget(id)
+            self._widgets[id] = w
+            return w
+
+    @property
+    def widgets(self):
+        """Currently existing widgets"""
+        return tuple(self._widgets.values())
+
+    def reset_usage(self):
+        """Forget which positions were accessed (see `trim`)"""
+        self._used.clear()
+
+    def trim(self):
+        """Recycle widgets that weren't accessed since `reset_usage` was called
+
+        Widgets within `margin` positions of any accessed position are kept.
+        """
+        used = sorted(self._used)
+        self._used.clear()
+        if not used:
+            return
+        margin = self._margin
+        index = self._get_index()
+        widgets = self._widgets
+        for id in tuple(widgets):
+            pos = index[id]
+            i = bisect.bisect_left(used, pos-margin)
+            if i >= len(used) or used[i] > pos+margin:
+                self._spare.append(widgets.pop(id))
+
+        # Don't keep more spare widgets than there are widgets in use
+        max_spare = len(widgets)
+        if len(self._spare) > max_spare:
+            del self._spare[max_spare:]
+
+    def rows_max(self, size):
+        """Number of rows of all widgets assuming they all have the same height"""
+        if not self._ids:
+            return 0
+        return len(self._ids) * self[self._focus].rows(size)
+
+    def rows_above(self, position, size):
+        """Number of rows above `position` assuming all widgets have the same height"""
+        if not self._ids:
+            return 0
+        return position * self[self._focus].rows(size)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, position):
+        if not isinstance(position, int) or not 0 <= position < len(self._ids):
+            raise IndexError(position)
+        self._used.add(position)
+        return self.get_widget(self._ids[position])
+
+    def next_position(self, position):
+        if position+1 >= len(self._ids):
+            raise IndexError(position)
+        return position+1
+
+    def prev_position(self, position):
+        if position-1 < 0:
+            raise IndexError(position)
+        return position-1
+
+    def positions(self, reverse=False):
+        if reverse:
+            return range(len(self._ids)-1, -1, -1)
+        else:
+            return range(len(self._ids))
+
+    def get_focus(self):
+        if not self._ids:
+            return None, None
+        return self[self._focus], self._focus
+
+    def set_focus(self, position):
+        if not isinstance(position, int) or not 0 <= position < len(self._ids):
+            raise IndexError(position)
+        self._focus = position
+        self._modified()
+
+    @property
+    def focus(self):
+        """Focused position"""
+        return self._focus
+
+    @focus.setter
+    def focus(self, position):
+        self.set_focus(position)
+
+    def __repr__(self):
+        return '<%s %d items, %d widgets>' % (type(self).__name__, len(self._ids),
+                                              len(self._widgets))
@@ -126,12 +126,15 @@ def unhandled_input(key):
     if key is not None:
         log.debug('Unhandled key: %s', key)
 
+
+from .mainloop import MainLoop
 urwidscreen = urwid.raw_display.Screen()
-urwidloop = urwid.MainLoop(widgets,
-                           screen=urwidscreen,
-                           event_loop=urwid.AsyncioEventLoop(loop=aioloop),
-                           unhandled_input=unhandled_input,
-                           handle_mouse=False)
+urwidloop = MainLoop(widgets,
+                     screen=urwidscreen,
+                     event_loop=urwid.AsyncioEventLoop(loop=aioloop),
+                     unhandled_input=unhandled_input,
+                     handle_mouse=False,
+                     max_fps=cfg['tui.max-fps'].value)
 
 
 def run(command_runner):
@@ -0,0 +1,63 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+import urwid
+import time
+
+
+class MainLoop(urwid.MainLoop):
+    """MainLoop that limits how often the screen is redrawn
+
+    urwid redraws the screen whenever the event loop is idle.  Changes that
+    happen between two frames (e.g. responses from multiple pollers) are
+    combined into one redraw and no more than `max_fps` frames are drawn per
+    second.  User input is drawn in the next frame regardless.
+    """
+    def __init__(self, *args, max_fps=10, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_fps = max_fps
+        self._last_draw = 0
+        self._got_input = False
+        self._draw_alarm = None
+
+    @property
+    def max_fps(self):
+        """Maximum number of frames drawn per second"""
+        return self._max_fps
+
+    @max_fps.setter
+    def max_fps(self, max_fps):
+        self._max_fps = max_fps
+        self._frame_duration = 1 / max_fps
+
+    def process_input(self, keys):
+        self._got_input = True
+        return super().process_input(keys)
+
+    def entering_idle(self):
+        if self.screen.started:
+            now = time.monotonic()
+            remaining = self._frame_duration - (now - self._last_draw)
+            if self._got_input or remaining <= 0:
+                if self._draw_alarm is not None:
+                    self.remove_alarm(self._draw_alarm)
+                    self._draw_alarm = None
+                self._got_input = False
+                self._last_draw = now
+                self.draw_screen()
+            elif self._draw_alarm is None:
+                # Don't lose changes made during this frame if nothing else
+                # wakes us up after it
+                self._draw_alarm = self.set_alarm_in(remaining, self._draw_delayed)
+
+    def _draw_delayed(self, loop, user_data):
+        self._draw_alarm = None
+        self.entering_idle()
@@ -10,6 +10,7 @@
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
 import urwid
+import weakref
 
 from .group import Group
 
@@ -29,32 +30,71 @@ class Table():
 
     By setting the `columns` property to column IDs, columns are displayed or
     hidden in each existing or newly added row.
+
+    If `fast_rows` is True, rows are FastRow instances instead of
+    Group(cls=Columns) objects.
     """
-    def __init__(self, **columns):
+    def __init__(self, fast_rows=False, **columns):
         self._colspecs = columns
         self._enabled_columns = []
         self._headers = Group(cls=urwid.Columns, dividechars=1)
         self._members = {}
+        self._anonymous_members = weakref.WeakSet()
+        self._fast_rows = fast_rows
+        self._widths = {}
         self.columns = columns
 
     def register(self, member_id):
         """Add a new row
 
-        Create a new Group(cls=Columns) object and fill it with enabled column
-        cells which can then be retrieved with `get_row(member_id)`.
+        Create a new Group(cls=Columns) or FastRow object and fill it with
+        enabled column cells which can then be retrieved with
+        `get_row(member_id)`.
+        """
+        self._members[member_id] = self._make_row()
+
+    def get_row(self, member_id):
+        """Return a row, i.e. a Group(cls=Columns) or FastRow object created by register()"""
+        return self._members[member_id]
+
+    def make_row(self):
+        """Return a new row that isn't registered
+
+        The row's columns are updated like those of registered rows until it is
+        garbage-collected.
         """
-        member = Group(cls=urwid.Columns, dividechars=1)
+        member = self._make_row()
+        self._anonymous_members.add(member)
+        return member
+
+    def _make_row(self):
+        if self._fast_rows:
+            member = FastRow(self.column_widths)
+        else:
+            member = Group(cls=urwid.Columns, dividechars=1)
         for colname in self._enabled_columns:
             cellcls = self._colspecs[colname]
             cellwidget = cellcls()
             if member.exists(colname):
                 member.remove(colname)
             member.add(colname, cellwidget, options=cellcls.width, removable=True)
-        self._members[member_id] = member
+        return member
 
-    def get_row(self, member_id):
-        """Return a row, i.e. a Group(cls=Columns) object created by register()"""
-        return self._members[member_id]
+    def _all_members(self):
+        yield from self._members.values()
+        yield from tuple(self._anonymous_members)
+
+    def column_widths(self, maxcol):
+        """Return list of column widths for `maxcol` available screen columns
+
+        The widths are the same as those of the headers.  Columns that don't
+        fit are missing at the end of the list.
+        """
+        try:
+            return self._widths[maxcol]
+        except KeyError:
+            widths = self._widths[maxcol] = self._headers._w.column_widths((maxcol,))
+            return widths
 
     @property
     def headers(self):
@@ -73,8 +113,9 @@ class Table():
                 raise ValueError('Unknown column name: {!r}'.format(col))
 
         # Remove all columns
+        self._widths.clear()
         self._headers.clear()
-        for member in self._members.values():
+        for member in self._all_members():
             member.clear()
         self._enabled_columns = []
 
@@ -88,13 +129,132 @@ class Table():
             self._enabled_columns.append(colname)
 
             # Add new column to all members
-            for member in self._members.values():
+            for member in self._all_members():
                 cellwidget = cellcls()
                 member.add(colname, cellwidget, options=cellcls.width, removable=True)
 
     def clear(self):
-        """Remove all registered rows"""
+        """Remove all registered and unregistered rows"""
         self._members = {}
+        self._anonymous_members = weakref.WeakSet()
+
+
+class FastRow(urwid.Widget):
+    """Row of cell widgets that is rendered as a single canvas
+
+    Cells are arranged like in a Columns widget with `dividechars=1`, but
+    instead of composing their canvases, the first line of each cell canvas
+    is copied into one text line.  All cells must be flow widgets that render
+    to a single line.
+
+    get_widths: Callable that gets the number of available screen columns and
+                returns the width of each cell (see `Table.column_widths`)
+
+    Cells are added and removed with the same methods as in Group.
+    """
+    _sizing = frozenset(['flow'])
+
+    def __init__(self, get_widths):
+        self._get_widths = get_widths
+        self._names = []
+        self._cells = {}
+        super().__init__()
+
+    def add(self, name, widget, options=None, removable=False):
+        """Append `widget` as cell `name` (`options` and `removable` are ignored)"""
+        if name in self._cells:
+            raise ValueError('Already added: {!r}'.format(name))
+        self._names.append(name)
+        self._cells[name] = widget
+        self._invalidate()
+
+    def remove(self, name):
+        """Remove cell `name`"""
+        if name not in self._cells:
+            raise ValueError('Unknown item name: {}'.format(name))
+        self._names.remove(name)
+        del self._cells[name]
+        self._invalidate()
+
+    def replace(self, name, widget):
+        """Replace cell `name` with `widget`"""
+        if name not in self._cells:
+            raise ValueError('Unknown item name: {}'.format(name))
+        self._cells[name] = widget
+        self._invalidate()
+
+    def clear(self):
+        """Remove all cells"""
+        self._names = []
+        self._cells = {}
+        self._invalidate()
+
+    def exists(self, name):
+        """Whether cell `name` exists"""
+        return name in self._cells
+
+    @property
+    def names(self):
+        """List of cell names"""
+        return list(self._names)
+
+    @property
+    def widgets(self):
+        """List of cell widgets"""
+        return [self._cells[name] for name in self._names]
+
+    def __getattr__(self, name):
+        """Return cell widget by name"""
+        try:
+            return self.__dict__['_cells'][name]
+        except KeyError:
+            raise AttributeError('Unknown name: %s' % name)
+
+    def rows(self, size, focus=False):
+        return 1
+
+    def render(self, size, focus=False):
+        (maxcol,) = size
+        widths = self._get_widths(maxcol)
+        cells = self.widgets
+        last = len(widths) - 1
+
+        text, attr, cs = [], [], []
+        cols = 0
+        rendered, canvases = [], []
+        for i,(cell,width) in enumerate(zip(cells, widths)):
+            if width <= 0:
+                continue
+            # Like Columns, only pass focus to the first cell
+            canv = cell.render((width,), focus=focus and i == 0)
+            rendered.append(cell)
+            canvases.append(canv)
+            for a,c,t in next(canv.content()):
+                text.append(t)
+                attr.append((a, len(t)))
+                cs.append((c, len(t)))
+            cols += width
+            if i < last:
+                text.append(b' ')
+                attr.append((None, 1))
+                cs.append((None, 1))
+                cols += 1
+
+        if cols < maxcol:
+            text.append(b' ' * (maxcol-cols))
+            attr.append((None, maxcol-cols))
+            cs.append((None, maxcol-cols))
+
+        canvas = urwid.TextCanvas([b''.join(text)], [attr], [cs],
+                                  maxcol=maxcol, check_width=False)
+        # Invalidate our canvas when any cell's canvas is invalidated and keep
+        # cell canvases alive so urwid can find them in its cache
+        canvas.depends_on = rendered
+        canvas.cell_canvases = canvases
+        return canvas
+
+    def __repr__(self):
+        return '<%s %s>' % (type(self).__name__, ', '.join(self._names))
 
 
 class ColumnHeaderWidget(urwid.WidgetWrap):
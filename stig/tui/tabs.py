@@ -69,8 +69,20 @@ class TabBar(urwid.GridFlow):
             yield w[0]
 
 
+def _set_visible(widget, visible):
+    # Content widgets may implement `set_visible` to stop doing work while
+    # they are not displayed
+    if widget is not None and hasattr(widget, 'set_visible'):
+        widget.set_visible(visible)
+
+
 class Tabs(urwid.Widget):
-    """Organize multiple widgets in tabs"""
+    """Organize multiple widgets in tabs
+
+    Content widgets that have a `set_visible` method are notified when their
+    tab gets focused (`set_visible(True)`) or unfocused or removed
+    (`set_visible(False)`).
+    """
 
     _sizing = frozenset([urwid.FLOW, urwid.BOX])
 
@@ -237,6 +249,8 @@ class Tabs(urwid.Widget):
         self._contents.insert(newpos, widget)
         if focus:
             self.focus_position = newpos
+        else:
+            self._update_visibility()
         return this_id
 
     def remove(self, position=None):
@@ -247,9 +261,12 @@ class Tabs(urwid.Widget):
         Raises IndexError if tab can't be found.
         """
         i = self.get_index(position)
+        widget = self._contents[i]
         del self._ids[i]
         del self._contents[i]
         del self._tabbar.base_widget[i]
+        _set_visible(widget, False)
+        self._update_visibility()
 
     def clear(self):
         """Remove all tabs"""
@@ -296,7 +313,21 @@ class Tabs(urwid.Widget):
         Raises IndexError if tab can't be found.
         """
         i = self.get_index(position)
+        old_widget = self._contents[i]
         self._contents[i] = widget
+        if old_widget is not widget:
+            _set_visible(old_widget, False)
+        self._update_visibility()
+
+    def _update_visibility(self):
+        """Tell content widgets whether they are displayed"""
+        focused = self.focus
+        for widget in self._contents:
+            if widget is not focused:
+                _set_visible(widget, False)
+        # Notify the focused widget last so hidden widgets can free resources
+        # before the visible widget makes new requests
+        _set_visible(focused, True)
 
     @property
     def focus(self):
@@ -316,6 +347,7 @@ class Tabs(urwid.Widget):
         if 0 <= position < len(self._contents):
             self._tabbar.base_widget.focus = position
             self._contents.focus = position
+            self._update_visibility()
         else:
             raise IndexError('No tab at position: {!r}'.format(position))
 
@@ -332,6 +364,7 @@ class Tabs(urwid.Widget):
         if 0 <= i < len(self._contents):
             self._tabbar.base_widget.focus = i
             self._contents.focus = i
+            self._update_visibility()
         else:
             raise IndexError('No tab with ID: {}'.format(tabid))
 
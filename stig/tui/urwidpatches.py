@@ -144,7 +144,11 @@ class ListBox_patched(urwid.ListBox):
             flow_size = (maxcol,)
 
             body = self.body
-            if hasattr(body, 'positions'):
+            if hasattr(body, 'rows_above'):
+                # Body can calculate the rows without creating every widget
+                # (see stig.tui.listwalker)
+                return body.rows_above(focus_pos, flow_size) - offset_rows
+            elif hasattr(body, 'positions'):
                 # For body[pos], pos can be anything, not just an int.  In that
                 # case, the positions() method returns an interable of valid
                 # positions.
@@ -163,7 +167,9 @@ class ListBox_patched(urwid.ListBox):
         if self._rows_max is None:
             flow_size = (size[0],)
             body = self.body
-            if hasattr(body, 'positions'):
+            if hasattr(body, 'rows_max'):
+                self._rows_max = body.rows_max(flow_size)
+            elif hasattr(body, 'positions'):
                 self._rows_max = sum(body[pos].rows(flow_size) for pos in body.positions())
             else:
                 self._rows_max = sum(w.rows(flow_size) for w in self.body)
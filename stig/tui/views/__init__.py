@@ -11,6 +11,8 @@
 
 import urwid
 import collections
+import bisect
+from operator import itemgetter
 
 
 class Style():
@@ -82,11 +84,22 @@ class CellWidgetBase(urwid.WidgetWrap):
 
     def __init__(self):
         self.value = None
+        self.revision = None
         self.text = urwid.Text('', wrap='clip', align=self.align)
         self.attrmap = urwid.AttrMap(self.text, self.style.attrs('unfocused'))
         return super().__init__(self.attrmap)
 
     def update(self, data):
+        """Display `data` and return whether the displayed value changed"""
+        # If `data` can tell us when its values change (see Torrent.revision),
+        # we don't have to create a new value if nothing we display changed
+        needed_keys = getattr(self, 'needed_keys', None)
+        if needed_keys and hasattr(data, 'revision'):
+            revision = data.revision(needed_keys)
+            if data is self.data and revision == self.revision:
+                return False
+            self.revision = revision
+
         self.data = data
         new_value = self.get_value()
         if self.value != new_value:
@@ -94,6 +107,8 @@ class CellWidgetBase(urwid.WidgetWrap):
             self.text.set_text(str(new_value))
             attr = self.style.attrs(self.get_mode(), focused=False)
             self.attrmap.set_attr_map({None: attr})
+            return True
+        return False
 
     def get_value(self):
         raise NotImplementedError()
@@ -128,9 +143,13 @@ class ItemWidgetBase(urwid.WidgetWrap):
         self.update(item)
 
     def update(self, item):
+        """Update all cells with `item` and return the number of changed cells"""
+        changed = 0
         for widget in self._cells.widgets:
-            widget.update(item)
+            if widget.update(item):
+                changed += 1
         self._item = item
+        return changed
 
     @property
     def id(self):
@@ -159,9 +178,44 @@ class ItemWidgetBase(urwid.WidgetWrap):
 
 
 
+class VisibilityMixin():
+    """Stop requesting data while hidden and catch up when visible again
+
+    Derived classes must implement `_register_request` and
+    `_unregister_request`.
+    """
+
+    _visible = True
+
+    def _register_request(self):
+        """Start requesting data"""
+        raise NotImplementedError
+
+    def _unregister_request(self):
+        """Stop requesting data"""
+        raise NotImplementedError
+
+    @property
+    def visible(self):
+        """Whether this widget is displayed (e.g. in the focused tab)"""
+        return self._visible
+
+    def set_visible(self, visible):
+        """Register or unregister request if `visible` differs from current visibility"""
+        visible = bool(visible)
+        if visible != self._visible:
+            self._visible = visible
+            if visible:
+                self._register_request()
+            else:
+                self._unregister_request()
+
+
+
 from ..table import Table
 from ..scroll import ScrollBar
-class ListWidgetBase(urwid.WidgetWrap):
+from ..listwalker import VirtualListWalker
+class ListWidgetBase(VisibilityMixin, urwid.WidgetWrap):
     """Base class for Torrent/File/Peer/... lists"""
 
     # Derived classes must set these class attributes
@@ -181,22 +235,26 @@ class ListWidgetBase(urwid.WidgetWrap):
             self._ListItemClass = self.ListItemClass
 
         self._items = ()
-        self._marked = set()
+        self._listitems = {}  # Item IDs mapped to currently listed items
+        self._existing_ids = None  # IDs of all items if only some are listed
+        self._changed_cells = 0
+        self._marked = set()  # IDs of marked items
 
         self._columns = columns or []
         self._sort = sort
         self._sort_orig = sort
+        self._sorted_by = None  # Sorter that was used to sort list items
+        self._sortkeys = []     # Sort keys of list items in the same order
 
         self._title_name = title
+        self._drawn_title = None
         self.title_updater = None
 
-        self._table = Table(**self.tuicolumns)
+        self._table = Table(fast_rows=True, **self.tuicolumns)
         self._table.columns = self._columns
 
-        if self.focusable_items:
-            walker = urwid.SimpleFocusListWalker([])
-        else:
-            walker = urwid.SimpleListWalker([])
+        # Only displayed items get a widget
+        walker = VirtualListWalker(self._make_item_widget, self._update_item_widget)
         self._listbox = keymap.wrap(urwid.ListBox, context=self.keymap_context + 'list')(walker)
 
         listbox_sb = urwid.AttrMap(
@@ -215,69 +273,114 @@ class ListWidgetBase(urwid.WidgetWrap):
     def _invalidate(self):
         if self.title_updater is not None:
             # First argument can be cropped if too long, second argument is fixed
-            # self.title_updater(self.title, ' [%d]' % self.count)
-            self.title_updater(self.title, ' [%d]' % self.count)
+            title = (self.title, ' [%d]' % self.count)
+            # Don't redraw the tab bar if the title didn't change (e.g. for
+            # updates of lists in hidden tabs)
+            if title != self._drawn_title:
+                self._drawn_title = title
+                self.title_updater(*title)
         super()._invalidate()
 
     def render(self, size, focus=False):
         if self._items is not None:
             self._update_listitems()
             self._items = None
+        walker = self._listbox.body
+        if not isinstance(walker, VirtualListWalker):
+            return super().render(size, focus=True)
         # focus=True because we always want to display the focused torrent, for
         # example when the CLI is open
-        return super().render(size, focus=True)
+        walker.reset_usage()
+        canvas = super().render(size, focus=True)
+        # Recycle widgets of items that are not displayed anymore
+        walker.trim()
+        return canvas
+
+    def _make_item_widget(self, id):
+        itemw = self._ListItemClass(self._listitems[id], self._table.make_row())
+        if id in self._marked and 'marked' in self._table.columns:
+            itemw.is_marked = True
+        return itemw
+
+    def _update_item_widget(self, itemw, id):
+        self._changed_cells += itemw.update(self._listitems[id])
+        if 'marked' in self._table.columns:
+            is_marked = id in self._marked
+            if itemw.is_marked != is_marked:
+                itemw.is_marked = is_marked
+
+    # If more than this fraction of list items was added, removed or moved,
+    # sort all list items instead of moving them individually
+    _MAX_MOVED_FRACTION = 0.25
 
     def _update_listitems(self):
-        # Remember focused item widget in case items get added or removed
-        focusedw = self.focused_widget
-
+        self._changed_cells = 0
         walker = self._listbox.body
-        item_dict = self._items
-        dead_items = []
-        for w in walker:  # w = *ItemWidget instance
-            id = w.id
-            try:
-                # Update existing *ItemWidget instances with new data
-                w.update(item_dict[id])
-                del item_dict[id]
-            except KeyError:
-                # Item no longer exists in self._items anymore
-                dead_items.append(w)
-
-        # Remove dead *ItemWidget instances
-        marked = self._marked
-        for w in dead_items:
-            walker.remove(w)
-            marked.discard(w)  # self._marked may have a reference too
-
-        # Any items that haven't been used to update an existing *ItemWidget instance are new
-        if item_dict:
-            table = self._table
-            cls = self._ListItemClass
-            for tid in item_dict:
-                table.register(tid)
-                itemw = table.get_row(tid)  # itemw = item widget
-                walker.append(cls(item_dict[tid], itemw))
-
-        # Sort items in walker
-        if self._sort is not None:
-            self._sort.apply(walker,
-                            item_getter=lambda w: w.item,
-                            inplace=True)
-
-        # Items could be added/removed - re-focus previously focused item if necessary
-        if focusedw is not None and self.focused_widget is not None and \
-           focusedw.id != self.focused_widget.id:
-            focused_id = focusedw.id
-            for i,w in enumerate(walker):
-                if w.id == focused_id:
-                    self._listbox.focus_position = i
-                    break
+        items = self._items
+        old_items = self._listitems
+        old_ids = walker.ids
+        sort = self._sort
+        keys = self._sortkeys
+        incremental = sort is not None and sort is self._sorted_by and len(keys) == len(old_ids)
+        if sort is not None:
+            sortkey = sort.sortkey()
+
+        # Keep existing items in their order unless their sort key has changed
+        kept, kept_keys, moved = [], [], []
+        for i,id in enumerate(old_ids):
+            if id in items:
+                if incremental:
+                    key = sortkey(items[id])
+                    if key != keys[i]:
+                        moved.append(id)
+                        continue
+                    kept_keys.append(key)
+                kept.append(id)
+
+        # Any items that aren't listed yet are new
+        new = [id for id in items if id not in old_items]
+
+        removed = len(old_ids) - len(kept) - len(moved)
+        if incremental and (removed + len(moved) + len(new)
+                            > len(old_ids) * self._MAX_MOVED_FRACTION):
+            incremental = False
+
+        if incremental:
+            # Insert new and moved items at their sorted positions
+            ids = kept
+            for id in moved + new:
+                key = sortkey(items[id])
+                i = bisect.bisect_right(kept_keys, key)
+                kept_keys.insert(i, key)
+                ids.insert(i, id)
+            self._sortkeys = kept_keys
+        else:
+            ids = kept + moved + new
+            if sort is not None:
+                # Sort all items
+                decorated = sorted(((sortkey(items[id]), id) for id in ids), key=itemgetter(0))
+                ids = [id for _,id in decorated]
+                self._sortkeys = [key for key,_ in decorated]
+            else:
+                self._sortkeys = []
+            self._sorted_by = sort
+
+        # Forget sort keys and marks of items that no longer exist
+        if sort is not None:
+            sort.prune(items if self._existing_ids is None else self._existing_ids)
+        if self._marked:
+            self._marked.intersection_update(items)
+
+        # Update existing widgets and keep focus on the same item
+        self._listitems = dict(items)
+        walker.set_ids(ids)
 
     def clear(self):
         """Remove all list items"""
         self._table.clear()
-        self._listbox.body[:] = ()
+        self._listbox.body.clear()
+        self._listitems = {}
+        self._sortkeys = []
         self._listbox._invalidate()
         self._marked.clear()
 
@@ -285,7 +388,6 @@ class ListWidgetBase(urwid.WidgetWrap):
         """Update list items"""
         raise NotImplementedError
 
-
     @property
     def columns(self):
         return self._table.columns
@@ -318,6 +420,11 @@ class ListWidgetBase(urwid.WidgetWrap):
         else:
             return len(self._listbox.body)
 
+    @property
+    def changed_cells(self):
+        """Number of cells that displayed new values after the last update"""
+        return self._changed_cells
+
     @property
     def title_name(self):
         """The base name of the title"""
@@ -350,38 +457,53 @@ class ListWidgetBase(urwid.WidgetWrap):
         """Unmark the currently focused item or all items"""
         self._set_mark(False, toggle=toggle, all=all)
 
+    @property
+    def marked_ids(self):
+        """Generator that yields IDs of marked items in list order"""
+        marked = self._marked
+        if marked:
+            for id in tuple(self._listbox.body.ids):
+                if id in marked:
+                    yield id
+
     @property
     def marked(self):
-        """Generator that yields TorrentItemWidgets"""
-        yield from self._marked
+        """Generator that yields widgets of marked items in list order
+
+        Widgets of items that aren't displayed are created on the fly, so use
+        `marked_ids` if the IDs are enough.
+        """
+        walker = self._listbox.body
+        for id in tuple(self.marked_ids):
+            yield walker.get_widget(id, keep=False)
 
     def _set_mark(self, mark, toggle=False, all=False):
-        if toggle and self.focused_widget is not None:
-            mark = not self.focused_widget.is_marked
+        focused = self.focused_widget
+        if focused is None:
+            return
+        if toggle:
+            mark = not focused.is_marked
 
-        for widget in self._select_items_for_marking(all):
-            widget.is_marked = mark
-            if mark:
-                self._marked.add(widget)
-            else:
-                self._marked.discard(widget)
+        walker = self._listbox.body
+        ids = walker.ids if all else (focused.id,)
+        if mark:
+            self._marked.update(ids)
+        else:
+            self._marked.difference_update(ids)
 
-    def _select_items_for_marking(self, all):
-        if self.focused_widget is not None:
-            if all:
-                yield from self._listbox.body
-            else:
-                yield self.focused_widget
+        # Items without widget are marked when their widget is created
+        for widget in walker.widgets:
+            if all or widget is focused:
+                widget.is_marked = mark
 
     def refresh_marks(self):
         """Redraw the "marked" column in all items widgets
 
         This shouldn't be needed unless the marked character was changed.
         """
-        for widget in self._listbox.body:
+        for widget in self._listbox.body.widgets:
             widget.is_marked = widget.is_marked
 
-
     @property
     def focused_widget(self):
         """Currently focused widget in list"""
@@ -176,19 +176,26 @@ class FileListWidget(ListWidgetBase):
         self._initialized = False
         self._torrents = None
 
-        self._poller = self._srvapi.create_poller(
-            self._srvapi.torrent.torrents, tfilter, keys=('files', 'name')
-        )
-        self._poller.on_response(self._handle_files)
+        # File lists share their requests with other file lists
+        self._treqpool = self._srvapi.get_treqpool('files')
+        self._register_request()
 
-    def _handle_files(self, response):
-        if response is None or not response.torrents:
+    def _register_request(self):
+        self._treqpool.register(id(self), self._handle_files,
+                                keys=('files', 'name'), tfilter=self._tfilter)
+        self._treqpool.poll()
+
+    def _unregister_request(self):
+        self._treqpool.remove(id(self))
+
+    def _handle_files(self, torrents):
+        if not torrents:
             self.clear()
         else:
             if self._initialized:
-                self._update_listitems(response.torrents)
+                self._update_listitems(torrents)
             else:
-                self._init_listitems(response.torrents)
+                self._init_listitems(torrents)
         self._invalidate()
 
     def _init_listitems(self, torrents):
@@ -231,7 +238,7 @@ class FileListWidget(ListWidgetBase):
         self._marked.clear()
 
     def refresh(self):
-        self._poller.poll()
+        self._treqpool.poll()
 
     @property
     def count(self):
@@ -284,6 +291,11 @@ class FileListWidget(ListWidgetBase):
 
         yield from recurse(pos)
 
+    @property
+    def marked(self):
+        """Generator that yields FileItemWidgets"""
+        yield from self._marked
+
     def _set_mark(self, mark, toggle=False, all=False):
         if toggle:
             focused = self.focused_widget
@@ -41,18 +41,25 @@ class PeerListWidget(ListWidgetBase):
                 yield from peers
         self._maybe_filter_peers = filter_peers
 
-        self._poller = self._srvapi.create_poller(
-            self._srvapi.torrent.torrents, tfilter, keys=('peers', 'name', 'id')
-        )
-        self._poller.on_response(self._handle_peers)
+        # Peer lists share their requests with other peer lists
+        self._treqpool = self._srvapi.get_treqpool('peers')
+        self._register_request()
 
-    def _handle_peers(self, response):
-        if response is None or not response.torrents:
+    def _register_request(self):
+        self._treqpool.register(id(self), self._handle_peers,
+                                keys=('peers', 'name', 'id'), tfilter=self._tfilter)
+        self._treqpool.poll()
+
+    def _unregister_request(self):
+        self._treqpool.remove(id(self))
+
+    def _handle_peers(self, torrents):
+        if not torrents:
             self.clear()
         else:
             # Auto-generate title from our filters if not set
             if self._title_name is None:
-                self._title_name = stringify_torrent_filter(self._tfilter, response.torrents)
+                self._title_name = stringify_torrent_filter(self._tfilter, torrents)
                 if self._pfilter:
                     self._title_name += ' %s' % self._pfilter
 
@@ -60,11 +67,11 @@ class PeerListWidget(ListWidgetBase):
             def peers_combined(torrents):
                 for t in torrents:
                     yield from self._maybe_filter_peers(t['peers'])
-            self._items = {p['id']:p for p in peers_combined(response.torrents)}
+            self._items = {p['id']:p for p in peers_combined(torrents)}
         self._invalidate()
 
     def refresh(self):
-        self._poller.poll()
+        self._treqpool.poll()
 
     @property
     def sort(self):
@@ -73,4 +80,4 @@ class PeerListWidget(ListWidgetBase):
     @sort.setter
     def sort(self, sort):
         ListWidgetBase.sort.fset(self, sort)
-        self._poller.poll()
+        self._treqpool.poll()
@@ -14,6 +14,7 @@ log = make_logger(__name__)
 
 import urwid
 from ..scroll import (ScrollBar, Scrollable)
+from . import VisibilityMixin
 
 
 def mksection(title, width, items):
@@ -55,8 +56,9 @@ for section in SECTIONS:
     _sections.append(sectionw)
 
 
-class TorrentSummaryWidget(urwid.WidgetWrap):
+class TorrentSummaryWidget(VisibilityMixin, urwid.WidgetWrap):
     def __init__(self, srvapi, tid, title=None):
+        self._tid = tid
         self._title = title
         self._torrent = {}
 
@@ -84,14 +86,22 @@ class TorrentSummaryWidget(urwid.WidgetWrap):
         )
         super().__init__(grid_sb)
 
-        # Register new request in request pool
-        keys = set(('name',)).union(key for w in sections for key in w.needed_keys)
-        self._poller = srvapi.create_poller(srvapi.torrent.torrents, (tid,), keys=keys)
-        self._poller.on_response(self._handle_response)
+        # Register new request in request pool that is shared by all summaries
+        self._keys = set(('name',)).union(key for w in sections for key in w.needed_keys)
+        self._treqpool = srvapi.get_treqpool('summary')
+        self._register_request()
 
-    def _handle_response(self, response):
-        if response is not None and response.success:
-            self._torrent = response.torrents[0]
+    def _register_request(self):
+        self._treqpool.register(id(self), self._handle_torrents,
+                                keys=self._keys, tfilter=(self._tid,))
+        self._treqpool.poll()
+
+    def _unregister_request(self):
+        self._treqpool.remove(id(self))
+
+    def _handle_torrents(self, torrents):
+        if torrents:
+            self._torrent = torrents[0]
             for w in self._sections.values():
                 w.update(self._torrent)
 
@@ -384,6 +384,8 @@ class TorrentName(_COLUMNS['name'], CellWidgetBase):
         if new_status != self.status:
             self.status = new_status
             self._invalidate()
+            return True
+        return False
 
     def render(self, size, focus=False):
         (maxcol,) = size
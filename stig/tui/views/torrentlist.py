@@ -34,9 +34,11 @@ class TorrentListWidget(ListWidgetBase):
     palette_name    = 'torrentlist'
     focusable_items = True
 
-    def __init__(self, srvapi, keymap, tfilter=None, sort=None, columns=None, title=None):
+    def __init__(self, srvapi, keymap, tfilter=None, sort=None, columns=None, title=None,
+                 limit=None):
         super().__init__(srvapi, keymap, columns=columns, sort=sort, title=title)
         self._tfilter = tfilter
+        self._limit = limit
         self._register_request()
 
     @property
@@ -61,6 +63,9 @@ class TorrentListWidget(ListWidgetBase):
                                        keys=keys, tfilter=self._tfilter)
         self._srvapi.treqpool.poll()
 
+    def _unregister_request(self):
+        self._srvapi.treqpool.remove(self.id)
+
     # # Enable this to measure rendering performance
     # def render(self, *args, **kwargs):
     #     import time
@@ -73,23 +78,45 @@ class TorrentListWidget(ListWidgetBase):
         # Auto-generate title from our filters if not set
         if self._title_name is None:
             self._title_name = stringify_torrent_filter(self._tfilter, torrents)
+        # Only display the first torrents of the sort order
+        if self._limit is not None:
+            # Sort keys of torrents that aren't displayed are still needed
+            self._existing_ids = frozenset(t['id'] for t in torrents)
+            if self._sort is not None:
+                torrents = self._sort.apply(torrents, limit=self._limit)
+            else:
+                torrents = torrents[:self._limit]
         self._items = {t['id']:t for t in torrents}
         self._invalidate()
 
     def clear(self):
-        for w in self._listbox.body:
-            w.item.clearcache()
+        for t in self._listitems.values():
+            t.clearcache()
         super().clear()
 
     def refresh(self):
         self._srvapi.treqpool.poll()
 
+    @property
+    def limit(self):
+        """Maximum number of listed torrents or None"""
+        return self._limit
+
+    @property
+    def title(self):
+        title = super().title
+        if self._limit is not None:
+            title += ' top %d' % self._limit
+        return title
+
     @property
     def sort(self):
         return self._sort
 
     @sort.setter
     def sort(self, sort):
-        self._srvapi.treqpool.remove(self.id)
         ListWidgetBase.sort.fset(self, sort)
-        self._register_request()
+        # Hidden lists register their new keys when they are visible again
+        if self.visible:
+            self._unregister_request()
+            self._register_request()
@@ -45,18 +45,27 @@ class TrackerListWidget(ListWidgetBase):
                 yield from trackers
         self._maybe_filter_trackers = filter_trackers
 
-        self._poller = self._srvapi.create_poller(
-            self._srvapi.torrent.torrents, torfilter, keys=('trackers', 'name', 'id')
-        )
-        self._poller.on_response(self._handle_trackers)
+        # Tracker lists share their requests with other tracker lists
+        self._treqpool = self._srvapi.get_treqpool('trackers')
+        self._register_request()
 
-    def _handle_trackers(self, response):
-        if response is None or not response.torrents:
+    def _register_request(self):
+        # We want to see tracker stats change, so don't refresh them less often
+        self._treqpool.register(id(self), self._handle_trackers,
+                                keys=('trackers', 'name', 'id'), tfilter=self._torfilter,
+                                intervals={'trackers': 0})
+        self._treqpool.poll()
+
+    def _unregister_request(self):
+        self._treqpool.remove(id(self))
+
+    def _handle_trackers(self, torrents):
+        if not torrents:
             self.clear()
         else:
             # Auto-generate title from our filters if not set
             if self._title_name is None:
-                self._title_name = stringify_torrent_filter(self._torfilter, response.torrents)
+                self._title_name = stringify_torrent_filter(self._torfilter, torrents)
                 if self._trkfilter:
                     self._title_name += ' %s' % self._trkfilter
 
@@ -64,11 +73,11 @@ class TrackerListWidget(ListWidgetBase):
             def trackers_combined(torrents):
                 for t in torrents:
                     yield from self._maybe_filter_trackers(t['trackers'])
-            self._items = {trk['id']:trk for trk in trackers_combined(response.torrents)}
+            self._items = {trk['id']:trk for trk in trackers_combined(torrents)}
         self._invalidate()
 
     def refresh(self):
-        self._poller.poll()
+        self._treqpool.poll()
 
     @property
     def sort(self):
@@ -77,4 +86,4 @@ class TrackerListWidget(ListWidgetBase):
     @sort.setter
     def sort(self, sort):
         ListWidgetBase.sort.fset(self, sort)
-        self._poller.poll()
+        self._treqpool.poll()
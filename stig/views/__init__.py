@@ -14,8 +14,7 @@
 from ..logging import make_logger
 log = make_logger(__name__)
 
-from collections import defaultdict
-from time import time
+from collections import OrderedDict
 
 
 class ColumnBase():
@@ -30,52 +29,49 @@ class ColumnBase():
         self.data = data if data is not None else {}
         super().__init__()
 
-    # _cache = defaultdict(lambda: {'value': None, 'last_hit': time(), 'hits': 0})
-    _cache = defaultdict(lambda: {'value': None, 'last_hit': time()})
-    _last_cache_prune = 0
+    # Values created by _from_cache() in least recently used order
+    _cache = OrderedDict()
+    _cache_size = 10000
+    _cache_hits = 0
+    _cache_misses = 0
+
     def _from_cache(self, create_value, *args):
+        cache = ColumnBase._cache
         cache_id = (create_value, args)
-        if cache_id not in self._cache:
-            # log.debug('Calling %r with %r', create_value.__qualname__, args)
-            value = self._cache[cache_id]['value'] = create_value(*args)
+        try:
+            value = cache[cache_id]
+        except KeyError:
+            ColumnBase._cache_misses += 1
+            value = cache[cache_id] = create_value(*args)
+            if len(cache) > ColumnBase._cache_size:
+                cache.popitem(last=False)
         else:
-            cache_item = self._cache[cache_id]
-            value = cache_item['value']
-            cache_item['last_hit'] = time()
-            # cache_item['hits'] += 1
-
-            # Remove any cached items that haven't been used recently
-            now = time()
-            if now-ColumnBase._last_cache_prune > 60:
-                ColumnBase._last_cache_prune = now
-
-                # prune_counter = 0
-                for cid,citem in tuple(self._cache.items()):
-                    if now-citem['last_hit'] > 600:
-                        del self._cache[cid]
-                        # prune_counter += 1
-
-                # # Debugging stuff; also uncomment the lines containing
-                # # 'prune_counter' and 'hits'
-                # items_without_hits = tuple(citem for citem in self._cache.values()
-                #                            if citem['hits'] < 1)
-
-                # log.debug('Cell cache: %r values pruned, %r remaining, '
-                #           '%r with no hits, %r hits combined',
-                #           prune_counter, len(self._cache), len(items_without_hits),
-                #           sum((citem['hits'] for citem in self._cache.values())))
-
-
-                # items_with_hits = tuple(citem for citem in self._cache.values()
-                #                         if citem['hits'] > 0)
-                # from time import (strftime, localtime)
-                # for citem in items_with_hits:
-                #     log.debug('  %5d hits, last hit: %s: %s',
-                #               citem['hits'],
-                #               strftime('%H:%M:%S', localtime(citem['last_hit'])),
-                #               citem['value'])
+            ColumnBase._cache_hits += 1
+            cache.move_to_end(cache_id)
         return value
 
+    @classmethod
+    def set_cache_size(cls, size):
+        """Set maximum number of cached values and remove excess values"""
+        if size < 0:
+            raise ValueError('Invalid cache size: %r' % size)
+        ColumnBase._cache_size = size
+        cache = ColumnBase._cache
+        while len(cache) > size:
+            cache.popitem(last=False)
+
+    @classmethod
+    def cache_info(cls):
+        """Return dictionary with the keys 'hits', 'misses', 'size' and 'maxsize'"""
+        return {'hits': ColumnBase._cache_hits, 'misses': ColumnBase._cache_misses,
+                'size': len(ColumnBase._cache), 'maxsize': ColumnBase._cache_size}
+
+    @classmethod
+    def clear_cache(cls):
+        """Remove all cached values and reset hit/miss counters"""
+        ColumnBase._cache.clear()
+        ColumnBase._cache_hits = ColumnBase._cache_misses = 0
+
     def get_value(self):
         raise NotImplementedError()
 
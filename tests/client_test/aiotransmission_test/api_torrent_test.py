@@ -1,13 +1,21 @@
-from stig.client.aiotransmission.api_torrent import TorrentAPI
+from stig.client.aiotransmission.api_torrent import (TorrentAPI, _TorrentCache)
 from stig.client.aiotransmission.rpc import TransmissionRPC
 from stig.client.aiotransmission.torrent import Torrent
+from stig.client.aiotransmission.metacache import MetadataCache
 from stig.client import errors
 from stig.client.filters.tfilter import TorrentFilter
+from stig.client.trequestpool import TorrentRequestPool
 
 import resources_aiotransmission as rsrc
 
 import asynctest
+import unittest
+from unittest.mock import patch
+import tempfile
+import shutil
 import os.path
+from types import SimpleNamespace
+from aiohttp import web
 assert os.path.exists(rsrc.TORRENTFILE)
 assert not os.path.exists(rsrc.TORRENTFILE_NOEXIST)
 
@@ -29,6 +37,79 @@ class TorrentAPITestCase(asynctest.TestCase):
         self.assertEqual(tuple(t[key] for t in tlist), exp)
 
 
+class TestTorrentCache(unittest.TestCase):
+    def setUp(self):
+        self.tcache = _TorrentCache()
+        self.tcache.update(({'id': 1, 'hashString': 'abc', 'downloadDir': '/foo'},
+                            {'id': 2, 'hashString': 'def', 'downloadDir': '/bar'},
+                            {'id': 3, 'hashString': 'ghi', 'downloadDir': '/foo'}))
+
+    def assert_ids(self, tlist, *ids):
+        self.assertEqual(tuple(t['id'] for t in tlist), ids)
+
+    def test_get(self):
+        self.assert_ids(self.tcache.get(), 1, 2, 3)
+        self.assert_ids(self.tcache.get(3, 1), 3, 1)
+        self.assert_ids(self.tcache.get(2, 4, 2), 2)
+
+    def test_find(self):
+        self.assert_ids(self.tcache.find('hash', 'def'), 2)
+        self.assert_ids(sorted(self.tcache.find('path', '/foo'), key=lambda t: t['id']), 1, 3)
+        self.assert_ids(self.tcache.find('path', '/baz'))
+
+    def test_indexes_are_built_on_first_use(self):
+        self.assertEqual(self.tcache._index, {})
+        self.assert_ids(self.tcache.find('hash', 'abc'), 1)
+        self.assertEqual(tuple(self.tcache._index), ('hash',))
+        self.tcache.update(({'id': 4, 'hashString': 'jkl', 'downloadDir': '/foo'},))
+        self.assert_ids(self.tcache.find('hash', 'jkl'), 4)
+        with self.assertRaises(ValueError):
+            self.tcache.find('foo', 'bar')
+
+    def test_find_after_update(self):
+        self.tcache.update(({'id': 1, 'downloadDir': '/bar'},
+                            {'id': 4, 'downloadDir': '/foo'}))
+        self.assert_ids(sorted(self.tcache.find('path', '/bar'), key=lambda t: t['id']), 1, 2)
+        self.assert_ids(sorted(self.tcache.find('path', '/foo'), key=lambda t: t['id']), 3, 4)
+
+    def test_find_after_removing(self):
+        self.tcache.remove((1,))
+        self.assert_ids(self.tcache.find('hash', 'abc'))
+        self.assert_ids(self.tcache.find('path', '/foo'), 3)
+        self.tcache.purge(existing_tids=(2,))
+        self.assert_ids(self.tcache.find('path', '/foo'))
+        self.assertEqual(self.tcache._index['path'], {'/bar': {2}})
+
+    def test_find_after_forgetting_fields(self):
+        self.tcache.forget_fields((1, 3), ('downloadDir',))
+        self.assert_ids(self.tcache.find('path', '/foo'))
+        self.assert_ids(self.tcache.find('hash', 'abc'), 1)
+
+    def test_removed_torrents_keep_their_values(self):
+        t = self.tcache.get(1)[0]
+        self.tcache.update(({'id': 1, 'rateDownload': 123},))
+        self.tcache.remove((1,))
+        self.tcache.update(({'id': 4, 'rateDownload': 456},))
+        self.assertEqual(t['rate-down'], 123)
+        self.assertEqual(self.tcache.get(4)[0]['rate-down'], 456)
+        self.assertEqual(len(self.tcache.store), 3)
+
+    def test_numeric_fields_are_mirrored_in_store(self):
+        self.tcache.update(({'id': 1, 'rateDownload': 123, 'uploadRatio': 2},))
+        slot = self.tcache._slots[1]
+        self.assertEqual(self.tcache.store.get(slot, 'rateDownload'), 123)
+        self.assertIs(type(self.tcache.get(1)[0]._raw['uploadRatio']), int)
+        self.tcache.forget_fields((1,), ('rateDownload',))
+        self.assertEqual(self.tcache.store.get(slot, 'rateDownload'), None)
+        self.assertEqual(self.tcache.store.get(slot, 'uploadRatio'), 2.0)
+
+    def test_find_by_status(self):
+        self.tcache.update(({'id': 1, 'status': 0, 'percentDone': 1, 'metadataPercentComplete': 1,
+                             'rateDownload': 0, 'rateUpload': 0, 'peersConnected': 0,
+                             'isPrivate': False},))
+        self.assert_ids(self.tcache.find('status', 'stopped'), 1)
+
+
 class TestConnection(TorrentAPITestCase):
     async def test_send_request_with_lost_connection(self):
         assert self.rpc.connected == True
@@ -129,6 +210,241 @@ class TestGettingTorrents(TorrentAPITestCase):
         self.assertIn('Nope', str(response.msgs[0]))
 
 
+    async def test_filtered_request_planning(self):
+        self.daemon.response = rsrc.response_torrents(
+            {'id': 1, 'downloadDir': '/foo', 'rateDownload': 10},
+            {'id': 2, 'downloadDir': '/bar', 'rateDownload': 20},
+            {'id': 3, 'downloadDir': '/foo', 'rateDownload': 30},
+        )
+        requests = self.daemon.requests
+        tfilter = TorrentFilter('path~foo')
+
+        # Without any estimate, filter keys are requested first
+        del requests[:]
+        response = await self.api.torrents(torrents=tfilter, keys=('rate-down',))
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[1]['arguments']['ids'], [1, 3])
+        self.assert_torrentkeys_equal('rate-down', response.torrents, 10, 30)
+
+        # Most torrents match, so wanted keys are requested with filter keys
+        del requests[:]
+        response = await self.api.torrents(torrents=tfilter, keys=('rate-down',))
+        self.assertEqual(len(requests), 1)
+        self.assertNotIn('ids', requests[0]['arguments'])
+        self.assert_torrentkeys_equal('rate-down', response.torrents, 10, 30)
+
+    async def test_expensive_filter_keys_are_requested_for_candidates(self):
+        self.daemon.response = rsrc.response_torrents(
+            {'id': 1, 'downloadDir': '/foo', 'rateDownload': 10, 'rateUpload': 1},
+            {'id': 2, 'downloadDir': '/foo', 'rateDownload': 0, 'rateUpload': 2},
+            {'id': 3, 'downloadDir': '/bar', 'rateDownload': 30, 'rateUpload': 3},
+        )
+        requests = self.daemon.requests
+        tfilter = TorrentFilter('path~foo&downloading')
+        del requests[:]
+        with patch.object(tfilter.filterclass.COMPARATIVE_FILTERS['path'], 'cost', 10):
+            self.assertEqual(tfilter.prefetch_keys, ('rate-down',))
+            response = await self.api.torrents(torrents=tfilter, keys=('rate-up',))
+        self.assertEqual(len(requests), 2)
+        self.assertNotIn('ids', requests[0]['arguments'])
+        self.assertNotIn('downloadDir', requests[0]['arguments']['fields'])
+        self.assertEqual(requests[1]['arguments']['ids'], [1, 3])
+        self.assertIn('downloadDir', requests[1]['arguments']['fields'])
+        self.assert_torrentkeys_equal('rate-up', response.torrents, 1)
+
+    def test_single_request_estimate(self):
+        tfilter = TorrentFilter('path~foo')
+        self.assertEqual(self.api._is_single_request_cheaper(('path',), tfilter), True)
+        self.assertEqual(self.api._is_single_request_cheaper(('name',), tfilter), False)
+        with patch('stig.client.aiotransmission.api_torrent._SINGLE_REQUEST_MAX_WASTE', 10):
+            self.api._remember_filter_stats(tfilter, 5, 1000)
+            self.assertEqual(self.api._is_single_request_cheaper(('name',), tfilter), False)
+            self.api._remember_filter_stats(tfilter, 995, 1000)
+            self.assertEqual(self.api._is_single_request_cheaper(('name',), tfilter), True)
+            self.api._remember_filter_stats(tfilter, 600, 1000)
+            self.assertEqual(self.api._is_single_request_cheaper(('name',), tfilter), True)
+
+    async def test_get_recently_active_torrents(self):
+        self.daemon.response = rsrc.response_torrents(
+            {'id': 1, 'downloadDir': '/foo'},
+            {'id': 2, 'downloadDir': '/bar'},
+            {'id': 3, 'downloadDir': '/boo'},
+        )
+        # Cache is empty, so we must request all torrents first
+        response = await self.api.torrents(keys=('path',), delta=True)
+        self.assertNotIn('ids', self.daemon.requests[-1]['arguments'])
+        self.assert_torrentkeys_equal('id', response.torrents, 1, 2, 3)
+
+        self.daemon.response = rsrc.response_success({
+            'torrents': [{'id': 1, 'downloadDir': '/foo!'}, {'id': 4, 'downloadDir': '/new'}],
+            'removed': [2],
+        })
+        response = await self.api.torrents(keys=('path',), delta=True)
+        self.assertEqual(self.daemon.requests[-1]['arguments']['ids'], 'recently-active')
+        self.assert_torrentkeys_equal('id', response.torrents, 1, 3, 4)
+        self.assert_torrentkeys_equal('path', response.torrents, '/foo!', '/boo', '/new')
+
+        response = await self.api.torrents(torrents=TorrentFilter('path~oo'),
+                                           keys=('path',), delta=True)
+        self.assertEqual(self.daemon.requests[-1]['arguments']['ids'], 'recently-active')
+        self.assert_torrentkeys_equal('id', response.torrents, 1, 3)
+
+    async def test_get_recently_active_torrents_with_unsynced_keys(self):
+        self.daemon.response = rsrc.response_torrents(
+            {'id': 1, 'downloadDir': '/foo', 'rateDownload': 0},
+        )
+        await self.api.torrents(keys=('path',))
+        await self.api.torrents(keys=('path', 'rate-down'), delta=True)
+        self.assertNotIn('ids', self.daemon.requests[-1]['arguments'])
+
+        self.api.clearcache()
+        await self.api.torrents(keys=('path',), delta=True)
+        self.assertNotIn('ids', self.daemon.requests[-1]['arguments'])
+
+    async def test_static_fields_are_requested_once(self):
+        torrents = ({'id': 1, 'name': 'Foo', 'comment': 'Hi', 'downloadDir': '/foo',
+                     'metadataPercentComplete': 1},
+                    {'id': 2, 'name': 'Bar', 'comment': '', 'downloadDir': '/bar',
+                     'metadataPercentComplete': 0.5})
+        async def respond_with_requested_fields(request):
+            args = (await request.json())['arguments']
+            ids = args.get('ids', [t['id'] for t in torrents])
+            return web.json_response(rsrc.response_success({'torrents': [
+                {field:t[field] for field in args['fields']}
+                for t in torrents if t['id'] in ids]}))
+        self.daemon.response = respond_with_requested_fields
+        requests = self.daemon.requests
+        del requests[:]
+        await self.api.torrents(keys=('name', 'comment', 'path'))
+        self.assertEqual(len(requests), 2)
+        self.assertNotIn('comment', requests[0]['arguments']['fields'])
+        self.assertIn('downloadDir', requests[0]['arguments']['fields'])
+        self.assertIn('comment', requests[1]['arguments']['fields'])
+        self.assertNotIn('downloadDir', requests[1]['arguments']['fields'])
+        self.assertEqual(requests[1]['arguments']['ids'], [1, 2])
+
+        # Only the torrent with incomplete metadata needs static fields again
+        del requests[:]
+        response = await self.api.torrents(keys=('name', 'comment', 'path'))
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[1]['arguments']['ids'], [2])
+        self.assert_torrentkeys_equal('comment', response.torrents, 'Hi', '')
+        # Torrents can be renamed
+        self.assertIn('name', requests[0]['arguments']['fields'])
+
+    async def test_time_added_is_requested_once(self):
+        torrents = ({'id': 1, 'addedDate': 1000, 'rateDownload': 0,
+                     'metadataPercentComplete': 1},)
+        async def respond_with_requested_fields(request):
+            args = (await request.json())['arguments']
+            return web.json_response(rsrc.response_success({'torrents': [
+                {field:t[field] for field in args['fields']} for t in torrents]}))
+        self.daemon.response = respond_with_requested_fields
+        requests = self.daemon.requests
+        await self.api.torrents(keys=('time-added', 'rate-down'))
+        del requests[:]
+        await self.api.torrents(keys=('time-added', 'rate-down'))
+        self.assertEqual(len(requests), 1)
+        self.assertNotIn('addedDate', requests[0]['arguments']['fields'])
+
+    async def test_static_fields_from_metadata_cache(self):
+        torrents = ({'id': 1, 'hashString': 'abc', 'creator': 'Foo', 'pieceCount': 5,
+                     'metadataPercentComplete': 1},
+                    {'id': 2, 'hashString': 'def', 'creator': 'Bar', 'pieceCount': 10,
+                     'metadataPercentComplete': 1})
+        async def respond_with_requested_fields(request):
+            args = (await request.json())['arguments']
+            ids = args.get('ids', [t['id'] for t in torrents])
+            return web.json_response(rsrc.response_success({'torrents': [
+                {field:t[field] for field in args['fields']}
+                for t in torrents if t['id'] in ids]}))
+        self.daemon.response = respond_with_requested_fields
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        metacache = MetadataCache(os.path.join(tmpdir, 'metadata'))
+        self.addCleanup(metacache.close)
+        self.api.metacache = metacache
+
+        # Static fields are requested from the daemon and stored
+        await self.api.torrents(keys=('creator', 'count-pieces'))
+        self.assertEqual(metacache.get(self.rpc.url, ('abc', 'def')),
+                         {'abc': {'creator': 'Foo', 'pieceCount': 5},
+                          'def': {'creator': 'Bar', 'pieceCount': 10}})
+
+        # New session: only hashes are requested
+        self.api = TorrentAPI(self.rpc, metacache=metacache)
+        requests = self.daemon.requests
+        del requests[:]
+        response = await self.api.torrents(keys=('creator', 'count-pieces'))
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(set(requests[1]['arguments']['fields']), {'id', 'hashString'})
+        self.assert_torrentkeys_equal('creator', response.torrents, 'Foo', 'Bar')
+        self.assert_torrentkeys_equal('count-pieces', response.torrents, 5, 10)
+
+    async def test_slow_fields_are_requested_separately(self):
+        status = {'status': 6, 'percentDone': 1, 'metadataPercentComplete': 1, 'rateDownload': 0,
+                  'rateUpload': 0, 'peersConnected': 0, 'isPrivate': True}
+        torrents = (dict(status, id=1, downloadDir='/foo', trackerStats=[]),
+                    dict(status, id=2, downloadDir='/bar',
+                         trackerStats=[{'hasAnnounced': True, 'lastAnnounceSucceeded': True}]))
+        async def respond_with_requested_fields(request):
+            args = (await request.json())['arguments']
+            ids = args.get('ids', [t['id'] for t in torrents])
+            return web.json_response(rsrc.response_success({'torrents': [
+                {field:t[field] for field in args['fields']}
+                for t in torrents if t['id'] in ids]}))
+        self.daemon.response = respond_with_requested_fields
+        requests = self.daemon.requests
+        def slow_requests():
+            return [r for r in requests if 'trackerStats' in r['arguments']['fields']]
+        del requests[:]
+        response = await self.api.torrents(keys=('path', 'status'))
+        self.assertEqual(len(slow_requests()), 1)
+        self.assertEqual(set(slow_requests()[0]['arguments']['fields']), {'id', 'trackerStats'})
+        self.assertNotIn('ids', slow_requests()[0]['arguments'])
+        self.assertEqual(tuple('isolated' in t['status'] for t in response.torrents),
+                         (True, False))
+
+        # trackerStats are cached
+        del requests[:]
+        response = await self.api.torrents(keys=('path', 'status'))
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(slow_requests(), [])
+        self.assertEqual(tuple('isolated' in t['status'] for t in response.torrents),
+                         (True, False))
+
+        # Slow fields are requested again when they are outdated
+        self.api._tcache.reset_synced()
+        del requests[:]
+        await self.api.torrents(keys=('path', 'status'))
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(len(slow_requests()), 1)
+
+
+    async def test_refresh_interval_of_key_with_expensive_fields(self):
+        seeds = [5]
+        async def respond_with_requested_fields(request):
+            args = (await request.json())['arguments']
+            t = {'id': 1, 'rateDownload': 0, 'trackerStats': [{'seederCount': seeds[0]}]}
+            return web.json_response(rsrc.response_success({'torrents': [
+                {field:t[field] for field in args['fields']}]}))
+        self.daemon.response = respond_with_requested_fields
+        srvapi = SimpleNamespace(torrent=self.api, loop=self.loop)
+        pool = TorrentRequestPool(srvapi)
+        results = []
+        def callback(torrents):
+            results.append(torrents[0]['peers-seeding'])
+        pool.register('foo', callback, keys=('rate-down', 'peers-seeding'))
+
+        for new_seeds,tier_due in ((5, False), (100, False), (100, True), (101, True)):
+            seeds[0] = new_seeds
+            if tier_due:
+                for interval in pool._refreshed:
+                    pool._refreshed[interval] -= 60
+            pool._run_callbacks(response=await pool.request())
+        self.assertEqual(results, [5, 5, 100, 101])
+
+
 class TestManipulatingTorrents(TorrentAPITestCase):
     async def setUp(self):
         await super().setUp()
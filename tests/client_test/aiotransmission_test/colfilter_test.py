@@ -0,0 +1,110 @@
+from stig.client.aiotransmission.api_torrent import _TorrentCache
+from stig.client.aiotransmission.colstore import NUMPY_AVAILABLE
+from stig.client.aiotransmission import colfilter
+from stig.client.filters.tfilter import TorrentFilter
+from stig.client import convert
+
+import unittest
+from unittest.mock import patch
+
+
+def make_raw_torrent(tid, **fields):
+    raw = {'id': tid, 'name': 'Torrent %d' % tid, 'status': 4, 'percentDone': 0.5,
+           'metadataPercentComplete': 1, 'rateDownload': 0, 'rateUpload': 0,
+           'peersConnected': 0, 'isPrivate': False, 'uploadRatio': -1,
+           'sizeWhenDone': 1000, 'downloadedEver': 500, 'uploadedEver': 0}
+    raw.update(fields)
+    return raw
+
+
+RAW_TORRENTS = (
+    make_raw_torrent(1),
+    make_raw_torrent(2, status=0, percentDone=1, uploadRatio=1.5, uploadedEver=1500),
+    make_raw_torrent(3, status=6, percentDone=1, peersConnected=3, rateUpload=20000,
+                     uploadRatio=-2, sizeWhenDone=10**9),
+    make_raw_torrent(4, status=2, rateDownload=10**6, peersConnected=10),
+    make_raw_torrent(5, status=3, name='Foo', rateDownload=50, peersConnected=1,
+                     uploadRatio=0.25),
+    # Unusual values are not stored in columns
+    make_raw_torrent(6, name='Foo', rateDownload=12.5, percentDone=0.99),
+)
+
+FILTERS = ('complete', 'incomplete', 'leeching', 'seeding', 'stopped', 'verifying',
+           'active', 'downloading', 'uploading', '!uploading',
+           'connections', 'connections>2', 'connections!=3', '%downloaded<=99',
+           '%downloaded=100', 'ratio', 'ratio>1', 'ratio<0', 'ratio=-1',
+           'rate-down>=50', 'rate-up>1k', 'size>1M', 'downloaded<1k', 'uploaded>1k',
+           'Foo', 'Foo&downloading', 'Foo|complete', 'stopped|!Foo&rate-down<100',
+           'complete&ratio>1|Foo&!incomplete', 'idle', 'isolated&complete', 'private|active')
+
+
+class _TestColumnFilterBase():
+    use_numpy = None
+
+    def setUp(self):
+        self.tcache = _TorrentCache(use_numpy=self.use_numpy)
+        self.tcache.update(dict(rt) for rt in RAW_TORRENTS)
+
+    def assert_same_matches(self, tfilter, torrents):
+        tfilter = TorrentFilter(tfilter)
+        exp = tuple(tfilter.apply(torrents))
+        self.assertEqual(tuple(t['id'] for t in self.tcache.filter(tfilter, torrents)),
+                         tuple(t['id'] for t in exp),
+                         msg='filter: %s' % tfilter)
+
+    def test_filters_match_like_per_torrent_evaluation(self):
+        for f in FILTERS:
+            self.assert_same_matches(f, self.tcache.get())
+
+    def test_order_is_preserved(self):
+        torrents = tuple(reversed(self.tcache.get()))
+        for f in FILTERS:
+            self.assert_same_matches(f, torrents)
+
+    def test_bit_unit(self):
+        units = (convert.bandwidth.unit, convert.size.unit)
+        convert.bandwidth.unit = convert.size.unit = 'bit'
+        try:
+            for f in ('rate-down>=400', 'rate-down<400', 'rate-up>100k',
+                      'size>1G', 'size>1M', 'downloaded<=4k'):
+                self.assert_same_matches(f, self.tcache.get())
+        finally:
+            convert.bandwidth.unit, convert.size.unit = units
+
+    def test_unknown_values(self):
+        self.tcache.forget_fields((3, 4), ('rateDownload', 'percentDone'))
+        store = self.tcache.store
+        for tid in (3, 4):
+            slot = store.tids.index(tid)
+            self.assertFalse(store.known('rateDownload')[slot])
+            self.assertFalse(store.known('percentDone')[slot])
+        for f in ('connections>2', 'complete|connections', 'Foo&connections'):
+            self.assert_same_matches(f, self.tcache.get(1, 2, 5, 6))
+        self.tcache.update(({'id': 3, 'rateDownload': 70, 'percentDone': 0.75},
+                            {'id': 4, 'rateDownload': 2.5, 'percentDone': 1}))
+        for f in FILTERS:
+            self.assert_same_matches(f, self.tcache.get())
+
+    def test_torrents_without_slot(self):
+        t = self.tcache.get(3)[0]
+        self.tcache.remove((3,))
+        self.assert_same_matches('uploading', (t,) + self.tcache.get())
+
+    def test_string_filters_are_evaluated_for_candidates_only(self):
+        tfilter = TorrentFilter('complete&Foo|downloading')
+        name_filter = tfilter.chains[0][1]
+        with patch.object(name_filter, 'match', side_effect=lambda t: t['name'] == 'Foo') as match, \
+             patch.object(tfilter, 'plan', return_value=tfilter.chains):
+            torrents = self.tcache.get(1, 2, 3, 4, 5)
+            colfilter.apply(tfilter, torrents, self.tcache.store, (0, 1, 2, 3, 4))
+        # Only torrents #2 and #3 are complete
+        self.assertEqual(sorted(call[0][0]['id'] for call in match.call_args_list), [2, 3])
+
+
+class TestColumnFilterWithArray(_TestColumnFilterBase, unittest.TestCase):
+    use_numpy = False
+
+
+@unittest.skipIf(not NUMPY_AVAILABLE, 'NumPy is not installed')
+class TestColumnFilterWithNumpy(_TestColumnFilterBase, unittest.TestCase):
+    use_numpy = True
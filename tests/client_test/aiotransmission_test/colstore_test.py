@@ -0,0 +1,86 @@
+from stig.client.aiotransmission.colstore import (ColumnStore, NUMPY_AVAILABLE)
+
+import unittest
+
+
+class _TestColumnStoreBase():
+    use_numpy = None
+
+    def setUp(self):
+        self.store = ColumnStore(use_numpy=self.use_numpy)
+
+    def test_backend(self):
+        self.assertEqual(self.store.numpy, self.use_numpy)
+
+    def test_allocating_and_releasing_slots(self):
+        slots = [self.store.allocate(tid) for tid in range(100)]
+        self.assertEqual(slots, list(range(100)))
+        self.assertEqual(len(self.store), 100)
+        self.store.release(50)
+        self.assertEqual(len(self.store), 99)
+        self.assertEqual(self.store.tids[50], None)
+        self.assertEqual(self.store.allocate(1000), 50)
+        self.assertEqual(self.store.tids[50], 1000)
+
+    def test_values(self):
+        slot = self.store.allocate(1)
+        self.assertEqual(self.store.get(slot, 'rateDownload'), None)
+        self.assertEqual(self.store.set(slot, 'rateDownload', 123), True)
+        self.assertEqual(self.store.set(slot, 'percentDone', 0.5), True)
+        self.assertEqual(self.store.get(slot, 'rateDownload'), 123)
+        self.assertEqual(self.store.get(slot, 'percentDone'), 0.5)
+        self.assertEqual(type(self.store.get(slot, 'rateDownload')), int)
+        self.assertEqual(type(self.store.get(slot, 'percentDone')), float)
+        self.store.clear(slot, 'rateDownload')
+        self.assertEqual(self.store.get(slot, 'rateDownload'), None)
+
+    def test_unstorable_values(self):
+        slot = self.store.allocate(1)
+        self.assertEqual(self.store.set(slot, 'rateDownload', 1.5), False)
+        self.assertEqual(self.store.set(slot, 'rateDownload', True), False)
+        self.assertEqual(self.store.set(slot, 'percentDone', 'foo'), False)
+        self.assertEqual(self.store.get(slot, 'rateDownload'), None)
+
+    def test_column(self):
+        for tid in range(3):
+            slot = self.store.allocate(tid)
+            self.store.set(slot, 'rateUpload', tid * 10)
+        self.store.clear(1, 'rateUpload')
+        self.assertEqual(list(self.store.column('rateUpload'))[::2], [0, 20])
+        self.assertEqual(list(self.store.known('rateUpload')), [True, False, True])
+
+
+class TestColumnStoreWithArray(_TestColumnStoreBase, unittest.TestCase):
+    use_numpy = False
+
+
+@unittest.skipIf(not NUMPY_AVAILABLE, 'NumPy is not installed')
+class TestColumnStoreWithNumpy(_TestColumnStoreBase, unittest.TestCase):
+    use_numpy = True
+
+
+class TestUpdateAndForget(unittest.TestCase):
+    def setUp(self):
+        self.store = ColumnStore(use_numpy=False)
+        self.slot = self.store.allocate(1)
+        self.store.update(self.slot, {'id': 1, 'name': 'foo', 'rateDownload': 10,
+                                      'uploadRatio': -1, 'percentDone': 1})
+
+    def test_update(self):
+        self.assertEqual(self.store.get(self.slot, 'rateDownload'), 10)
+        self.assertEqual(self.store.get(self.slot, 'uploadRatio'), -1.0)
+        self.assertEqual(self.store.get(self.slot, 'percentDone'), 1.0)
+        self.store.update(self.slot, {'rateDownload': 20, 'rateUpload': 5})
+        self.assertEqual(self.store.get(self.slot, 'rateDownload'), 20)
+        self.assertEqual(self.store.get(self.slot, 'rateUpload'), 5)
+
+    def test_unstorable_value(self):
+        self.store.update(self.slot, {'rateDownload': 1.5})
+        self.assertEqual(self.store.get(self.slot, 'rateDownload'), None)
+        self.store.update(self.slot, {'rateDownload': 2})
+        self.assertEqual(self.store.get(self.slot, 'rateDownload'), 2)
+
+    def test_forget(self):
+        self.store.forget(self.slot, ('name', 'rateDownload'))
+        self.assertEqual(self.store.get(self.slot, 'rateDownload'), None)
+        self.assertEqual(self.store.get(self.slot, 'uploadRatio'), -1.0)
@@ -0,0 +1,107 @@
+from stig.client.aiotransmission.metacache import MetadataCache
+
+import unittest
+import asynctest
+from unittest.mock import patch
+import tempfile
+import shutil
+import os
+
+
+URL = 'http://localhost:9091/transmission/rpc'
+
+
+class TestMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'stig', 'metadata')
+        self.mc = MetadataCache(self.path)
+
+    def tearDown(self):
+        self.mc.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_empty_cache(self):
+        self.assertEqual(self.mc.get(URL, ('abc', 'def')), {})
+
+    def test_store_and_get(self):
+        self.mc.update(URL, ({'id': 1, 'hashString': 'abc', 'creator': 'Foo', 'pieceCount': 5,
+                              'metadataPercentComplete': 1, 'rateDownload': 123},
+                             {'id': 2, 'hashString': 'def', 'creator': 'Bar',
+                              'metadataPercentComplete': 1}))
+        self.assertTrue(os.path.exists(self.path))
+        self.assertEqual(self.mc.get(URL, ('abc', 'def', 'ghi')),
+                         {'abc': {'creator': 'Foo', 'pieceCount': 5},
+                          'def': {'creator': 'Bar'}})
+
+    def test_fields_are_merged(self):
+        self.mc.update(URL, ({'hashString': 'abc', 'creator': 'Foo', 'metadataPercentComplete': 1},))
+        self.mc.update(URL, ({'hashString': 'abc', 'pieceCount': 5, 'metadataPercentComplete': 1},))
+        self.assertEqual(self.mc.get(URL, ('abc',)),
+                         {'abc': {'creator': 'Foo', 'pieceCount': 5}})
+
+    def test_incomplete_metadata_is_not_stored(self):
+        self.mc.update(URL, ({'hashString': 'abc', 'creator': 'abc', 'metadataPercentComplete': 0.5},))
+        self.assertEqual(self.mc.get(URL, ('abc',)), {})
+
+    def test_mutable_fields_are_not_stored(self):
+        self.mc.update(URL, ({'hashString': 'abc', 'name': 'Foo', 'files': [], 'trackers': [],
+                              'comment': 'Hi', 'addedDate': 123, 'metadataPercentComplete': 1},))
+        self.assertEqual(self.mc.get(URL, ('abc',)), {})
+
+    def test_mutable_fields_from_older_versions_are_ignored(self):
+        self.mc.update(URL, ({'hashString': 'abc', 'creator': 'Foo', 'metadataPercentComplete': 1},))
+        db = self.mc._connect()
+        with db:
+            db.execute('UPDATE torrents SET fields = ?',
+                       (self.mc._encode({'creator': 'Foo', 'name': 'Old name'}),))
+        self.mc.close()
+        mc = MetadataCache(self.path)
+        self.assertEqual(mc.get(URL, ('abc',)), {'abc': {'creator': 'Foo'}})
+        mc.close()
+
+    def test_different_urls(self):
+        self.mc.update(URL, ({'hashString': 'abc', 'creator': 'Foo', 'metadataPercentComplete': 1},))
+        self.assertEqual(self.mc.get('http://otherhost:9091/transmission/rpc', ('abc',)), {})
+
+    def test_persistence(self):
+        self.mc.update(URL, ({'hashString': 'abc', 'creator': 'Foo', 'metadataPercentComplete': 1},))
+        self.mc.close()
+        mc = MetadataCache(self.path)
+        self.assertEqual(mc.get(URL, ('abc',)), {'abc': {'creator': 'Foo'}})
+        mc.close()
+
+    def test_unusable_path(self):
+        path = os.path.join(self.tmpdir, 'file')
+        open(path, 'w').close()
+        mc = MetadataCache(os.path.join(path, 'metadata'))
+        mc.update(URL, ({'hashString': 'abc', 'creator': 'Foo', 'metadataPercentComplete': 1},))
+        self.assertEqual(mc.get(URL, ('abc',)), {})
+
+
+class TestMetadataCacheAsync(asynctest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.mc = MetadataCache(os.path.join(self.tmpdir, 'metadata'))
+
+    def tearDown(self):
+        self.mc.close()
+        shutil.rmtree(self.tmpdir)
+
+    async def test_store_and_get(self):
+        await self.mc.update_async(URL, ({'hashString': 'abc', 'creator': 'Foo',
+                                          'metadataPercentComplete': 1},))
+        self.assertEqual(await self.mc.get_async(URL, ('abc', 'def')),
+                         {'abc': {'creator': 'Foo'}})
+
+    async def test_known_fields_are_not_read_again(self):
+        await self.mc.update_async(URL, ({'hashString': 'abc', 'creator': 'Foo',
+                                          'metadataPercentComplete': 1},))
+        with patch.object(self.mc, '_get', wraps=self.mc._get) as get:
+            await self.mc.update_async(URL, ({'hashString': 'abc', 'pieceCount': 5,
+                                              'metadataPercentComplete': 1},))
+            self.assertEqual(get.call_count, 0)
+        self.mc.close()
+        mc = MetadataCache(self.mc.path)
+        self.assertEqual(mc.get(URL, ('abc',)), {'abc': {'creator': 'Foo', 'pieceCount': 5}})
+        mc.close()
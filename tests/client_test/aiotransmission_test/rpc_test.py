@@ -1,5 +1,6 @@
-from stig.client.aiotransmission.rpc import TransmissionRPC
+from stig.client.aiotransmission.rpc import (TransmissionRPC, _RequestSlots)
 from stig.client import (ClientError, ConnectionError, RPCError, AuthError)
+from stig.client.utils import create_background_task
 
 import resources_aiotransmission as rsrc
 
@@ -300,3 +301,95 @@ class TestTransmissionRPC(asynctest.ClockedTestCase):
         self.assert_cb_error_called(calls=1,
                                     args=[(self.client,)],
                                     kwargs=[{'error': cm.exception}])
+
+
+class TestConcurrentRequests(asynctest.TestCase):
+    async def setUp(self):
+        self.daemon = rsrc.FakeTransmissionDaemon(loop=self.loop)
+        self.daemon.response = self.slow_response
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.methods = []
+        await self.daemon.start()
+        self.client = TransmissionRPC(self.daemon.host, self.daemon.port, loop=self.loop)
+
+    async def tearDown(self):
+        self.client.disconnect()
+        await self.daemon.stop()
+
+    async def slow_response(self, request):
+        rqdata = await request.json()
+        if rqdata['method'] != 'session-get':
+            self.methods.append(rqdata['method'])
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.05, loop=self.loop)
+            self.in_flight -= 1
+        return web.json_response(rsrc.SESSION_GET_RESPONSE)
+
+    async def make_requests(self, n):
+        await self.client.connect()
+        await asyncio.gather(*(self.client.torrent_get() for _ in range(n)),
+                             loop=self.loop)
+
+    async def test_requests_are_limited_to_max_requests(self):
+        self.client.max_requests = 2
+        await self.make_requests(6)
+        self.assertEqual(self.max_in_flight, 2)
+
+    async def test_max_requests_of_one_serializes_requests(self):
+        self.client.max_requests = 1
+        await self.make_requests(3)
+        self.assertEqual(self.max_in_flight, 1)
+
+    async def test_interactive_requests_are_sent_before_background_requests(self):
+        self.client.max_requests = 1
+        await self.client.connect()
+        tasks = (create_background_task(self.client.bg_1(), loop=self.loop),
+                 create_background_task(self.client.bg_2(), loop=self.loop),
+                 self.loop.create_task(self.client.interactive()))
+        await asyncio.gather(*tasks, loop=self.loop)
+        self.assertEqual(self.methods, ['bg-1', 'interactive', 'bg-2'])
+
+    async def test_cancelled_request_frees_its_slot(self):
+        self.client.max_requests = 1
+        await self.client.connect()
+        first = self.loop.create_task(self.client.first())
+        waiting = self.loop.create_task(self.client.cancelled())
+        await asyncio.sleep(0, loop=self.loop)
+        waiting.cancel()
+        await asyncio.gather(first, self.client.last(), loop=self.loop)
+        self.assertEqual(self.methods, ['first', 'last'])
+
+    def test_invalid_max_requests(self):
+        with self.assertRaises(ValueError):
+            self.client.max_requests = 0
+        with self.assertRaises(ValueError):
+            self.client.max_requests = 'foo'
+
+
+class TestRequestSlots(asynctest.TestCase):
+    async def test_cancelled_waiter_that_was_dropped_by_release(self):
+        slots = _RequestSlots(1, loop=self.loop)
+        await slots.acquire()
+        waiting = self.loop.create_task(slots.acquire())
+        await asyncio.sleep(0, loop=self.loop)
+        waiting.cancel()
+        # The cancelled future is dropped before the waiting task can remove it
+        slots.release()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        self.assertEqual(slots.waiting, 0)
+        await asyncio.wait_for(slots.acquire(), timeout=1, loop=self.loop)
+
+    async def test_cancelled_waiter_that_was_given_a_slot(self):
+        slots = _RequestSlots(1, loop=self.loop)
+        await slots.acquire()
+        waiting = self.loop.create_task(slots.acquire())
+        await asyncio.sleep(0, loop=self.loop)
+        slots.release()
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        self.assertEqual(slots.waiting, 0)
+        await asyncio.wait_for(slots.acquire(), timeout=1, loop=self.loop)
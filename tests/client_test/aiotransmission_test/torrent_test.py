@@ -32,12 +32,35 @@ class Test_is_isolated(unittest.TestCase):
         self.assertEqual(tc, False)
 
 
+    def test_unknown_trackers_and_private(self):
+        tc = torrent._is_isolated({'isPrivate': True})
+        self.assertEqual(tc, False)
+
+
+class Test_find_error(unittest.TestCase):
+    def test_error_string(self):
+        self.assertEqual(torrent._find_error({'error': 2, 'errorString': 'Foo'}),
+                         'Tracker error: Foo')
+
+    def test_unknown_trackers(self):
+        self.assertEqual(torrent._find_error({'error': 0, 'errorString': ''}), '')
+
+
+class TestSlowFields(unittest.TestCase):
+    def test_handpicked_keys(self):
+        self.assertEqual(torrent.slow_fields_for('name', 'path'), set())
+        self.assertEqual(torrent.slow_fields_for('name', 'status'), {'trackerStats'})
+
+    def test_all_keys(self):
+        self.assertEqual(torrent.slow_fields_for('ALL'), {'trackerStats'})
+
+
 class TestTorrentFields(unittest.TestCase):
     def test_handpicked_fields(self):
         testcase = ('id', 'hash', 'name', 'status', 'id', 'id', 'id')
         expect = ('id', 'hashString', 'name', 'status', 'percentDone',
                   'metadataPercentComplete', 'rateDownload', 'rateUpload',
-                  'peersConnected', 'trackerStats', 'isPrivate')
+                  'peersConnected', 'isPrivate')
         self.assertEqual(sorted(torrent.TorrentFields(*testcase)),
                          sorted(expect))
 
@@ -65,6 +88,35 @@ class TestTorrentFields(unittest.TestCase):
 
 
 class TestTorrent(unittest.TestCase):
+    def test_update_returns_changed_fields(self):
+        t = torrent.Torrent({'id': 1, 'name': 'foo', 'rateDownload': 0})
+        self.assertEqual(t.update({'id': 1, 'name': 'foo', 'rateDownload': 10}), {'rateDownload'})
+        self.assertEqual(t.update({'id': 1, 'name': 'foo', 'rateDownload': 10}), set())
+        self.assertEqual(t.update({'id': 1, 'rateUpload': 5}), {'rateUpload'})
+
+    def test_update_invalidates_dependent_keys(self):
+        t = torrent.Torrent({'id': 1, 'name': 'foo', 'rateDownload': 0, 'rateUpload': 0,
+                             'totalSize': 100, 'uploadedEver': 50})
+        self.assertEqual((t['rate-down'], t['rate-up'], t['%uploaded']), (0, 0, 50))
+        t.update({'id': 1, 'rateDownload': 10, 'uploadedEver': 100})
+        self.assertEqual(set(t._cache), {'rate-up'})
+        self.assertEqual((t['rate-down'], t['rate-up'], t['%uploaded']), (10, 0, 100))
+
+    def test_dependent_keys(self):
+        for key,fields in torrent.DEPENDENCIES.items():
+            for field in fields:
+                self.assertIn(key, torrent._DEPENDENT_KEYS[field])
+        self.assertIn('status', torrent._DEPENDENT_KEYS['trackerStats'])
+
+    def test_revision(self):
+        t = torrent.Torrent({'id': 1, 'name': 'foo', 'rateDownload': 0, 'rateUpload': 0})
+        name_rev, rate_rev = t.revision(('name',)), t.revision(('rate-down', 'rate-up'))
+        t.update({'id': 1, 'name': 'foo', 'rateDownload': 0, 'rateUpload': 10})
+        self.assertEqual(t.revision(('name',)), name_rev)
+        self.assertGreater(t.revision(('rate-down', 'rate-up')), rate_rev)
+        t.forget(('name',))
+        self.assertGreater(t.revision(('name',)), name_rev)
+
     def test_contains(self):
         raw = {'id': 123, 'name': 'Fake torrent',
                'rateDownload': 10000, 'hashString': 'foobar',
@@ -63,6 +63,14 @@ class TestSingleTorrentFilter(unittest.TestCase):
        self.assertEqual(str(SingleTorrentFilter(' =   foo, bar and baz ')), '=foo, bar and baz')
        self.assertEqual(str(SingleTorrentFilter('=   foo, bar and baz ')), '=   foo, bar and baz ')
 
+    def test_properties(self):
+        f = SingleTorrentFilter('connections!>=3')
+        self.assertEqual((f.name, f.invert, f.op, f.value), ('connections', True, '>=', 3))
+        f = SingleTorrentFilter('foo')
+        self.assertEqual((f.name, f.invert, f.op, f.value), ('name', False, '~', 'foo'))
+        f = SingleTorrentFilter('!idle')
+        self.assertEqual((f.name, f.invert, f.op, f.value), ('idle', True, None, None))
+
     def test_unknown_filter(self):
         with self.assertRaises(ValueError) as cm:
             SingleTorrentFilter('foo=bar')
@@ -301,6 +309,12 @@ class TestTorrentFilter(unittest.TestCase):
                                 'connections&!downloading|id=4').apply(tlist)
         self.assertEqual(getids(ftlist), {1, 2, 3, 4})
 
+    def test_chains(self):
+        tf = TorrentFilter('idle&!foo|complete')
+        self.assertEqual(tf.chains, ((SingleTorrentFilter('idle'), SingleTorrentFilter('!foo')),
+                                     (SingleTorrentFilter('complete'),)))
+        self.assertEqual(TorrentFilter().chains, ())
+
     def test_equality(self):
         self.assertEqual(TorrentFilter('idle&private'),
                          TorrentFilter('idle&private'))
@@ -360,3 +374,82 @@ class TestTorrentFilter(unittest.TestCase):
         f3 = TorrentFilter('!private|active')
         self.assertEqual(set((f1+f2+f3).needed_keys),
                          set(['private', '%downloaded', 'peers-connected', 'status']))
+
+    def test_compiled_predicate_is_shared(self):
+        f1 = TorrentFilter('downloading&private|complete')
+        f2 = TorrentFilter('private&downloading|complete')
+        self.assertIs(f1._compile(), f2._compile())
+        self.assertIsNot(f1._compile(), TorrentFilter('complete')._compile())
+
+    def test_compiled_expression(self):
+        namespace = {}
+        expr = SingleTorrentFilter('rate-down>10').compile(namespace)
+        self.assertEqual(expr, "(obj['rate-down'] > _0)")
+        self.assertEqual(namespace, {'_0': 10})
+        expr = SingleTorrentFilter('!foo').compile(namespace)
+        self.assertEqual(expr, "(not (_1 in obj['name']))")
+        expr = SingleTorrentFilter('!connections').compile(namespace)
+        self.assertEqual(expr, "(not (obj['peers-connected']))")
+        expr = SingleTorrentFilter('idle').compile(namespace)
+        self.assertEqual(expr, "(_2(obj))")
+        self.assertIs(namespace['_2'], SingleTorrentFilter.BOOLEAN_FILTERS['idle'].filter_function)
+
+    def test_match_returns_bool(self):
+        self.assertIs(TorrentFilter('connections').match(tlist[1]), True)
+        self.assertIs(TorrentFilter('connections').match(tlist[0]), False)
+        self.assertIs(TorrentFilter().match(tlist[0]), True)
+
+    def test_cost(self):
+        self.assertEqual(SingleTorrentFilter('rate-down>10').cost, 1)
+        self.assertEqual(SingleTorrentFilter('connections').cost, 1)
+        self.assertEqual(SingleTorrentFilter('idle').cost, 2)
+        self.assertEqual(SingleTorrentFilter('eta>1h').cost, 2)
+        self.assertEqual(SingleTorrentFilter('tracker~foo').cost, 10)
+
+    def test_plan_puts_cheap_filters_first(self):
+        tf = TorrentFilter('tracker~foo&idle&name~bar|tracker~baz')
+        self.assertEqual(tf.plan(), ((SingleTorrentFilter('name~bar'), SingleTorrentFilter('idle'),
+                                      SingleTorrentFilter('tracker~foo')),
+                                     (SingleTorrentFilter('tracker~baz'),)))
+
+    def test_plan_puts_selective_filters_first(self):
+        tf = TorrentFilter('incomplete&private')
+        self.assertEqual(tf.plan(), ((SingleTorrentFilter('incomplete'), SingleTorrentFilter('private')),))
+        # 'incomplete' matches 3 of 4 torrents, 'private' only 2
+        for _ in range(10):
+            tuple(tf.apply(tlist))
+        self.assertEqual(tf.plan(), ((SingleTorrentFilter('private'), SingleTorrentFilter('incomplete')),))
+        self.assertEqual(getids(tf.apply(tlist)), {2, 4})
+
+    def test_plan_is_only_replaced_if_order_changes(self):
+        tf = TorrentFilter('incomplete&private')
+        plan = tf.plan()
+        tuple(tf.apply(tlist))
+        self.assertNotEqual(tf.plan(), plan)
+        predicate = tf._compile()
+        plan = tf.plan()
+        selectivity = dict(tf._selectivity)
+        for _ in range(10):
+            tuple(tf.apply(tlist[1:]))
+        self.assertNotEqual(tf._selectivity, selectivity)
+        self.assertIs(tf.plan(), plan)
+        self.assertIs(tf._compile(), predicate)
+
+    def test_statistics_are_not_shared(self):
+        tf1 = TorrentFilter('incomplete&private')
+        for _ in range(10):
+            tuple(tf1.apply(tlist))
+        tf2 = TorrentFilter('incomplete&private')
+        self.assertEqual(tf2.plan(), ((SingleTorrentFilter('incomplete'), SingleTorrentFilter('private')),))
+        self.assertNotEqual(tf1.plan(), tf2.plan())
+
+    def test_prefetch_keys(self):
+        tf = TorrentFilter('tracker~foo&downloading|complete')
+        self.assertEqual(set(tf.prefetch_keys), {'rate-down', '%downloaded'})
+        self.assertEqual(set(tf.needed_keys), {'rate-down', '%downloaded', 'trackers'})
+        tf = TorrentFilter('tracker~foo')
+        self.assertEqual(tf.prefetch_keys, ('trackers',))
+
+    def test_prefilter(self):
+        tf = TorrentFilter('tracker~foo&downloading|complete')
+        self.assertEqual(getids(tf.prefilter(tlist)), {1, 2})
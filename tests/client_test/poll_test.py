@@ -210,3 +210,29 @@ class TestRequestPoller(asynctest.ClockedTestCase):
         await self.advance(0)
         self.assertEqual(self.mock_request_calls, 3)
         await rp.stop()
+
+    async def test_manual_polling_waits_for_ongoing_request(self):
+        release = asyncio.Event(loop=self.loop)
+        async def slow_request():
+            self.mock_request_calls += 1
+            calls = self.mock_request_calls
+            await release.wait()
+            return calls
+
+        responses = []
+        rp = self.make_poller(slow_request, loop=self.loop)
+        rp.on_response(responses.append, autoremove=False)
+        await rp.start()
+        await self.advance(0)
+        self.assertEqual(self.mock_request_calls, 1)
+        rp.poll()
+        rp.poll()
+        await self.advance(0)
+        self.assertEqual(self.mock_request_calls, 1)
+        release.set()
+        await self.advance(0)
+        self.assertEqual(responses, [1, 2])
+        # Only one extra request is made
+        await self.advance(rp.interval - 1)
+        self.assertEqual(self.mock_request_calls, 2)
+        await rp.stop()
@@ -0,0 +1,107 @@
+from stig.client.sorters.tsorter import TorrentSorter
+from stig.client.aiotransmission.torrent import Torrent
+
+import unittest
+import random
+
+
+def make_torrent(tid, **fields):
+    raw = {'id': tid, 'name': 'Torrent %d' % (tid % 3), 'rateDownload': tid % 2,
+           'rateUpload': tid % 4, 'percentDone': (tid % 5) / 4, 'metadataPercentComplete': 1,
+           'recheckProgress': 0, 'sizeWhenDone': tid * 100}
+    raw.update(fields)
+    return Torrent(raw)
+
+
+def multipass_sort(sorter, items):
+    # Sort once per key like SorterBase used to
+    for sortspec,reverse in zip(sorter._sortspecs, sorter._reverses):
+        for keyfunc in sortspec._keyfuncs:
+            items = sorted(items, key=keyfunc, reverse=reverse)
+    return items
+
+
+class TestTorrentSorter(unittest.TestCase):
+    def setUp(self):
+        self.tlist = [make_torrent(tid) for tid in range(1, 50)]
+        random.shuffle(self.tlist)
+
+    def assert_sorted_like_multipass(self, *sortstrings):
+        sorter = TorrentSorter(sortstrings)
+        exp = [t['id'] for t in multipass_sort(sorter, self.tlist)]
+        self.assertEqual([t['id'] for t in sorter.apply(self.tlist)], exp)
+        items = list(self.tlist)
+        sorter.apply(items, inplace=True)
+        self.assertEqual([t['id'] for t in items], exp)
+
+    def test_single_sort_order(self):
+        for sortstring in ('name', '!name', 'rate-down', '!size', 'progress', '!progress'):
+            self.assert_sorted_like_multipass(sortstring)
+
+    def test_multiple_sort_orders(self):
+        self.assert_sorted_like_multipass('rate-up', 'rate-down')
+        self.assert_sorted_like_multipass('!rate-up', 'rate-down')
+        self.assert_sorted_like_multipass('rate-up', '!rate-down', 'progress')
+        self.assert_sorted_like_multipass('!name', '!rate-up', '!progress')
+
+    def test_item_getter(self):
+        sorter = TorrentSorter(('!rate-up', 'rate-down'))
+        items = [{'t': t} for t in self.tlist]
+        sorter.apply(items, inplace=True, item_getter=lambda item: item['t'])
+        self.assertEqual([item['t']['id'] for item in items],
+                         [t['id'] for t in multipass_sort(sorter, self.tlist)])
+
+    def test_sort_keys_are_cached_until_fields_change(self):
+        calls = []
+        sorter = TorrentSorter(('rate-up',))
+        keyfunc = sorter._keyfunc
+        def counting_keyfunc(t):
+            calls.append(t['id'])
+            return keyfunc(t)
+        sorter._keyfunc = counting_keyfunc
+
+        sorter.apply(self.tlist)
+        self.assertEqual(len(calls), len(self.tlist))
+        del calls[:]
+        sorter.apply(self.tlist)
+        self.assertEqual(calls, [])
+
+        t = self.tlist[0]
+        t.update({'rateUpload': 1000})
+        self.assertEqual(sorter.apply(self.tlist)[-1], t)
+        self.assertEqual(calls, [t['id']])
+
+    def test_sortkey(self):
+        for sortstrings in (('rate-up',), ('!rate-up',), ('!rate-up', 'progress')):
+            sorter = TorrentSorter(sortstrings)
+            self.assertEqual(sorted(self.tlist, key=sorter.sortkey()), sorter.apply(self.tlist))
+
+    def test_limit(self):
+        for sortstrings in (('name',), ('!rate-up',), ('!rate-up', 'progress'), ('!size',)):
+            sorter = TorrentSorter(sortstrings)
+            exp = [t['id'] for t in sorter.apply(self.tlist)]
+            for limit in (0, 1, 10, 49, 100):
+                self.assertEqual([t['id'] for t in sorter.apply(self.tlist, limit=limit)],
+                                 exp[:limit])
+            items = list(self.tlist)
+            sorter.apply(items, inplace=True, limit=5)
+            self.assertEqual([t['id'] for t in items], exp[:5])
+
+    def test_prune(self):
+        sorter = TorrentSorter(('rate-up',))
+        sortkey = sorter.sortkey()
+        for t in self.tlist:
+            sortkey(t)
+        self.assertEqual(len(sorter._keycache), len(self.tlist))
+        sorter.prune({1: None, 2: None})
+        self.assertEqual(set(sorter._keycache), {1, 2})
+        # Existing sort key functions use the pruned cache
+        sortkey(self.tlist[0])
+        self.assertIn(self.tlist[0]['id'], sorter._keycache)
+
+    def test_sorting_fewer_items_keeps_cached_keys(self):
+        sorter = TorrentSorter(('rate-up',))
+        sorter.apply(self.tlist)
+        sorter.apply(self.tlist[:10])
+        sorter.apply(self.tlist, limit=5)
+        self.assertEqual(len(sorter._keycache), len(self.tlist))
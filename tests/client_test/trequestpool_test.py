@@ -1,11 +1,12 @@
 from stig.client.trequestpool import TorrentRequestPool
 from stig.client.aiotransmission.torrent import Torrent
 from stig.client.filters.tfilter import TorrentFilter
-from stig.client.utils import Response
+from stig.client.utils import (Response, create_background_task, is_background_task)
 
 import asynctest
 import asyncio
 from types import SimpleNamespace
+from unittest.mock import patch
 
 import logging
 log = logging.getLogger(__name__)
@@ -13,8 +14,10 @@ log = logging.getLogger(__name__)
 
 
 FAKE_TORRENTS = (
-    Torrent({'id': 1, 'name': 'foo', 'rateDownload': 50, 'rateUpload': 100, 'totalSize': 10e3, 'isPrivate': False}),
-    Torrent({'id': 2, 'name': 'bar', 'rateDownload': 0, 'rateUpload': 0, 'totalSize': 10e6, 'isPrivate': True}),
+    Torrent({'id': 1, 'name': 'foo', 'rateDownload': 50, 'rateUpload': 100, 'totalSize': 10e3, 'isPrivate': False,
+             'downloadDir': '/foo'}),
+    Torrent({'id': 2, 'name': 'bar', 'rateDownload': 0, 'rateUpload': 0, 'totalSize': 10e6, 'isPrivate': True,
+             'downloadDir': '/bar'}),
     Torrent({'id': 3, 'name': 'baz', 'rateDownload': 0, 'rateUpload': 0, 'totalSize': 10e9, 'isPrivate': True})
 )
 
@@ -24,18 +27,27 @@ class FakeTorrentAPI():
         self.calls = 0
         self.arg_torrents = None
         self.arg_keys = None
+        self.arg_delta = None
+        self.requests = []
+        self.background = []
         self.exc = None
         self.tlist = FAKE_TORRENTS
         self.delay = 0
 
-    async def torrents(self, torrents=None, keys='ALL'):
+    async def torrents(self, torrents=None, keys='ALL', delta=False):
         if self.delay:
             await asyncio.sleep(self.delay, loop=asyncio.get_event_loop())
         self.calls += 1
         self.arg_torrents = torrents
         self.arg_keys = keys
+        self.arg_delta = delta
+        self.requests.append((torrents, set(keys)))
+        self.background.append(is_background_task(asyncio.get_event_loop()))
         if self.exc is None:
-            return Response(torrents=self.tlist)
+            if isinstance(torrents, tuple):
+                return Response(success=True, torrents=tuple(t for t in self.tlist
+                                                             if t['id'] in torrents))
+            return Response(success=True, torrents=self.tlist)
         else:
             raise self.exc
 
@@ -87,6 +99,12 @@ class TestTorrentRequestPool(asynctest.ClockedTestCase):
         if keys is not None:
             self.assertEqual(set(self.api.arg_keys), set(keys))
 
+    def assert_requests(self, requests):
+        # Concurrent requests may be made in any order
+        self.assertEqual(len(self.api.requests), len(requests))
+        for request in requests:
+            self.assertIn(request, self.api.requests)
+
     async def test_combining_requests(self):
         await self.rp.start()
         self.assertEqual(self.rp.running, True)
@@ -182,6 +200,25 @@ class TestTorrentRequestPool(asynctest.ClockedTestCase):
 
         await self.rp.stop()
 
+    async def test_combining_torrent_ids(self):
+        foo, bar, baz = FakeCallback(), FakeCallback(), FakeCallback()
+        self.rp.register('foo', foo, keys=('name',), tfilter=(3,))
+        self.rp.register('bar', bar, keys=('name',), tfilter=(1, 3))
+        self.rp._handle_tlist(await self.rp.request())
+        self.assert_api_request(calls=1, tfilter=(1, 3))
+        self.assertEqual((foo.args, bar.args), ((FAKE_TORRENTS[2],), (FAKE_TORRENTS[0], FAKE_TORRENTS[2])))
+
+        # IDs are combined with filters by matching them
+        self.rp.register('baz', baz, keys=('name',), tfilter=TorrentFilter('name=bar'))
+        self.rp._handle_tlist(await self.rp.request())
+        self.assert_api_request(calls=2, tfilter=TorrentFilter('id=1|id=3|name=bar'))
+
+        self.rp.remove('baz')
+        self.rp.remove('foo')
+        self.rp._handle_tlist(await self.rp.request())
+        self.assert_api_request(calls=3, tfilter=(1, 3))
+        self.assertEqual(bar.args, (FAKE_TORRENTS[0], FAKE_TORRENTS[2]))
+
     async def test_raising_fatal_exception(self):
         self.api.exc = RuntimeError('Something is wrong!')
         await self.rp.start()
@@ -236,3 +273,99 @@ class TestTorrentRequestPool(asynctest.ClockedTestCase):
         self.assertEqual(self.api.calls, apicalls+1)
 
         await self.rp.stop()
+
+    async def test_resync(self):
+        self.rp.register('foo', callback=lambda torrents: None)
+        deltas = []
+        for resync in (0, 1, 3):
+            self.rp.resync = resync
+            for _ in range(6):
+                await self.rp.request()
+                deltas.append(self.api.arg_delta)
+        self.assertEqual(deltas, [False] * 12 + [True, True, False, True, True, False])
+
+    async def test_tiered_keys(self):
+        self.rp.register('foo', callback=lambda torrents: None,
+                         keys=('name', 'rate-down', 'path'), intervals={'name': 10})
+        self.assertEqual(self.rp._request.keywords['tiers'], {10: ('name',), 60: ('path',)})
+
+        # All keys are requested initially
+        await self.rp.request()
+        self.assert_requests([(None, {'rate-down'}),
+                              (None, {'name'}),
+                              (None, {'path'})])
+
+        # Only torrents that lack slow keys are requested
+        del self.api.requests[:]
+        await self.advance(5)
+        await self.rp.request()
+        self.assert_requests([(None, {'rate-down'}),
+                              ((3,), {'path'})])
+
+        # Slow keys are requested for all torrents after their interval
+        del self.api.requests[:]
+        await self.advance(5)
+        await self.rp.request()
+        self.assert_requests([(None, {'rate-down'}),
+                              (None, {'name'}),
+                              ((3,), {'path'})])
+
+    async def test_tiered_keys_of_filtered_torrents(self):
+        self.rp.register('foo', callback=lambda torrents: None,
+                         keys=('rate-down', 'path'), tfilter=TorrentFilter('private'))
+        self.api.tlist = FAKE_TORRENTS[1:]
+        await self.rp.request()
+        self.assert_requests([(TorrentFilter('private'), {'rate-down', 'private'}),
+                              ((2, 3), {'path'})])
+
+        # Too many IDs are not listed
+        del self.api.requests[:]
+        await self.advance(60)
+        with patch('stig.client.trequestpool._MAX_TIER_IDS', 1):
+            await self.rp.request()
+        self.assert_requests([(TorrentFilter('private'), {'rate-down', 'private'}),
+                              (None, {'path'})])
+
+    async def test_tier_requests_inherit_background_priority(self):
+        self.rp.register('foo', callback=lambda torrents: None,
+                         keys=('rate-down', 'path'))
+        await create_background_task(self.rp.request(), loop=self.loop)
+        self.assertEqual(len(self.api.requests), 2)
+        self.assertEqual(self.api.background, [True, True])
+
+        del self.api.background[:]
+        await self.advance(60)
+        await self.loop.create_task(self.rp.request())
+        self.assertEqual(self.api.background, [False, False])
+
+    async def test_filters_are_applied_to_changed_torrents_only(self):
+        class CountingFilter(TorrentFilter):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.matched = []
+            def match(self, t):
+                self.matched.append(t['id'])
+                return super().match(t)
+
+        tlist = (Torrent({'id': 1, 'name': 'foo', 'rateDownload': 0}),
+                 Torrent({'id': 2, 'name': 'bar', 'rateDownload': 0}))
+        foo, bar = FakeCallback(), FakeCallback()
+        foo_filter, bar_filter = CountingFilter('name=foo'), CountingFilter('rate-down>0')
+        self.rp.register('foo', foo, tfilter=foo_filter)
+        self.rp.register('bar', bar, tfilter=bar_filter)
+
+        self.rp._handle_tlist(Response(torrents=tlist))
+        self.assertEqual((foo_filter.matched, bar_filter.matched), ([1, 2], [1, 2]))
+        self.assertEqual((foo.args, bar.args), ((tlist[0],), ()))
+
+        # Nothing changed
+        foo_filter.matched[:] = bar_filter.matched[:] = []
+        self.rp._handle_tlist(Response(torrents=tlist))
+        self.assertEqual((foo_filter.matched, bar_filter.matched), ([], []))
+        self.assertEqual((foo.args, bar.args), ((tlist[0],), ()))
+
+        # Only torrents with changed filter keys are matched again
+        tlist[1].update({'id': 2, 'name': 'bar', 'rateDownload': 100})
+        self.rp._handle_tlist(Response(torrents=tlist))
+        self.assertEqual((foo_filter.matched, bar_filter.matched), ([], [2]))
+        self.assertEqual((foo.args, bar.args), ((tlist[0],), (tlist[1],)))
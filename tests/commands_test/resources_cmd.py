@@ -103,11 +103,11 @@ def mock_select_torrents(self, *args, **kwargs):
 
 
 class MockTorrentSorter(MockTorrentFilter):
-    def apply(self, torrents):
+    def apply(self, torrents, limit=None):
         if hasattr(self, 'raises'):
             raise self.raises
         self.applied = torrents
-        return torrents
+        return torrents if limit is None else torrents[:limit]
 
 def mock_get_torrent_sorter(self, *args, **kwargs):
     self.mock_tsorter = MockTorrentSorter(*args, **kwargs)
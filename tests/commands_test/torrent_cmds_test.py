@@ -122,6 +122,22 @@ class TestListTorrentsCmd(CommandTestCase):
     async def test_sort_and_filter(self):
         await self.do(['-s', 'name,size', 'downloading', 'uploading'], errors=())
 
+    async def test_limit(self):
+        tlist = (
+            MockTorrent(id=1, name='Some Torrent'),
+            MockTorrent(id=2, name='Another Torrent')
+        )
+        self.api.torrent.response = Response(errors=(), msgs=[], torrents=tlist)
+        with self.assertLogs(level='INFO') as logged:
+            process = ListTorrentsCmd(['--limit', '1'], loop=self.loop)
+            await self.finish(process)
+        self.assertEqual(process.success, True)
+        self.assert_logged(logged, ('INFO', 'Some Torrent'))
+        self.assertEqual(len(logged.output), 1)
+
+    async def test_invalid_limit(self):
+        await self.do(['--limit', '0'], errors=('Invalid limit: 0',))
+
     async def test_invalid_filter(self):
         def bad_select_torrents(self, *args, **kwargs):
             raise ValueError('Nope!')
@@ -0,0 +1,118 @@
+from stig.tui.listwalker import VirtualListWalker
+
+import unittest
+import urwid
+
+from .resources_tui import get_canvas_text
+
+
+class Item(urwid.WidgetWrap):
+    def __init__(self, id):
+        self.id = id
+        super().__init__(urwid.Text(str(id)))
+
+    def update(self, id):
+        self.id = id
+        self._w.set_text(str(id))
+
+
+class TestVirtualListWalker(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+        self.updated = []
+        def make_widget(id):
+            self.created.append(id)
+            return Item(id)
+        def update_widget(w, id):
+            self.updated.append(id)
+            w.update(id)
+        self.walker = VirtualListWalker(make_widget, update_widget, margin=2)
+        self.listbox = urwid.ListBox(self.walker)
+
+    def render(self, rows):
+        self.walker.reset_usage()
+        canv = self.listbox.render((10, rows))
+        self.walker.trim()
+        return [get_canvas_text(row).strip() for row in canv.content()]
+
+    def test_empty(self):
+        self.assertEqual(len(self.walker), 0)
+        self.assertEqual(self.walker.get_focus(), (None, None))
+        self.assertEqual(self.render(2), ['', ''])
+
+    def test_only_displayed_items_get_widgets(self):
+        self.walker.set_ids(range(1000))
+        self.assertEqual(self.render(3), ['0', '1', '2'])
+        self.assertEqual(sorted(self.created), [0, 1, 2])
+        self.assertEqual(len(self.walker), 1000)
+
+    def test_widgets_are_recycled(self):
+        self.walker.set_ids(range(1000))
+        self.render(3)
+        self.listbox.focus_position = 500
+        self.listbox.set_focus_valign('top')
+        self.assertEqual(self.render(3), ['500', '501', '502'])
+        self.assertEqual(sorted(w.id for w in self.walker.widgets), [500, 501, 502])
+        self.assertEqual(len(self.created), 6)
+
+        # Recycled widgets are reused
+        self.listbox.focus_position = 900
+        self.listbox.set_focus_valign('top')
+        self.assertEqual(self.render(3), ['900', '901', '902'])
+        self.assertEqual(len(self.created), 6)
+
+        # Widgets near the displayed widgets are kept
+        self.listbox.focus_position = 903
+        self.listbox.set_focus_valign('bottom')
+        self.assertEqual(self.render(3), ['901', '902', '903'])
+        self.assertEqual(sorted(w.id for w in self.walker.widgets), [900, 901, 902, 903])
+
+    def test_focus_follows_item(self):
+        self.walker.set_ids(['a', 'b', 'c', 'd'])
+        self.walker.set_focus(2)
+        self.walker.set_ids(['d', 'c', 'b', 'a'])
+        self.assertEqual(self.walker.get_focus()[0].id, 'c')
+        self.assertEqual(self.walker.focus, 1)
+
+    def test_focus_when_focused_item_is_removed(self):
+        self.walker.set_ids(['a', 'b', 'c', 'd'])
+        self.walker.set_focus(3)
+        self.walker.set_ids(['a', 'b'])
+        self.assertEqual(self.walker.focus, 1)
+        self.walker.set_ids([])
+        self.assertEqual(self.walker.get_focus(), (None, None))
+
+    def test_existing_widgets_are_updated(self):
+        self.walker.set_ids(['a', 'b', 'c'])
+        self.render(3)
+        del self.updated[:]
+        self.walker.set_ids(['b', 'c', 'x'])
+        self.assertEqual(sorted(self.updated), ['b', 'c'])
+
+    def test_get_widget(self):
+        self.walker.set_ids(range(100))
+        self.assertEqual(self.walker.get_widget(50).id, 50)
+        with self.assertRaises(KeyError):
+            self.walker.get_widget(100)
+        self.assertEqual(self.walker.position(50), 50)
+
+    def test_get_widget_without_keeping_it(self):
+        self.walker.set_ids(range(100))
+        self.render(5)
+        w = self.walker.get_widget(50, keep=False)
+        self.assertEqual(w.id, 50)
+        self.assertNotIn(w, self.walker.widgets)
+        self.assertIs(self.walker.get_widget(0, keep=False), self.walker.get_widget(0))
+
+    def test_rows(self):
+        self.walker.set_ids(range(100))
+        self.assertEqual(self.walker.rows_max((10,)), 100)
+        self.assertEqual(self.walker.rows_above(20, (10,)), 20)
+
+    def test_positions(self):
+        self.walker.set_ids(range(3))
+        self.assertEqual(list(self.walker.positions()), [0, 1, 2])
+        self.assertEqual(list(self.walker.positions(reverse=True)), [2, 1, 0])
+        self.assertEqual(self.walker.get_next(2), (None, None))
+        self.assertEqual(self.walker.get_prev(0), (None, None))
+        self.assertEqual(self.walker.get_next(0)[1], 1)
@@ -0,0 +1,79 @@
+from stig.tui.mainloop import MainLoop
+
+import unittest
+from unittest.mock import patch
+import urwid
+
+
+class FakeEventLoop():
+    def __init__(self):
+        self.alarms = []
+
+    def alarm(self, seconds, callback):
+        handle = (seconds, callback)
+        self.alarms.append(handle)
+        return handle
+
+    def remove_alarm(self, handle):
+        self.alarms.remove(handle)
+        return True
+
+    def fire_alarms(self):
+        alarms, self.alarms = self.alarms, []
+        for seconds,callback in alarms:
+            callback()
+
+
+class FakeScreen():
+    started = True
+
+    def hook_event_loop(self, event_loop, callback):
+        pass
+
+    def get_cols_rows(self):
+        return (80, 25)
+
+
+class TestMainLoop(unittest.TestCase):
+    def setUp(self):
+        self.event_loop = FakeEventLoop()
+        self.loop = MainLoop(urwid.SolidFill('x'), event_loop=self.event_loop,
+                             screen=FakeScreen(), max_fps=4)
+        self.draws = 0
+        def draw_screen():
+            self.draws += 1
+        self.loop.draw_screen = draw_screen
+
+    def idle_at(self, now):
+        with patch('time.monotonic', lambda: now):
+            self.loop.entering_idle()
+
+    def test_draws_are_throttled(self):
+        self.idle_at(100)
+        self.idle_at(100.0625)
+        self.idle_at(100.1875)
+        self.assertEqual(self.draws, 1)
+        self.idle_at(100.25)
+        self.assertEqual(self.draws, 2)
+
+    def test_throttled_update_is_drawn_when_frame_is_over(self):
+        self.idle_at(100)
+        self.idle_at(100.125)
+        self.idle_at(100.1875)
+        self.assertEqual(self.draws, 1)
+        self.assertEqual(len(self.event_loop.alarms), 1)
+        self.assertAlmostEqual(self.event_loop.alarms[0][0], 0.125)
+
+        with patch('time.monotonic', lambda: 100.25):
+            self.event_loop.fire_alarms()
+        self.assertEqual(self.draws, 2)
+        self.assertEqual(self.event_loop.alarms, [])
+
+    def test_pending_alarm_is_removed_when_frame_is_drawn(self):
+        self.idle_at(100)
+        self.idle_at(100.125)
+        self.assertEqual(len(self.event_loop.alarms), 1)
+        self.loop.process_input([])
+        self.idle_at(100.1875)
+        self.assertEqual(self.draws, 2)
+        self.assertEqual(self.event_loop.alarms, [])
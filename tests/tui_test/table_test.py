@@ -0,0 +1,83 @@
+from stig.tui.table import (Table, FastRow)
+from stig.tui.group import Group
+
+import unittest
+import urwid
+
+
+def make_cellcls(name, width, text, attr=None):
+    class Cell(urwid.Text):
+        header = urwid.Text(name.upper())
+        def __init__(self):
+            super().__init__((attr, text) if attr else text, wrap='clip')
+    Cell.width = width
+    return Cell
+
+
+COLUMNS = {
+    'id': make_cellcls('id', 4, '17'),
+    'name': make_cellcls('name', ('weight', 100), 'Some torrent name', attr='red'),
+    'size': make_cellcls('size', 6, '1.2G', attr='blue'),
+}
+
+
+class TestFastRow(unittest.TestCase):
+    def setUp(self):
+        self.slow = Table(fast_rows=False, **COLUMNS)
+        self.fast = Table(fast_rows=True, **COLUMNS)
+
+    def assert_same_rendering(self, maxcol):
+        slow_row = self.slow.make_row()
+        fast_row = self.fast.make_row()
+        self.assertIsInstance(slow_row, Group)
+        self.assertIsInstance(fast_row, FastRow)
+        for focus in (False, True):
+            exp = list(slow_row.render((maxcol,), focus=focus).content())
+            canv = fast_row.render((maxcol,), focus=focus)
+            self.assertEqual(canv.rows(), 1)
+            self.assertEqual(canv.cols(), maxcol)
+            # Compare text and attributes per screen column; runs may be split
+            # differently
+            def per_column(content):
+                cols = []
+                for attr,cs,text in content[0]:
+                    cols.extend((attr, chr(byte)) for byte in text)
+                return cols
+            self.assertEqual(per_column(list(canv.content())), per_column(exp))
+
+    def test_rendering_matches_columns(self):
+        for maxcol in (80, 30, 12, 5):
+            self.assert_same_rendering(maxcol)
+
+    def test_hidden_columns(self):
+        self.slow.columns = self.fast.columns = ('size', 'name')
+        self.assert_same_rendering(40)
+
+    def test_cells_are_accessible_by_name(self):
+        row = self.fast.make_row()
+        self.assertEqual(row.names, ['id', 'name', 'size'])
+        self.assertEqual(row.name.text, 'Some torrent name')
+        self.assertEqual(len(row.widgets), 3)
+        with self.assertRaises(AttributeError):
+            row.foo
+
+    def test_changing_columns_updates_rows(self):
+        row = self.fast.make_row()
+        self.fast.columns = ('name',)
+        self.assertEqual(row.names, ['name'])
+
+    def test_cell_changes_invalidate_row(self):
+        row = self.fast.make_row()
+        text1 = row.render((40,)).text[0]
+        row.name.set_text('Another name')
+        text2 = row.render((40,)).text[0]
+        self.assertNotEqual(text1, text2)
+        self.assertIn(b'Another name', text2)
+
+    def test_replace(self):
+        row = self.fast.make_row()
+        row.replace('size', urwid.Text('99'))
+        self.assertEqual(row.size.text, '99')
+        self.assertIn(b'99', row.render((40,)).text[0])
+        with self.assertRaises(ValueError):
+            row.replace('foo', urwid.Text('x'))
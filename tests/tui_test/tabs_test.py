@@ -366,3 +366,53 @@ class TestTabsKeyPress(unittest.TestCase):
         self.check(tab_pos=1, content_pos=None, edit_pos=0)
         self.tabs.keypress(self.size, 'left')
         self.check(tab_pos=0, content_pos=0, edit_pos=0)
+
+
+class VisibilityWidget(urwid.Text):
+    def __init__(self, text):
+        super().__init__(text)
+        self.visible = True
+        self.calls = []
+
+    def set_visible(self, visible):
+        if visible != self.visible:
+            self.visible = visible
+            self.calls.append(visible)
+
+
+class TestTabsVisibility(unittest.TestCase):
+    def setUp(self):
+        self.w1 = VisibilityWidget('Tab one')
+        self.w2 = VisibilityWidget('Tab two')
+        self.tabs = Tabs((urwid.Text('Tab1'), self.w1),
+                         (urwid.Text('Tab2'), self.w2))
+
+    def test_only_focused_widget_is_visible(self):
+        self.assertEqual(self.tabs.focus_position, 1)
+        self.assertEqual((self.w1.visible, self.w2.visible), (False, True))
+        self.tabs.focus_position = 0
+        self.assertEqual((self.w1.visible, self.w2.visible), (True, False))
+        self.tabs.focus_id = self.tabs.get_id(1)
+        self.assertEqual((self.w1.visible, self.w2.visible), (False, True))
+
+    def test_inserting_in_background(self):
+        w3 = VisibilityWidget('Tab three')
+        self.tabs.insert(urwid.Text('Tab3'), w3, focus=False)
+        self.assertEqual((self.w2.visible, w3.visible), (True, False))
+
+    def test_removed_widget_is_hidden(self):
+        self.tabs.remove(1)
+        self.assertEqual((self.w1.visible, self.w2.visible), (True, False))
+
+    def test_replaced_widget_is_hidden(self):
+        w3 = VisibilityWidget('Tab three')
+        self.tabs.set_content(w3, position=1)
+        self.assertEqual((self.w2.visible, w3.visible), (False, True))
+        self.tabs.set_content(self.w2, position=0)
+        self.assertEqual((self.w1.visible, self.w2.visible, w3.visible), (False, False, True))
+
+    def test_widgets_without_set_visible(self):
+        self.tabs.insert(urwid.Text('Tab3'), urwid.Text('Tab three'))
+        self.tabs.insert(urwid.Text('Tab4'), None)
+        self.tabs.focus_position = 0
+        self.assertEqual(self.w1.visible, True)
@@ -0,0 +1,51 @@
+from stig.views import ColumnBase
+
+import unittest
+
+
+class TestColumnBaseCache(unittest.TestCase):
+    def setUp(self):
+        self.orig_size = ColumnBase.cache_info()['maxsize']
+        ColumnBase.clear_cache()
+        self.calls = []
+
+    def tearDown(self):
+        ColumnBase.set_cache_size(self.orig_size)
+        ColumnBase.clear_cache()
+
+    def create_value(self, arg):
+        self.calls.append(arg)
+        return 'value of %s' % arg
+
+    def test_values_are_created_once(self):
+        col = ColumnBase()
+        self.assertEqual(col._from_cache(self.create_value, 1), 'value of 1')
+        self.assertEqual(col._from_cache(self.create_value, 1), 'value of 1')
+        self.assertEqual(ColumnBase()._from_cache(self.create_value, 2), 'value of 2')
+        self.assertEqual(self.calls, [1, 2])
+        self.assertEqual(ColumnBase.cache_info(),
+                         {'hits': 1, 'misses': 2, 'size': 2, 'maxsize': self.orig_size})
+
+    def test_least_recently_used_values_are_removed(self):
+        ColumnBase.set_cache_size(3)
+        col = ColumnBase()
+        for arg in (1, 2, 3, 1, 4):
+            col._from_cache(self.create_value, arg)
+        self.assertEqual(ColumnBase.cache_info()['size'], 3)
+        del self.calls[:]
+        for arg in (1, 3, 4, 2):
+            col._from_cache(self.create_value, arg)
+        self.assertEqual(self.calls, [2])
+
+    def test_shrinking_cache(self):
+        col = ColumnBase()
+        for arg in range(10):
+            col._from_cache(self.create_value, arg)
+        ColumnBase.set_cache_size(4)
+        self.assertEqual(ColumnBase.cache_info()['size'], 4)
+        del self.calls[:]
+        for arg in range(6, 10):
+            col._from_cache(self.create_value, arg)
+        self.assertEqual(self.calls, [])
+        with self.assertRaises(ValueError):
+            ColumnBase.set_cache_size(-1)